@@ -0,0 +1,62 @@
+import basevcstest
+import numpy
+import MV2
+import vcs
+from vcs.vcsvtk.pipeline1d import Pipeline1D
+
+
+class TestVCS1DAdaptiveResolution(basevcstest.VCSBaseTest):
+    def testMinMaxDecimate(self):
+        x = numpy.linspace(0, 1, 100001)
+        y = numpy.sin(x * 50) + numpy.random.random(len(x))
+        kept = vcs.utils.minMaxDecimate(x, y, 0, 1, 100)
+        self.assertLessEqual(len(kept), 4 * 101)
+        self.assertTrue(numpy.all(numpy.diff(kept) > 0))
+        self.assertEqual(kept[0], 0)
+        self.assertEqual(kept[-1], len(x) - 1)
+        columns = numpy.floor(x * 100)
+        for column in [0, 42, 99]:
+            inColumn = columns == column
+            keptInColumn = columns[kept] == column
+            self.assertEqual(y[kept][keptInColumn].max(), y[inColumn].max())
+            self.assertEqual(y[kept][keptInColumn].min(), y[inColumn].min())
+        # runs don't extend over breaks
+        kept = vcs.utils.minMaxDecimate([0, .1, .2, .3], [1, 5, 2, 3], 0, 4, 1, breaks=[2])
+        self.assertEqual(kept.tolist(), [0, 1, 2, 3])
+
+    def plottedSegments(self, data, gm, adaptive):
+        """Plots data, returns the x arrays of the line segments drawn."""
+        original = Pipeline1D._lineSegments
+        segments = []
+
+        def lineSegments(pipeline, *args):
+            xs, ys = original(pipeline, *args)
+            segments.append(xs)
+            return xs, ys
+        Pipeline1D._lineSegments = lineSegments
+        try:
+            self.x.clear()
+            self.x.plot(data, gm, bg=self.bg, adaptive_resolution=adaptive)
+        finally:
+            Pipeline1D._lineSegments = original
+        self.assertEqual(len(segments), 1)
+        return segments[0]
+
+    def testLongSeries(self):
+        n = 1000000
+        data = MV2.array(numpy.sin(numpy.linspace(0, 100, n)) + numpy.random.random(n))
+        data = MV2.masked_where(numpy.abs(numpy.arange(n) - n // 2) < 1000, data)
+        yx = self.x.createyxvsx()
+        yx.marker = None
+        full = self.plottedSegments(data, yx, False)
+        decimated = self.plottedSegments(data, yx, True)
+        # the masked values split the line in two
+        self.assertEqual(len(full), 2)
+        self.assertEqual(sum(len(xs) for xs in full), n - 1999)
+        self.assertEqual(len(decimated), 2)
+        # at most 4 points per pixel column of the data area, and per segment
+        width = self.x.backend.renWin.GetSize()[0]
+        self.assertLessEqual(sum(len(xs) for xs in decimated), 2 * 4 * (width + 1))
+        for xs, decimatedXs in zip(full, decimated):
+            self.assertEqual(decimatedXs[0], xs[0])
+            self.assertEqual(decimatedXs[-1], xs[-1])
@@ -0,0 +1,51 @@
+import basevcstest
+import cdms2
+import numpy
+import MV2
+import vcs
+
+
+class TestVCSAdaptiveResolution(basevcstest.VCSBaseTest):
+    def data(self, nlat, nlon):
+        lat = cdms2.createAxis(numpy.linspace(-89.5, 89.5, nlat))
+        lat.designateLatitude()
+        lon = cdms2.createAxis(numpy.linspace(0., 360., nlon, endpoint=False))
+        lon.designateLongitude()
+        y, x = numpy.meshgrid(numpy.radians(lat[:]), numpy.radians(lon[:]), indexing="ij")
+        s = MV2.array(numpy.sin(3 * x) * numpy.cos(2 * y) * 30.)
+        s.setAxis(0, lat)
+        s.setAxis(1, lon)
+        return s
+
+    def testBlockAverage(self):
+        s = MV2.masked_greater(self.data(10, 21), 25.)
+        s[:2, :3] = MV2.masked
+        s[0, 3] = MV2.masked
+        averaged = vcs.utils.blockAverage2D(s, 2, 3)
+        self.assertEqual(averaged.shape, (5, 7))
+        # blocks are masked only if all their values are
+        self.assertTrue(averaged.mask[0, 0])
+        self.assertAlmostEqual(averaged[0, 1], s[0:2, 3:6].mean())
+        self.assertTrue(averaged.getAxis(0).isLatitude())
+        self.assertTrue(averaged.getAxis(1).isLongitude())
+        bounds = averaged.getAxis(1).getBounds()
+        self.assertTrue(numpy.allclose(bounds[:, 0], s.getAxis(1).getBounds()[::3, 0]))
+        self.assertTrue(numpy.allclose(bounds[:-1, 1], bounds[1:, 0]))
+
+    def testBoxfill(self):
+        s = self.data(900, 1800)
+        s[:50] = MV2.masked
+        # single cell extremes, block averaging would smooth them out
+        s[500, 1000] = 100.
+        s[600, 200] = -100.
+        d = self.x.plot(s, bg=self.bg, adaptive_resolution=True)
+        strides = d.backend["vtk_backend_block_average"]
+        self.assertGreater(strides[0] * strides[1], 1)
+        cells = d.backend["vtk_backend_grid"].GetNumberOfCells()
+        self.assertLessEqual(cells, s.size // (strides[0] * strides[1]) + s.shape[0] + s.shape[1])
+        # min and max are the ones of the full resolution data
+        self.assertEqual(d.backend["vtk_backend_Max_text_actor"].GetInput(), "Max 100")
+        self.assertEqual(d.backend["vtk_backend_Min_text_actor"].GetInput(), "Min -100")
+        d.set_data(s * 2.)
+        self.assertEqual(d.backend["vtk_backend_block_average"], strides)
+        self.assertEqual(d.backend["vtk_backend_Max_text_actor"].GetInput(), "Max 200")
@@ -0,0 +1,41 @@
+import basevcstest
+import glob
+import os
+
+
+class TestVCSAnimateParallel(basevcstest.VCSBaseTest):
+    def testVCSAnimateParallel(self):
+        # same frames as test_vcs_animate_boxfill, rendered by 3 processes
+        s = self.clt("clt", slice(0, 12))
+        gm = self.x.createboxfill()
+        self.x.plot(s, gm, bg=self.bg)
+        self.x.animate.create(thread_it=False, workers=3)
+        pngs = self.x.animate.animation_files
+        self.assertEqual(len(pngs), 12)
+        # frames are renamed into place once written
+        self.assertEqual(glob.glob(os.path.join(os.path.dirname(pngs[0]), ".anim_*")), [])
+        self.x.animate.save("test_vcs_animate_parallel.mp4")
+        pngs = self.x.animate.close(preserve_pngs=True)
+        ret = 0
+        for p in pngs:
+            ret += self.checkImage(p,
+                                   os.path.join(self.basedir,
+                                                'test_vcs_animate_boxfill',
+                                                os.path.basename(p)),
+                                   pngReady=True)
+        if ret == 0:
+            os.removedirs(os.path.split(p)[0])
+            os.remove("test_vcs_animate_parallel.mp4")
+
+    def testVCSAnimateParallelStop(self):
+        s = self.clt("clt", slice(0, 12))
+        self.x.plot(s, bg=self.bg)
+        self.x.animate.create(workers=3)
+        self.x.animate.create_stop()
+        self.x.animate.create_thread.join()
+        dirname = os.path.dirname(self.x.animate.create_thread.get_frame_name(0))
+        # killed workers leave no partial frames behind
+        self.assertEqual(glob.glob(os.path.join(dirname, ".anim_*")), [])
+        for p in glob.glob(os.path.join(dirname, "*.png")):
+            self.assertGreater(os.path.getsize(p), 0)
+        self.x.animate.close()
@@ -0,0 +1,32 @@
+import basevcstest
+import os
+
+
+class TestVCSAnimateStream(basevcstest.VCSBaseTest):
+    def testSaveStream(self):
+        s = self.clt("clt", slice(0, 12))
+        gm = self.x.createboxfill()
+        self.x.plot(s, gm, bg=self.bg)
+        self.x.animate.create()
+        self.x.animate.save("test_vcs_animate_stream.mp4", stream=True)
+        # no png written
+        self.assertEqual(self.x.animate.animation_files, [])
+        self.x.animate.save("test_vcs_animate_stream_png.mp4")
+        self.x.animate.close()
+        for movie in ["test_vcs_animate_stream.mp4", "test_vcs_animate_stream_png.mp4"]:
+            self.assertGreater(os.path.getsize(movie), 0)
+            os.remove(movie)
+
+    def testStream(self):
+        s = self.clt("clt", slice(0, 4), squeeze=1)
+        d = self.x.plot(s[0], bg=self.bg)
+        stream = self.x.ffmpeg_stream("test_vcs_ffmpeg_stream.mp4", rate=2)
+        for i in range(4):
+            d.set_data(s[i], render=False)
+            stream.add_frame()
+        with self.assertRaises(ValueError):
+            stream.add_frame(10, 10, b"\0" * 300)
+        result = stream.close()
+        self.assertEqual(result.result, 0)
+        self.assertEqual(stream.frames, 4)
+        os.remove("test_vcs_ffmpeg_stream.mp4")
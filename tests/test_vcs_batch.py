@@ -0,0 +1,130 @@
+import basevcstest
+import cdms2
+import os
+import multiprocessing
+import shutil
+import tempfile
+import vcs
+
+
+class CrashingVariable(vcs.batchplot.FileVariable):
+    """Kills the worker reading it the first time."""
+
+    def __init__(self, marker, *args, **selectors):
+        super(CrashingVariable, self).__init__(*args, **selectors)
+        self.marker = marker
+
+    def read(self):
+        if not os.path.exists(self.marker):
+            open(self.marker, "w").close()
+            os._exit(1)
+        return super(CrashingVariable, self).read()
+
+
+class TestVCSBatch(basevcstest.VCSBaseTest):
+    def setUp(self):
+        super(TestVCSBatch, self).setUp()
+        self.outputDir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.outputDir)
+        super(TestVCSBatch, self).tearDown()
+
+    def jobs(self, count, extension="png"):
+        s = self.clt("clt")
+        return [(s[i], "default", vcs.getboxfill(), os.path.join(self.outputDir, "clt_%d.%s" % (i, extension)))
+                for i in range(count)]
+
+    def testBatch(self):
+        elements = dict((k, len(vcs.elements[k])) for k in vcs.elements)
+        jobs = self.jobs(3) + self.jobs(1, "svg")
+        u = self.clt("u")
+        v = self.clt("v")
+        jobs.append((u, v, "default", vcs.getvector(), os.path.join(self.outputDir, "vector.png")))
+        results = list(vcs.batch(iter(jobs), canvas=self.x))
+        self.assertEqual([r.index for r in results], list(range(len(jobs))))
+        for job, result in zip(jobs, results):
+            self.assertIsNone(result.error)
+            self.assertEqual(result.output, job[-1])
+            self.assertTrue(os.path.exists(result.output))
+            self.assertGreater(result.seconds, 0.)
+        # temporary elements are removed after each job
+        self.assertEqual(elements, dict((k, len(vcs.elements[k])) for k in vcs.elements))
+
+    def testErrors(self):
+        jobs = self.jobs(2)
+        jobs.insert(1, (self.clt("clt")[0], "default", vcs.getboxfill(), "/does/not/exist.png"))
+        with self.assertRaises(Exception):
+            list(vcs.batch(jobs, canvas=self.x))
+        results = list(vcs.batch(jobs, canvas=self.x, stop_on_error=False))
+        self.assertEqual([r.error is None for r in results], [True, False, True])
+
+    def testWorkers(self):
+        jobs = self.jobs(5)
+        gm = vcs.createisofill()
+        gm.levels = [0, 20, 40, 60, 80, 100]
+        template = vcs.createtemplate()
+        template.title.priority = 0
+        jobs.append((self.clt("clt")[0], template, gm, os.path.join(self.outputDir, "isofill.png")))
+        jobs.append((vcs.batchplot.FileVariable(vcs.sample_data + "/clt.nc", "clt", time=slice(0, 1)), "default",
+                     "default", os.path.join(self.outputDir, "file.pdf")))
+        b = vcs.batch(jobs, workers=2)
+        results = list(b)
+        self.assertEqual(sorted(r.index for r in results), list(range(len(jobs))))
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertTrue(os.path.exists(result.output))
+        self.assertEqual(b.count, len(jobs))
+        self.assertGreater(b.throughput, 0.)
+        with self.assertRaises(ValueError):
+            list(vcs.batch(jobs, canvas=self.x, workers=2))
+
+    def testWorkerErrors(self):
+        jobs = self.jobs(2)
+        curvilinear = cdms2.open(os.path.join(vcs.sample_data, "sampleCurveGrid4.nc"))("sample")
+        jobs.insert(1, (curvilinear, "default", vcs.getmeshfill(), os.path.join(self.outputDir, "curvilinear.png")))
+        results = list(vcs.batch(jobs, workers=2, stop_on_error=False))
+        self.assertEqual(sorted(r.index for r in results), [0, 1, 2])
+        errors = [r for r in results if r.error is not None]
+        self.assertEqual([r.index for r in errors], [1])
+        self.assertIsInstance(errors[0].error, ValueError)
+
+    def testWorkerElements(self):
+        gm = vcs.createisofill()
+        template = vcs.createtemplate()
+        elements, arguments = vcs.batchplot._packJob([self.clt("clt")[0], template, gm])
+        # elements unknown to the worker are removed once the job is done
+        vcs.removeobject(gm)
+        vcs.removeobject(template)
+        connection, workerConnection = multiprocessing.Pipe()
+        connection.send((0, elements, arguments, os.path.join(self.outputDir, "isofill.png")))
+        connection.send(None)
+        vcs.batchplot._worker(workerConnection, None, {"bg": True})
+        self.assertIsNone(connection.recv()[2])
+        self.assertNotIn(gm.name, vcs.elements["isofill"])
+        self.assertNotIn(template.name, vcs.elements["template"])
+
+    def testWorkerCrash(self):
+        marker = os.path.join(self.outputDir, "crashed")
+        jobs = self.jobs(2)
+        jobs.insert(1, (CrashingVariable(marker, vcs.sample_data + "/clt.nc", "clt", time=slice(0, 1)),
+                        os.path.join(self.outputDir, "retried.png")))
+        results = list(vcs.batch(jobs, workers=2))
+        self.assertTrue(os.path.exists(marker))
+        self.assertEqual(sorted(r.index for r in results), [0, 1, 2])
+        self.assertTrue(all(r.error is None for r in results))
+        os.remove(marker)
+        results = list(vcs.batch(jobs, workers=2, retries=0, stop_on_error=False))
+        self.assertEqual([r.index for r in results if r.error is not None], [1])
+
+    def testThroughput(self):
+        jobs = self.jobs(24)
+        workers = min(4, multiprocessing.cpu_count())
+        for b in [vcs.batch(jobs), vcs.batch(jobs, workers=workers)]:
+            results = list(b)
+            self.assertEqual(sorted(r.index for r in results), list(range(len(jobs))))
+            self.assertTrue(all(os.path.exists(r.output) for r in results))
+            self.assertEqual(b.count, len(jobs))
+            self.assertGreater(b.throughput, 0.)
+            for r in results:
+                os.remove(r.output)
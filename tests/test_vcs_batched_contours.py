@@ -0,0 +1,74 @@
+import basevcstest
+import cdms2
+import numpy
+import MV2
+import vcs
+from vtk.util import numpy_support as VN
+
+
+class TestVCSBatchedContours(basevcstest.VCSBaseTest):
+    def data(self, nlat, nlon):
+        lat = cdms2.createAxis(numpy.linspace(-89.95, 89.95, nlat))
+        lat.designateLatitude()
+        lon = cdms2.createAxis(numpy.linspace(0., 360., nlon, endpoint=False))
+        lon.designateLongitude()
+        y, x = numpy.meshgrid(numpy.radians(lat[:]), numpy.radians(lon[:]), indexing="ij")
+        s = MV2.array(numpy.sin(3 * x) * numpy.cos(2 * y) * 30.)
+        s.setAxis(0, lat)
+        s.setAxis(1, lon)
+        return s
+
+    def testIsolineGroups(self):
+        s = self.data(90, 180)
+        gm = vcs.createisoline()
+        gm.levels = list(range(-25, 30, 5))
+        # a group of levels per width
+        gm.linewidths = [1, 2] * 6
+        d = self.x.plot(s, gm, bg=self.bg)
+        self.assertEqual(len(d.backend["vtk_backend_contours"]), 1)
+        sources = d.backend["vtk_backend_item_sources"]
+        self.assertEqual(len(sources), len(gm.levels))
+        for i, (item, mapper, cellData, color) in enumerate(sources):
+            poly = item.GetPolyData()
+            self.assertGreater(poly.GetNumberOfLines(), 0)
+            values = VN.vtk_to_numpy(poly.GetPointData().GetScalars())
+            self.assertTrue(numpy.allclose(values, gm.levels[i], atol=1.e-3))
+        for name in ["contour", "levelGroup", "threshold", "stripper"]:
+            self.assertIn(name, d.backend["vtk_backend_timings"])
+
+    def testIsofillPatterns(self):
+        s = self.data(90, 180)
+        gm = vcs.createisofill()
+        gm.levels = [-30, -10, 0, 10, 30]
+        gm.fillareacolors = [16, 50, 100, 200]
+        gm.fillareastyle = "hatch"
+        gm.fillareaindices = [1, 2, 3, 4]
+        d = self.x.plot(s, gm, bg=self.bg)
+        self.assertEqual(len(d.backend["vtk_backend_contours"]), 1)
+        levelFilter = d.backend["vtk_backend_level_filter"]
+        levelFilter.Update()
+        levels = levelFilter.GetOutput().GetCellData().GetArray("levelIndex")
+        self.assertEqual(levels.GetRange(), (0., 3.))
+
+    def testIsofillDisjointLevels(self):
+        s = self.data(90, 180)
+        gm = vcs.createisofill()
+        gm.levels = [[-30, -10], [10, 30]]
+        gm.fillareacolors = [16, 200]
+        d = self.x.plot(s, gm, bg=self.bg)
+        sources = d.backend["vtk_backend_item_sources"]
+        self.assertEqual(len(sources), 1)
+        levels = sources[0][0].GetPolyData().GetCellData().GetScalars()
+        self.assertEqual(levels.GetName(), "levelIndex")
+        self.assertEqual(levels.GetRange(), (0., 1.))
+
+    def testManyLevels(self):
+        # 120 levels in 2 groups of line widths
+        s = self.data(360, 720)
+        gm = vcs.createisoline()
+        gm.levels = list(numpy.linspace(-29.5, 29.5, 120))
+        gm.linewidths = [1] * 60 + [2] * 60
+        d = self.x.plot(s, gm, bg=self.bg)
+        # a single contour pass for all the levels
+        self.assertEqual(len(d.backend["vtk_backend_contours"]), 1)
+        self.assertEqual(len(d.backend["vtk_backend_item_sources"]), len(gm.levels))
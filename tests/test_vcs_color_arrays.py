@@ -0,0 +1,28 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+from vcs import vcs2vtk
+
+
+class TestVCSColorArrays(unittest.TestCase):
+    def testSolidColorArray(self):
+        colors = vcs2vtk.generateSolidColorArray(1000, [10, 20, 30, 40], "Colors")
+        self.assertEqual(colors.GetName(), "Colors")
+        self.assertEqual(colors.GetDataType(), vtk.VTK_UNSIGNED_CHAR)
+        self.assertEqual(colors.GetNumberOfComponents(), 4)
+        self.assertEqual(colors.GetNumberOfTuples(), 1000)
+        self.assertTrue(numpy.all(VN.vtk_to_numpy(colors) == [10, 20, 30, 40]))
+        # rgb colors are opaque
+        colors = vcs2vtk.generateSolidColorArray(3, (1, 2, 3))
+        self.assertTrue(numpy.all(VN.vtk_to_numpy(colors) == [1, 2, 3, 255]))
+        self.assertEqual(vcs2vtk.generateSolidColorArray(0, [0, 0, 0, 255]).GetNumberOfTuples(), 0)
+
+    def testVectorNorms(self):
+        values = numpy.random.uniform(-10., 10., (500, 3)).astype(numpy.float32)
+        vectors = VN.numpy_to_vtk(values, deep=True)
+        norms = vcs2vtk.vectorNorms(vectors)
+        self.assertTrue(numpy.allclose(norms, numpy.linalg.norm(values, axis=1)))
+        scalars = vcs2vtk.linearVectorScalars(vectors, norms.min(), numpy.ptp(norms), [1., 3.])
+        self.assertAlmostEqual(scalars.GetRange()[0], 1.)
+        self.assertAlmostEqual(scalars.GetRange()[1], 3.)
@@ -0,0 +1,59 @@
+import basevcstest
+import os
+import shutil
+import tempfile
+import time
+import numpy
+from vcs import vcs2vtk
+from vcs.vcsvtk import continents
+
+
+class TestVCSContinentsCache(basevcstest.VCSBaseTest):
+    def setUp(self):
+        super(TestVCSContinentsCache, self).setUp()
+        # keep the caches out of the user's dot directory
+        self.directory = tempfile.mkdtemp()
+        self.dotdir = os.environ.get("UVCDAT_DIR")
+        os.environ["UVCDAT_DIR"] = self.directory
+        continents._loaded.clear()
+
+    def tearDown(self):
+        if self.dotdir is None:
+            del os.environ["UVCDAT_DIR"]
+        else:
+            os.environ["UVCDAT_DIR"] = self.dotdir
+        shutil.rmtree(self.directory)
+        continents._loaded.clear()
+        super(TestVCSContinentsCache, self).tearDown()
+
+    def testLoad(self):
+        # all the continent types used by plotContinents
+        for continentType in range(1, 7):
+            path = self.x._continentspath(continentType)
+            continents._loaded.clear()
+            cache = continents.cachePath(path)
+            self.assertTrue(cache.startswith(self.directory))
+            self.assertFalse(os.path.exists(cache))
+            cold = vcs2vtk.prepContinents(path)
+            self.assertTrue(os.path.exists(cache))
+            continents._loaded.clear()
+            warm = vcs2vtk.prepContinents(path)
+            self.assertGreater(cold.GetNumberOfCells(), 0)
+            self.assertEqual(cold.GetNumberOfCells(), warm.GetNumberOfCells())
+            self.assertEqual(cold.GetNumberOfPoints(), warm.GetNumberOfPoints())
+
+    def testRegenerate(self):
+        path = os.path.join(self.directory, "data_continent_other7")
+        shutil.copy(self.x._continentspath(6), path)
+        lat, lon, offsets = continents.loadContinents(path)
+        # a modified file is parsed again
+        with open(path) as f:
+            content = f.read()
+        with open(path, "w") as f:
+            f.write("4 1 0 0 0 0\n   10.000  20.000  30.000  40.000\n" + content)
+        os.utime(path, (time.time() + 10, time.time() + 10))
+        lat2, lon2, offsets2 = continents.loadContinents(path)
+        self.assertEqual(len(offsets2), len(offsets) + 1)
+        self.assertEqual(lat2[:2].tolist(), [10., 30.])
+        self.assertEqual(lon2[:2].tolist(), [20., 40.])
+        self.assertTrue(numpy.array_equal(lat2[2:], lat))
@@ -0,0 +1,30 @@
+import basevcstest
+import vcs
+from vcs import vcs2vtk
+
+
+class TestVCSContinentsProjectedCache(basevcstest.VCSBaseTest):
+    def testMultiPanel(self):
+        s = self.clt("clt", slice(0, 1), squeeze=1)
+        gm = vcs.createisofill()
+        gm.projection = "robinson"
+        cache = vcs2vtk.continentsCache
+        cache.clear()
+        for i in range(16):
+            t = self.x.createtemplate()
+            t.scale(.25)
+            t.move(.25 * (i % 4), "x")
+            t.move(.25 * (i // 4), "y")
+            self.x.plot(s, t, gm, bg=self.bg)
+        # same continents, projection and window on every panel
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 15)
+        self.assertEqual(cache.info()["entries"], 1)
+        self.x.clear()
+
+        gm.projection = "mollweide"
+        self.x.plot(s, gm, bg=self.bg)
+        self.assertEqual(cache.misses, 2)
+        self.x.clear()
+        self.x.plot(s, gm, continents=2, bg=self.bg)
+        self.assertEqual(cache.misses, 3)
@@ -0,0 +1,45 @@
+import basevcstest
+import cdms2
+import numpy
+import MV2
+import vcs
+
+
+class TestVCSCustomFillSinglePass(basevcstest.VCSBaseTest):
+    def data(self, nlat, nlon):
+        lat = cdms2.createAxis(numpy.linspace(-89.5, 89.5, nlat))
+        lat.designateLatitude()
+        lon = cdms2.createAxis(numpy.linspace(0., 360., nlon, endpoint=False))
+        lon.designateLongitude()
+        y, x = numpy.meshgrid(numpy.radians(lat[:]), numpy.radians(lon[:]), indexing="ij")
+        s = MV2.array(numpy.sin(3 * x) * numpy.cos(2 * y) * 30.)
+        s.setAxis(0, lat)
+        s.setAxis(1, lon)
+        return s
+
+    def testBoxfillLevels(self):
+        s = self.data(180, 360)
+        gm = vcs.createboxfill()
+        gm.boxfill_type = "custom"
+        gm.levels = list(numpy.linspace(-30., 30., 61))
+        gm.fillareacolors = vcs.getcolors(gm.levels)
+        d = self.x.plot(s, gm, bg=self.bg)
+        # all the levels are drawn by one item
+        self.assertEqual(len(d.backend["vtk_backend_item_sources"]), 1)
+        item = d.backend["vtk_backend_item_sources"][0][0]
+        levels = item.GetPolyData().GetCellData().GetScalars()
+        self.assertEqual(levels.GetName(), "levelIndex")
+        self.assertEqual(levels.GetRange(), (0., 59.))
+
+    def testMeshfillLevels(self):
+        s = self.data(90, 180)
+        gm = vcs.createmeshfill()
+        gm.levels = [-30, -10, 0, 10, 30]
+        gm.fillareacolors = [16, 50, 100, 200]
+        d = self.x.plot(s, gm, bg=self.bg)
+        sources = d.backend["vtk_backend_item_sources"]
+        self.assertEqual(len(sources), 1)
+        item, mapper, cellData, color = sources[0]
+        levels = item.GetPolyData().GetCellData().GetScalars()
+        self.assertEqual(levels.GetName(), "levelIndex")
+        self.assertEqual(levels.GetRange(), (0., 3.))
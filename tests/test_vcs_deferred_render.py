@@ -0,0 +1,71 @@
+import basevcstest
+import os
+import shutil
+import tempfile
+import vcs
+
+
+class TestVCSDeferredRender(basevcstest.VCSBaseTest):
+    def setUp(self):
+        super(TestVCSDeferredRender, self).setUp()
+        self.tempdir = tempfile.mkdtemp()
+        self.renders = 0
+        # the window is created by the first plot
+        self.x.plot([1, 2, 3], bg=self.bg)
+        self.x.clear()
+        self.x.backend.renWin.AddObserver("RenderEvent", self.countRender)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+        super(TestVCSDeferredRender, self).tearDown()
+
+    def countRender(self, caller, event):
+        self.renders += 1
+
+    def templates(self):
+        templates = []
+        for i in range(3):
+            for j in range(4):
+                t = vcs.createtemplate()
+                t.scale(.25)
+                t.move(i * .33 - .05, "x")
+                t.move(j * .25 - .05, "y")
+                templates.append(t)
+        return templates
+
+    def plotPage(self, s, templates):
+        for t in templates:
+            self.x.plot(s, t, bg=self.bg)
+
+    def testDeferred(self):
+        s = self.clt("clt", slice(0, 1), squeeze=1)
+        templates = self.templates()
+        self.plotPage(s, templates)
+        self.x.png(os.path.join(self.tempdir, "immediate.png"))
+        immediateRenders = self.renders
+        self.assertGreaterEqual(immediateRenders, len(templates))
+
+        self.x.clear()
+        self.renders = 0
+        with self.x.deferred_render():
+            self.plotPage(s, templates)
+        # an on screen canvas is rendered once when the block ends
+        self.assertEqual(self.renders, 0 if self.bg else 1)
+        fnm = os.path.join(self.tempdir, "deferred.png")
+        self.x.png(fnm)
+        self.assertEqual(self.renders, 1 if self.bg else 2)
+        self.assertLess(self.renders, immediateRenders)
+        self.assertTrue(os.path.exists(fnm))
+
+    def testLabeledIsolines(self):
+        s = self.clt("clt", slice(0, 1), squeeze=1)
+        iso = self.x.createisoline()
+        iso.label = "y"
+        with self.x.deferred_render():
+            self.x.plot(s, iso, bg=self.bg)
+            with self.x.deferred_render():
+                self.x.plot(s, iso, bg=self.bg)
+        self.assertEqual(self.renders, 0 if self.bg else 1)
+        self.x.svg(os.path.join(self.tempdir, "isolines"))
+        self.assertGreater(self.renders, 0)
+        self.assertTrue(os.path.exists(os.path.join(self.tempdir, "isolines.svg")))
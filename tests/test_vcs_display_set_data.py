@@ -0,0 +1,64 @@
+import basevcstest
+import vcs
+import numpy
+from vtk.util import numpy_support as VN
+
+
+def gridScalars(grid):
+    scalars = grid.GetCellData().GetScalars()
+    if scalars is None:
+        scalars = grid.GetPointData().GetScalars()
+    return VN.vtk_to_numpy(scalars)
+
+
+class TestVCSDisplaySetData(basevcstest.VCSBaseTest):
+    def checkSetData(self, gm):
+        s = self.clt("clt", slice(0, 2), squeeze=1)
+        d = self.x.plot(s[0], gm, bg=self.bg)
+        sources = d.backend["vtk_backend_item_sources"]
+        self.assertGreater(len(sources), 0)
+        items = [source[0] for source in sources]
+        d.set_data(s[1])
+        # same pipeline, new data
+        self.assertIs(d.backend["vtk_backend_item_sources"], sources)
+        self.assertEqual([source[0] for source in sources], items)
+        self.assertIs(d.array[0], s[1])
+        self.assertTrue(numpy.allclose(gridScalars(d.backend["vtk_backend_grid"]),
+                                       numpy.ma.ravel(s[1])))
+
+    def testBoxfill(self):
+        self.checkSetData(vcs.createboxfill())
+
+    def testIsofill(self):
+        self.checkSetData(vcs.createisofill())
+
+    def testIsoline(self):
+        self.checkSetData(vcs.createisoline())
+
+    def testMeshfill(self):
+        self.checkSetData(vcs.createmeshfill())
+
+    def testVector(self):
+        u = self.clt("u", slice(0, 2), squeeze=1)
+        v = self.clt("v", slice(0, 2), squeeze=1)
+        d = self.x.plot(u[0], v[0], vcs.createvector(), bg=self.bg)
+        glyphs = d.backend["vtk_backend_glyphfilters"]
+        before = VN.vtk_to_numpy(d.backend["vtk_backend_grid"].GetPointData().GetVectors()).copy()
+        self.x.update(d, u[1], v[1])
+        self.assertIs(d.backend["vtk_backend_glyphfilters"], glyphs)
+        vectors = d.backend["vtk_backend_grid"].GetPointData().GetVectors()
+        self.assertEqual(vectors.GetName(), "vector")
+        self.assertEqual(vectors.GetNumberOfTuples(), len(before))
+        self.assertFalse(numpy.allclose(VN.vtk_to_numpy(vectors), before))
+
+    def testErrors(self):
+        s = self.clt("clt", slice(0, 1), squeeze=1)
+        d = self.x.plot(s, bg=self.bg)
+        with self.assertRaises(ValueError):
+            d.set_data(s[:10])
+        self.x.clear()
+        u = self.clt("u", slice(0, 1), squeeze=1)
+        v = self.clt("v", slice(0, 1), squeeze=1)
+        d = self.x.plot(u, v, vcs.createstreamline(), bg=self.bg)
+        with self.assertRaises(ValueError):
+            d.set_data(u, v)
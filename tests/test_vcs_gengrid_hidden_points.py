@@ -0,0 +1,41 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+import cdms2
+import vcs
+from vcs import vcs2vtk
+
+
+class TestVCSGenGridHiddenPoints(unittest.TestCase):
+    def testSetInfToValid(self):
+        pts = vtk.vtkPoints()
+        pts.SetData(VN.numpy_to_vtk(numpy.array([[numpy.inf, 1., 0.],
+                                                 [2., 3., 0.],
+                                                 [4., -numpy.inf, 0.]]),
+                                    deep=True))
+        ghost = vtk.vtkUnsignedCharArray()
+        ghost.SetNumberOfTuples(3)
+        ghost.Fill(0)
+        self.assertTrue(vcs2vtk.setInfToValid(pts, ghost))
+        self.assertEqual(VN.vtk_to_numpy(pts.GetData()).tolist(),
+                         [[2., 1., 0.], [2., 3., 0.], [4., 3., 0.]])
+        hidden = vtk.vtkDataSetAttributes.HIDDENPOINT
+        self.assertEqual(VN.vtk_to_numpy(ghost).tolist(), [hidden, 0, hidden])
+        self.assertFalse(vcs2vtk.setInfToValid(pts, ghost))
+
+    def testProjectedGrid(self):
+        lat = cdms2.createUniformLatitudeAxis(-89.5, 180, 1.)
+        lon = cdms2.createUniformLongitudeAxis(0.5, 360, 1.)
+        data = cdms2.createVariable(numpy.random.random((180, 360)),
+                                    axes=[lat, lon])
+        gm = vcs.createboxfill()
+        gm.projection = "orthographic"
+        out = vcs2vtk.genGrid(data, None, gm)
+        vg = out["vtk_backend_grid"]
+        ids = VN.vtk_to_numpy(vg.GetCellData().GetPedigreeIds())
+        self.assertTrue(numpy.all(ids < 180 * 360))
+        # bounds only account for the visible hemisphere
+        self.assertLess(out["xM"] - out["xm"], 360.)
+        for b in (out["xm"], out["xM"], out["ym"], out["yM"]):
+            self.assertTrue(numpy.isfinite(b))
@@ -0,0 +1,43 @@
+import basevcstest
+import numpy
+import vcs
+from vtk.util import numpy_support as VN
+from vcs import vcs2vtk
+
+
+class TestVCSGridCache(basevcstest.VCSBaseTest):
+    def plotScalars(self, data, gm):
+        d = self.x.plot(data, gm, bg=self.bg)
+        vg = d.backend["vtk_backend_grid"]
+        scalars = VN.vtk_to_numpy(vg.GetCellData().GetScalars()).copy()
+        self.x.clear()
+        return vg.GetNumberOfCells(), scalars
+
+    def testGridCache(self):
+        s = self.clt("clt")
+        gm = vcs.createboxfill()
+        gm.projection = "robinson"
+        cache = vcs2vtk.gridCache
+        cache.clear()
+        self.plotScalars(s[0], gm)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(len(cache), 1)
+        cached = self.plotScalars(s[1], gm)
+        self.assertEqual(cache.hits, 1)
+        self.assertGreater(cache.memory, 0)
+
+        # a different projection is a different geometry
+        gm2 = vcs.createboxfill()
+        gm2.projection = "mollweide"
+        self.plotScalars(s[1], gm2)
+        self.assertEqual(cache.misses, 2)
+
+        # cache disabled gives the same result
+        maxMemory = cache.maxMemory
+        cache.maxMemory = 0
+        try:
+            uncached = self.plotScalars(s[1], gm)
+        finally:
+            cache.maxMemory = maxMemory
+        self.assertEqual(cached[0], uncached[0])
+        self.assertTrue(numpy.allclose(cached[1], uncached[1]))
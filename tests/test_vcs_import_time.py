@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import unittest
+
+
+class TestVCSImportTime(unittest.TestCase):
+    def run_python(self, code):
+        return subprocess.check_output([sys.executable, "-c", code]).decode().strip()
+
+    def testLazyModules(self):
+        out = self.run_python("import sys, vcs\n"
+                              "print(sorted(m for m in ['vcs.Canvas', 'vcs.VTKPlots', 'vcs.batchplot']"
+                              " if m in sys.modules))\n"
+                              "vcs.mkscale(0, 100)\n"
+                              "vcs.getcolors([0, 50, 100])\n"
+                              "print('vcs.VTKPlots' in sys.modules)\n"
+                              "print(vcs.batch.__module__, vcs.Canvas.__name__)\n"
+                              "print(vcs.sample_data == __import__('cdat_info').get_sampledata_path())\n")
+        self.assertEqual(out.split("\n"), ["[]", "False", "vcs.batchplot vcs.Canvas", "True"])
+
+    def testCanvas(self):
+        out = self.run_python("import sys, vcs\n"
+                              "x = vcs.init(bg=True)\n"
+                              "print('vcs.VTKPlots' in sys.modules)\n")
+        self.assertEqual(out, "True")
+
+    def testHeavyModules(self):
+        # the modules that made import vcs slow are only loaded when used
+        out = self.run_python("import sys, vcs\n"
+                              "print(sorted(m for m in ['vtk', 'cdat_info', 'DV3D.ConfigurationFunctions']"
+                              " if m in sys.modules))\n"
+                              "vcs.get3d_scalar('Hovmoller3D')\n"
+                              "print('vtk' not in sys.modules)\n")
+        self.assertEqual(out.split("\n"), ["[]", "True"])
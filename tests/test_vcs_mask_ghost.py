@@ -0,0 +1,53 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+from vcs import vcs2vtk
+
+
+class TestVCSMaskGhost(unittest.TestCase):
+    def wrappedGrid(self, pedigreeIds):
+        # polydata made of 4 x 3 quads, cells refer to data with pedigreeIds
+        vg = vtk.vtkStructuredGrid()
+        vg.SetDimensions(5, 4, 1)
+        points = vtk.vtkPoints()
+        for j in range(4):
+            for i in range(5):
+                points.InsertNextPoint(i, j, 0)
+        vg.SetPoints(points)
+        surface = vtk.vtkDataSetSurfaceFilter()
+        surface.SetInputData(vg)
+        surface.Update()
+        poly = surface.GetOutput()
+        ids = VN.numpy_to_vtk(numpy.array(pedigreeIds, dtype=vcs2vtk.vtkIdTypeCode),
+                              deep=True, array_type=vtk.VTK_ID_TYPE)
+        ids.SetName("PedigreeIds")
+        poly.GetCellData().SetPedigreeIds(ids)
+        scalars = VN.numpy_to_vtk(numpy.zeros(len(pedigreeIds)), deep=True)
+        scalars.SetName("scalar")
+        poly.GetCellData().AddArray(scalars)
+        return poly
+
+    def testMaskToGhost(self):
+        ghost = vcs2vtk.maskToGhost(numpy.array([[True, False], [False, True]]), True)
+        self.assertEqual(ghost.dtype, numpy.uint8)
+        hidden = vtk.vtkDataSetAttributes.HIDDENCELL
+        self.assertEqual(ghost.tolist(), [hidden, 0, 0, hidden])
+        ghost = vcs2vtk.maskToGhost(numpy.array([False, True]), False)
+        self.assertEqual(ghost.tolist(), [0, vtk.vtkDataSetAttributes.HIDDENPOINT])
+
+    def testWrappedMask(self):
+        pedigreeIds = [3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 8]
+        data = numpy.ma.masked_array(numpy.arange(12.),
+                                     mask=[0, 1, 0, 0, 1, 0, 1, 0, 0, 0, 1, 0])
+        poly = self.wrappedGrid(pedigreeIds)
+        mapper = vcs2vtk.putMaskOnVTKGrid(data, poly, [0, 0, 0, 100], True)
+        mapper.Update()
+        missing = VN.vtk_to_numpy(mapper.GetInput().GetCellData().GetScalars())
+        self.assertEqual(missing.tolist(), data.mask[pedigreeIds].astype(float).tolist())
+        # masked cells are removed
+        kept = [i for i in pedigreeIds if not data.mask[i]]
+        self.assertEqual(poly.GetNumberOfCells(), len(kept))
+        vcs2vtk.setArray(poly, data.filled(0).flat, "scalar", True, True)
+        scalars = VN.vtk_to_numpy(poly.GetCellData().GetScalars())
+        self.assertEqual(scalars.tolist(), [float(i) for i in kept])
@@ -0,0 +1,80 @@
+import unittest
+import time
+import numpy
+import vtk
+import cdms2
+import vcs
+from vcs import vcs2vtk
+
+
+def loopMeshCells(m3, numberOfCells, nVertices):
+    # reference implementation: one InsertNextCell per mesh cell
+    vg = vtk.vtkUnstructuredGrid()
+    for i in range(numberOfCells):
+        pt_ids = []
+        for j in range(nVertices):
+            indx = i * nVertices + j
+            if not numpy.isnan(m3[indx][0]):
+                pt_ids.append(indx)
+        vg.InsertNextCell(vtk.VTK_POLYGON, len(pt_ids), pt_ids)
+    return vg
+
+
+def syntheticMesh(numberOfCells, nVertices):
+    m3 = numpy.random.random((numberOfCells * nVertices, 3))
+    # drop some vertices (but keep at least a triangle)
+    drop = numpy.random.random((numberOfCells, nVertices)) < .2
+    drop[:, :3] = False
+    m3[drop.ravel(), 0] = numpy.nan
+    return m3
+
+
+def cellIds(grid, i):
+    ids = vtk.vtkIdList()
+    grid.GetCellPoints(i, ids)
+    return [ids.GetId(k) for k in range(ids.GetNumberOfIds())]
+
+
+class TestVCSMeshfillBulkCells(unittest.TestCase):
+    def testCellsMatchLoop(self):
+        m3 = syntheticMesh(200, 5)
+        vg = vtk.vtkUnstructuredGrid()
+        vg.SetCells(vtk.VTK_POLYGON, vcs2vtk.genMeshCells(m3, 200, 5))
+        ref = loopMeshCells(m3, 200, 5)
+        self.assertEqual(vg.GetNumberOfCells(), ref.GetNumberOfCells())
+        for i in range(ref.GetNumberOfCells()):
+            self.assertEqual(vg.GetCellType(i), vtk.VTK_POLYGON)
+            self.assertEqual(cellIds(vg, i), cellIds(ref, i))
+
+    def testGenGridMissingVertices(self):
+        # triangle (last vertex missing) and square
+        lons = [[2.5, 7.5, 5., 1.e20], [7.5, 12.5, 12.5, 7.5]]
+        lats = [[2.5, 2.5, 7.5, 1.e20], [7.5, 7.5, 12.5, 12.5]]
+        mesh = numpy.ma.masked_greater(
+            numpy.transpose(numpy.array([lats, lons]), (1, 0, 2)), 1.e19)
+        data = cdms2.asVariable(numpy.array([1., 2.]))
+        gm = vcs.createmeshfill()
+        gm.wrap = [0., 0.]
+        out = vcs2vtk.genGrid(data, mesh, gm)
+        vg = out["vtk_backend_grid"]
+        self.assertEqual(vg.GetNumberOfCells(), 2)
+        # wrapping may renumber points, check the polygon sizes
+        self.assertEqual(len(cellIds(vg, 0)), 3)
+        self.assertEqual(len(cellIds(vg, 1)), 4)
+
+    def testBenchmark1MCells(self):
+        numberOfCells = 1000000
+        nVertices = 4
+        m3 = syntheticMesh(numberOfCells, nVertices)
+        start = time.time()
+        vg = vtk.vtkUnstructuredGrid()
+        vg.SetCells(vtk.VTK_POLYGON,
+                    vcs2vtk.genMeshCells(m3, numberOfCells, nVertices))
+        bulk = time.time() - start
+        self.assertEqual(vg.GetNumberOfCells(), numberOfCells)
+        # the python loop is too slow for the whole mesh, time a tenth of it
+        nLoop = numberOfCells // 10
+        start = time.time()
+        loopMeshCells(m3, nLoop, nVertices)
+        loop = (time.time() - start) * numberOfCells / nLoop
+        self.assertLess(bulk, loop)
@@ -0,0 +1,46 @@
+import basevcstest
+import numpy
+
+
+class TestVCSPrimitiveArrays(basevcstest.VCSBaseTest):
+    def testSetters(self):
+        m = self.x.createmarker()
+        m.x = numpy.arange(5)
+        self.assertEqual(m.x, [0., 1., 2., 3., 4.])
+        m.y = numpy.ones((2, 3))
+        self.assertEqual(m.y, [[1., 1., 1.], [1., 1., 1.]])
+        ln = self.x.createline()
+        with self.assertRaises(ValueError):
+            ln.x = numpy.ma.masked_equal([0., 1., 2.], 1.)
+        with self.assertRaises(ValueError):
+            ln.y = numpy.array(["a", "b"])
+
+    def testLineArrays(self):
+        ln = self.x.createline()
+        ln._x = [numpy.array([0., .1]), numpy.array([.2, .3])]
+        ln._y = [numpy.array([0., .1]), numpy.array([.2, .3, .4])]
+        ln.color = [242, 243]
+        self.x.plot(ln, bg=self.bg)
+        self.assertEqual(len(ln.x[1]), 2)
+        self.x.clear()
+        ln = self.x.createline(source=ln.name)
+        ln.projection = "robinson"
+        ln.worldcoordinate = [-180, 180, -90, 90]
+        ln.x = [[-180., 180.], [0., 0.]]
+        ln.y = [[0., 0.], [-90., 90.]]
+        self.x.plot(ln, bg=self.bg)
+
+    def testLargeArrays(self):
+        n = 100000
+        y = numpy.random.random(n)
+        m = self.x.createmarker()
+        m.type = "dot"
+        m.x = numpy.random.random(n)
+        m.y = y
+        self.x.plot(m, bg=self.bg)
+        self.assertEqual(len(m.x[0]), n)
+        ln = self.x.createline()
+        ln.x = numpy.linspace(0, 1, n)
+        ln.y = y
+        self.x.plot(ln, bg=self.bg)
+        self.assertEqual(len(ln.y[0]), n)
@@ -0,0 +1,124 @@
+import glob
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import vcs
+
+
+class TestVCSSnapshot(unittest.TestCase):
+    types = {"G1d": "1d", "Gfb": "boxfill", "Gfi": "isofill", "Gfm": "meshfill", "Gi": "isoline",
+             "P": "template", "Proj": "projection", "Tf": "fillarea", "Tl": "line", "Tm": "marker",
+             "To": "textorientation", "Tt": "texttable"}
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.dotdir = os.environ.get("UVCDAT_DIR")
+        os.environ["UVCDAT_DIR"] = self.directory
+        with open(os.path.join(os.path.dirname(__file__), "share", "test_vcs_json.json")) as f:
+            self.content = json.load(f)
+        for typ in self.content:
+            self.content[typ] = {"snapshot_test": self.content[typ]["Charles.Doutriaux"]}
+        self.script = os.path.join(self.directory, "elements.json")
+        self.write()
+
+    def tearDown(self):
+        if self.dotdir is None:
+            del os.environ["UVCDAT_DIR"]
+        else:
+            os.environ["UVCDAT_DIR"] = self.dotdir
+        shutil.rmtree(self.directory)
+
+    def write(self):
+        with open(self.script, "w") as f:
+            json.dump(self.content, f)
+
+    def dump(self):
+        return dict((tp, vcs.utils.dumpToDict(vcs.elements[tp]["snapshot_test"])[0])
+                    for tp in self.types.values())
+
+    def snapshots(self):
+        return glob.glob(os.path.join(self.directory, "snapshots", "elements.json_*.pickle"))
+
+    def testSnapshot(self):
+        vcs.scriptrun(self.script)
+        self.assertEqual(len(self.snapshots()), 1)
+        loaded = self.dump()
+
+        # existing elements are restored in place
+        gm = vcs.getboxfill("snapshot_test")
+        gm.level_1 = 5.
+        vcs.scriptrun(self.script)
+        self.assertIs(vcs.getboxfill("snapshot_test"), gm)
+        self.assertEqual(self.dump(), loaded)
+
+        for tp in self.types.values():
+            del vcs.elements[tp]["snapshot_test"]
+        vcs.scriptrun(self.script)
+        self.assertEqual(self.dump(), loaded)
+
+    def testInvalidation(self):
+        vcs.scriptrun(self.script)
+        snapshot = self.snapshots()
+        self.content["Gfb"]["snapshot_test"]["level_1"] = 12.
+        self.write()
+        vcs.scriptrun(self.script)
+        self.assertEqual(vcs.getboxfill("snapshot_test").level_1, 12.)
+        self.assertEqual(len(self.snapshots()), 1)
+        self.assertNotEqual(self.snapshots(), snapshot)
+
+    def testUserChanges(self):
+        del self.content["Gfb"]["snapshot_test"]["datawc_x1"]
+        self.write()
+        vcs.scriptrun(self.script)
+        gm = vcs.getboxfill("snapshot_test")
+        level_1 = gm.level_1
+        # attributes the file does not set are kept, the others are reloaded
+        gm.datawc_x1 = 12.
+        gm.level_1 = level_1 + 1.
+        vcs.scriptrun(self.script)
+        self.assertEqual(gm.datawc_x1, 12.)
+        self.assertEqual(gm.level_1, level_1)
+
+    def testSignature(self):
+        vcs.scriptrun(self.script)
+        snapshot = self.snapshots()
+        signature = vcs.utils._elementsSignature()
+        try:
+            # snapshots of other versions of the elements classes are kept
+            vcs.utils._snapshotSignature = "0" * len(signature)
+            vcs.scriptrun(self.script)
+            self.assertEqual(len(self.snapshots()), 2)
+            self.assertTrue(set(snapshot) < set(self.snapshots()))
+        finally:
+            vcs.utils._snapshotSignature = signature
+
+    def testPythonVersions(self):
+        vcs.scriptrun(self.script)
+        snapshot, = self.snapshots()
+        tag = "_py%i%i_" % sys.version_info[:2]
+        other = snapshot.replace(tag, "_py27_")
+        shutil.copy(snapshot, other)
+        vcs.scriptrun(self.script)
+        self.assertEqual(sorted(self.snapshots()), sorted([snapshot, other]))
+        # a new content only replaces the snapshot of this python version
+        self.content["Gfb"]["snapshot_test"]["level_1"] = 12.
+        self.write()
+        vcs.scriptrun(self.script)
+        snapshots = self.snapshots()
+        self.assertEqual(len(snapshots), 2)
+        self.assertIn(other, snapshots)
+        self.assertNotIn(snapshot, snapshots)
+
+    def testSameName(self):
+        vcs.scriptrun(self.script)
+        subdirectory = os.path.join(self.directory, "other")
+        os.makedirs(subdirectory)
+        self.script = os.path.join(subdirectory, "elements.json")
+        self.content["Gfb"]["snapshot_test"]["level_1"] = 12.
+        self.write()
+        vcs.scriptrun(self.script)
+        # files with the same name in different directories have their own snapshots
+        self.assertEqual(len(self.snapshots()), 2)
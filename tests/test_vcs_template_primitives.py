@@ -0,0 +1,66 @@
+import basevcstest
+import vcs
+
+
+class TestVCSTemplatePrimitives(basevcstest.VCSBaseTest):
+    def testGroups(self):
+        primitives = vcs.template._TemplatePrimitives()
+        primitives.addLine("default", "linear", 1, [[0., 1.], [0., 1.]], [[0., 0.], [1., 1.]])
+        primitives.addLine("default", "linear", 1, [[0., 0.]], [[0., 1.]])
+        primitives.addLine("default", "linear", 2, [[1., 1.]], [[0., 1.]])
+        primitives.addLine("default", "linear", 0, [[.5, .5]], [[0., 1.]])
+        primitives.addText("default", "default", "linear", 1, ["a", "b"], [.1, .2], [.1, .2])
+        primitives.addText("default", "defcenter", "linear", 1, ["c"], [.3], [.3])
+        self.assertEqual(len(primitives.lines), 2)
+        source, X, Y, colors, widths, types = list(primitives.lines.values())[0]
+        self.assertEqual(len(X), 3)
+        self.assertEqual(len(colors), 3)
+        self.assertEqual(len(primitives.texts), 2)
+        elements = dict((k, len(vcs.elements[k])) for k in vcs.elements)
+        primitives.plot(self.x, bg=self.bg, donotstoredisplay=True, render=False)
+        self.assertEqual(elements, dict((k, len(vcs.elements[k])) for k in vcs.elements))
+
+    def testMultiPanel(self):
+        s = self.clt("clt", slice(0, 1), squeeze=1)
+        templates = []
+        for i in range(4):
+            for j in range(4):
+                t = vcs.createtemplate()
+                t.scale(.25)
+                t.move(i * .25 - .05, "x")
+                t.move(j * .25 - .05, "y")
+                templates.append(t)
+        added = []
+        groups = []
+        original = vcs.template._TemplatePrimitives
+
+        class Primitives(original):
+            def addLine(self, source, projection, priority, xs, ys):
+                if priority != 0 and len(xs) > 0:
+                    added.append(source)
+                original.addLine(self, source, projection, priority, xs, ys)
+
+            def addText(self, texttable, textorientation, projection, priority, strings, xs, ys):
+                if priority != 0 and len(xs) > 0:
+                    added.append(texttable)
+                original.addText(self, texttable, textorientation, projection, priority, strings, xs, ys)
+
+            def plot(self, x, bg=False, **kargs):
+                groups.append(len(self.lines) + len(self.texts))
+                return original.plot(self, x, bg=bg, **kargs)
+        vcs.template._TemplatePrimitives = Primitives
+        try:
+            self.x.plot(s, templates[0], bg=self.bg)
+            scene = self.x.backend.contextView.GetScene()
+            panelItems = scene.GetNumberOfItems()
+            for t in templates[1:]:
+                self.x.plot(s, t, bg=self.bg)
+        finally:
+            vcs.template._TemplatePrimitives = original
+        self.assertEqual(len(self.x.display_names), len(templates))
+        # the ticks, labels and boxes of each panel are plotted as a few groups
+        self.assertEqual(len(groups), len(templates))
+        self.assertLess(sum(groups), len(added))
+        self.assertEqual(len(set(groups)), 1)
+        # the context items grow with the panels, not with their primitives
+        self.assertLessEqual(scene.GetNumberOfItems(), len(templates) * panelItems)
@@ -0,0 +1,41 @@
+import basevcstest
+import vcs
+
+
+class TestVCSTextCache(basevcstest.VCSBaseTest):
+    def testActorPool(self):
+        s = self.clt("clt", slice(0, 1), squeeze=1)
+        self.x.plot(s, bg=self.bg)
+        created = self.x.backend.textCacheInfo()["actorsCreated"]
+        self.assertGreater(created, 0)
+        self.x.clear()
+        d = self.x.plot(s, bg=self.bg)
+        info = self.x.backend.textCacheInfo()
+        self.assertEqual(info["actorsCreated"], created)
+        self.assertGreater(info["actorsReused"], 0)
+        self.assertGreater(info["propertyHits"], 0)
+        self.assertTrue(d.backend["vtk_backend_Max_text_actor"].GetVisibility())
+
+    def testClearedDisplay(self):
+        s = self.clt("clt", slice(0, 1), squeeze=1)
+        old = self.x.plot(s, bg=self.bg)
+        self.x.clear(preserve_display=True)
+        new = self.x.plot(s * 2, bg=self.bg)
+        maximum = new.backend["vtk_backend_Max_text_actor"].GetInput()
+        # the cleared display no longer holds the pooled actors
+        self.assertNotIn("vtk_backend_Max_text_actor", old.backend)
+        self.assertNotIn("vtk_backend_text_actors", old.backend)
+        self.x.backend.update_input(old.backend, s * 3, update=False)
+        self.assertEqual(new.backend["vtk_backend_Max_text_actor"].GetInput(), maximum)
+
+    def testExtents(self):
+        t = self.x.createtext()
+        t.string = ["Hello", "World"]
+        t.x = [.2, .5]
+        t.y = [.3, .6]
+        vcs.vcs2vtk.textCache.clear()
+        extents = self.x.gettextextent(t)
+        self.assertEqual(self.x.gettextextent(t), extents)
+        self.assertEqual(self.x.backend.textCacheInfo()["layoutsAvoided"], 2)
+        t.height = t.height * 2
+        self.assertNotEqual(self.x.gettextextent(t), extents)
@@ -0,0 +1,43 @@
+import basevcstest
+import vcs
+
+
+class TestVCSVectorThinning(basevcstest.VCSBaseTest):
+    def testAttribute(self):
+        gv = vcs.createvector()
+        self.assertIsNone(gv.thinning)
+        gv.thinning = 20
+        self.assertEqual(vcs.createvector(source=gv).thinning, 20)
+        with self.assertRaises(ValueError):
+            gv.thinning = 0
+        gs = vcs.createstreamline()
+        self.assertIsNone(gs.thinning)
+        with self.assertRaises(ValueError):
+            gs.thinning = "a"
+
+    def testVector(self):
+        u = self.clt("u", slice(0, 2), squeeze=1)
+        v = self.clt("v", slice(0, 2), squeeze=1)
+        gv = vcs.createvector()
+        d = self.x.plot(u[0], v[0], gv, bg=self.bg)
+        self.assertNotIn("vtk_backend_thinning", d.backend)
+        points = d.backend["vtk_backend_grid"].GetNumberOfPoints()
+        self.x.clear()
+        gv.thinning = 40
+        d = self.x.plot(u[0], v[0], gv, bg=self.bg)
+        ystride, xstride = d.backend["vtk_backend_thinning"]
+        width, height = self.x.backend.renWin.GetSize()
+        template = vcs.gettemplate(d.template)
+        self.assertLessEqual(u.shape[-1] // xstride, (template.data.x2 - template.data.x1) * width / 40 + 1)
+        self.assertLessEqual(u.shape[-2] // ystride, (template.data.y2 - template.data.y1) * height / 40 + 1)
+        self.assertLess(d.backend["vtk_backend_grid"].GetNumberOfPoints(), points)
+        # the new data is thinned like the plotted one
+        d.set_data(u[1], v[1])
+
+    def testStreamline(self):
+        u = self.clt("u", slice(0, 1), squeeze=1)
+        v = self.clt("v", slice(0, 1), squeeze=1)
+        gs = vcs.createstreamline()
+        gs.thinning = 40
+        d = self.x.plot(u, v, gs, bg=self.bg)
+        self.assertIn("vtk_backend_thinning", d.backend)
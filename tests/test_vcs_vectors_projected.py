@@ -0,0 +1,48 @@
+import basevcstest
+import numpy
+import cdms2
+import vcs
+from vcs import vcs2vtk
+
+
+class TestVCSVectorsProjected(basevcstest.VCSBaseTest):
+    def __init__(self, *args, **kwargs):
+        kwargs['geometry'] = {"width": 800, "height": 600}
+        super(TestVCSVectorsProjected, self).__init__(*args, **kwargs)
+
+    def uv(self):
+        lat = cdms2.createUniformLatitudeAxis(-88., 45, 4.)
+        lon = cdms2.createUniformLongitudeAxis(2., 90, 4.)
+        lons, lats = numpy.meshgrid(lon[:], lat[:])
+        u = cdms2.createVariable(10. * numpy.cos(numpy.radians(lats)),
+                                 axes=[lat, lon], id="u")
+        v = cdms2.createVariable(5. * numpy.sin(numpy.radians(lons)),
+                                 axes=[lat, lon], id="v")
+        return u, v
+
+    def testVectorsToLonLat(self):
+        lonlat = numpy.array([[0., 0., 0.], [10., 60., 0.]])
+        vectors = numpy.array([[1000., 1000., 0.], [1000., -1000., 0.]])
+        result = vcs2vtk.vectorsToLonLat(lonlat, vectors)
+        # one degree is ~111km at the equator, half of it at 60N
+        self.assertAlmostEqual(result[0, 0], .008983, 5)
+        self.assertAlmostEqual(result[1, 0] / result[0, 0], 2., 1)
+        self.assertAlmostEqual(result[0, 1], -result[1, 1])
+        self.assertEqual(result[:, 2].tolist(), [0., 0.])
+
+    def testProjected(self):
+        u, v = self.uv()
+        for projection in ["robinson", "polar"]:
+            for method in ["vector", "streamline"]:
+                gm = vcs.creategraphicsmethod(method)
+                gm.projection = projection
+                if method == "streamline":
+                    gm.evenlyspaced = False
+                    gm.numberofseeds = 100
+                d = self.x.plot(u, v, gm, bg=self.bg)
+                self.assertEqual(len(d.backend["vtk_backend_actors"]), 1)
+                if method == "vector":
+                    glyphs = d.backend["vtk_backend_glyphfilters"][0]
+                    glyphs.Update()
+                    self.assertGreater(glyphs.GetOutput().GetNumberOfPoints(), 0)
+                self.x.clear()
@@ -0,0 +1,61 @@
+import unittest
+import numpy
+import vtk
+from vtk.util import numpy_support as VN
+from vcs import vcs2vtk
+
+
+class TestVCSWrapData(unittest.TestCase):
+    def grid(self, nx, ny):
+        vg = vtk.vtkStructuredGrid()
+        vg.SetDimensions(nx + 1, ny + 1, 1)
+        lon, lat = numpy.meshgrid(numpy.linspace(0., 360., nx + 1),
+                                  numpy.linspace(-90., 90., ny + 1))
+        pts = numpy.c_[lon.ravel(), lat.ravel(), numpy.zeros(lon.size)]
+        points = vtk.vtkPoints()
+        points.SetData(VN.numpy_to_vtk(pts, deep=True))
+        vg.SetPoints(points)
+        scalars = VN.numpy_to_vtk(numpy.arange(nx * ny, dtype=numpy.float64),
+                                  deep=True)
+        scalars.SetName("scalars")
+        vg.GetCellData().SetScalars(scalars)
+        return vg
+
+    def testCellArrayRoundTrip(self):
+        offsets = numpy.array([0, 2, 5, 5, 6], dtype=vcs2vtk.vtkIdTypeCode)
+        connectivity = numpy.array([0, 1, 1, 2, 3, 4],
+                                   dtype=vcs2vtk.vtkIdTypeCode)
+        cells = vcs2vtk.numpyToVTKCellArray(offsets, connectivity)
+        o, c = vcs2vtk.cellArrayToNumpy(cells)
+        self.assertEqual(o.tolist(), offsets.tolist())
+        self.assertEqual(c.tolist(), connectivity.tolist())
+
+    def testWrap(self):
+        for fastClip in [True, False]:
+            # three periods requested, each cell is copied once per period
+            wrapped = vcs2vtk.doWrapData(self.grid(36, 18), [-540., 540., -90., 90.],
+                                         fastClip=fastClip)
+            bounds = wrapped.GetBounds()
+            self.assertLessEqual(bounds[0], -540.)
+            self.assertGreaterEqual(bounds[1], 540.)
+            scalars = VN.vtk_to_numpy(wrapped.GetCellData().GetScalars())
+            if fastClip:
+                # cells touching the window edges are kept
+                counts = numpy.bincount(scalars.astype(int))
+                self.assertEqual(len(counts), 36 * 18)
+                self.assertTrue(numpy.all(counts >= 3))
+                self.assertTrue(numpy.all(counts <= 4))
+            else:
+                self.assertEqual(set(scalars.astype(int)), set(range(36 * 18)))
+
+    def testSubWindow(self):
+        wrapped = vcs2vtk.doWrapData(self.grid(36, 18), [-15., 15., 0., 90.])
+        # only the cells intersecting the window are kept
+        self.assertEqual(wrapped.GetNumberOfCells(), 4 * 10)
+        bounds = wrapped.GetBounds()
+        self.assertEqual(list(bounds[:4]), [-20., 20., -10., 90.])
+
+    def testNothingToWrap(self):
+        data = self.grid(36, 18)
+        wrapped = vcs2vtk.doWrapData(data, [1.e20] * 4)
+        self.assertEqual(wrapped.GetNumberOfCells(), 36 * 18)
@@ -16,11 +16,11 @@
     .. _long: https://docs.python.org/2/library/functions.html?highlight=float#long
     .. _file: https://docs.python.org/2/library/functions.html?highlight=open#file
 """
+import contextlib
 import warnings
 import numpy.ma
 import MV2
 import numpy
-import cdat_info
 from .queries import *  # noqa
 from . import boxfill
 from . import isofill
@@ -34,12 +34,7 @@ from . import textorientation
 from . import textcombined
 from . import template
 from . import displayplot
-try:
-    import vtk
-    from .VTKPlots import VTKVCSBackend
-    HAS_VTK = True
-except Exception:
-    HAS_VTK = False
+from .ffmpegstream import FFMPEGStream
 from weakref import WeakSet, WeakKeyDictionary
 
 from .error import vcsError
@@ -61,7 +56,6 @@ from .xmldocs import plot_keywords_doc, graphics_method_core, axesconvert, xaxis
 gui_canvas_closed = 0
 canvas_closed = 0
 import vcs.manageElements  # noqa
-from . import configurator  # noqa
 from .projection import no_deformation_projections  # noqa
 try:
     import vcsaddons  # noqa
@@ -346,6 +340,17 @@ def _process_keyword(obj, target, source, keyargs, default=None):
     return arg
 
 
+def _vtkBackend():
+    """Imports VTK and the VTK backend once a canvas is created, returns
+    (None, None) when VTK can not be imported"""
+    try:
+        import vtk
+        from .VTKPlots import VTKVCSBackend
+    except Exception:
+        return None, None
+    return vtk, VTKVCSBackend
+
+
 class Canvas(vcs.bestMatch):
     """Usually created using :py:func:`vcs.init`, this object provides easy access
     to the functionality of the entire VCS module:
@@ -942,9 +947,10 @@ class Canvas(vcs.bestMatch):
                 bg = True
         except (AttributeError, NameError):
             pass
-        if HAS_VTK and backend == "vtk":
+        vtk, VTKVCSBackend = _vtkBackend()
+        if vtk is not None and backend == "vtk":
             self.backend = VTKVCSBackend(self, bg=bg)
-        elif HAS_VTK and isinstance(backend, vtk.vtkRenderWindow):
+        elif vtk is not None and isinstance(backend, vtk.vtkRenderWindow):
             self.backend = VTKVCSBackend(self, renWin=backend, bg=bg)
         else:
             warnings.warn(
@@ -979,6 +985,7 @@ class Canvas(vcs.bestMatch):
             if "3d" in d.g_type.lower():
                 return
         if self.configurator is None:
+            from . import configurator
             self.configurator = configurator.Configurator(self)
             self.configurator.update()
             self.configurator.show()
@@ -1055,11 +1062,15 @@ class Canvas(vcs.bestMatch):
         """
         self.drawLogo = self.enableLogo
 
-    def update(self, *args, **kargs):
+    def update(self, display=None, array1=None, array2=None, *args, **kargs):
         """If a series of commands are given to VCS and the Canvas Mode is
         set to manual, then use this function to update the plot(s)
         manually.
 
+        If a display (or its name) is given, its data is replaced by array1
+        (and array2) reusing the existing plot pipeline, see
+        :py:func:`vcs.displayplot.Dp.set_data`.
+
         :Example:
 
             .. doctest:: canvas_update
@@ -1078,8 +1089,22 @@ class Canvas(vcs.bestMatch):
                 >>> box.datawc(1e20,1e20,1e20,1e20)
                 >>> box.datawc(-45.0, 45.0, -90.0, 90.0)
                 >>> a.update() # Update the changes manually
-        """
+                >>> d = a.plot(f('clt', slice(0, 1)), bg=1)
+                >>> a.update(d, f('clt', slice(1, 2))) # Redraw with new data
 
+        :param display: The display to update
+        :type display: vcs.displayplot.Dp or str
+
+        :param array1: New data for the display
+        :type array1: cdms2.tvariable.TransientVariable
+
+        :param array2: New second array for the display (vector plots)
+        :type array2: cdms2.tvariable.TransientVariable
+        """
+        if display is not None:
+            if isinstance(display, basestring):
+                display = vcs.elements["display"][display]
+            return display.set_data(array1, array2, *args, **kargs)
         return self.backend.update(*args, **kargs)
 
     def scriptobject(self, obj, script_filename=None, mode=None):
@@ -2749,6 +2774,20 @@ class Canvas(vcs.bestMatch):
                         point attributes, boxfill and meshfill need cell attributes
                         the default is True (if the parameter is not specified).
 
+                * Block average rectilinear data to about one cell per pixel of the template
+                  data area before plotting it (VTK backend only, ignored for vectors)
+
+                    .. code-block:: python
+
+                        adaptive_resolution = False | True
+
+                    .. note::
+
+                        Missing values are kept where all the values of a block are missing,
+                        the min, max and levels are computed from the full resolution data.
+                        1D lines keep the first, last, lowest and highest points of each pixel
+                        column of the data area, their markers are all drawn.
+
                 * Graphics Output in Background Mode:
 
                     .. code-block:: python
@@ -2853,7 +2892,7 @@ class Canvas(vcs.bestMatch):
         original_elts = {}
         new_elts = {}
         for k in list(vcs.elements.keys()):
-            original_elts[k] = list(vcs.elements[k].keys())
+            original_elts[k] = set(vcs.elements[k])
             new_elts[k] = []
         # First of all try some cleanup
         assert len(arglist) == 6
@@ -4254,7 +4293,7 @@ class Canvas(vcs.bestMatch):
                     if e == "display":
                         continue
                     for k in new_elts[e]:
-                        if k in list(vcs.elements[e].keys()):
+                        if k in vcs.elements[e]:
                             del(vcs.elements[e][k])
             if not preserve_display:
                 del(vcs.elements["display"][nm])
@@ -4375,6 +4414,32 @@ class Canvas(vcs.bestMatch):
         """
         return self.backend.flush(*args)
 
+    @contextlib.contextmanager
+    def deferred_render(self):
+        """Context manager deferring the render done after each plot.
+
+        The plots drawn in the block are rendered all at once: when the block
+        ends for an on screen canvas, by the output (png, svg, pdf...) for a
+        background canvas. This saves one full window render per plot when
+        composing multi-panel pages.
+
+        :Example:
+
+            .. doctest:: canvas_deferred_render
+
+                >>> a=vcs.init(bg=True)
+                >>> array = [range(1, 11) for _ in range(1, 11)]
+                >>> with a.deferred_render():
+                ...     for t in ['top_of2', 'bot_of2']:
+                ...         d = a.plot(array, vcs.createtemplate(source=t))
+                >>> a.png('deferred') # the page is rendered once here
+        """
+        self.backend.deferRender(True)
+        try:
+            yield self
+        finally:
+            self.backend.deferRender(False)
+
     def geometry(self, *args):
         """The geometry command is used to set the size and position of the VCS canvas.
 
@@ -4789,6 +4854,45 @@ class Canvas(vcs.bestMatch):
 
         return JupyterFFMPEG(movie, result)
 
+    def ffmpeg_stream(self, movie, rate=None, options=None):
+        """Movie output from frames grabbed on the canvas, without
+        writing intermediate image files. Frames are piped to ffmpeg.
+
+        .. note::
+
+            ffmpeg ALWAYS overwrites the output file
+
+        :Example:
+
+            .. doctest:: canvas_ffmpeg_stream
+
+                >>> a=vcs.init(bg=True)
+                >>> import cdms2
+                >>> f = cdms2.open(vcs.sample_data+'/clt.nc')
+                >>> s = f('clt')
+                >>> d = a.plot(s[0])
+                >>> stream = a.ffmpeg_stream('clt.mp4', rate=5)
+                >>> for i in range(s.shape[0]):
+                ...     d.set_data(s[i], render=False)
+                ...     stream.add_frame() # grabs the canvas
+                >>> stream.close() # wait for ffmpeg to finish
+                <vcs.Canvas.JupyterFFMPEG object at 0x...>
+
+        :param movie: Output video file name
+        :type movie: `str`_
+
+        :param rate: Desired output framerate
+        :type rate: `str`_
+
+        :param options: Additional FFMPEG arguments
+        :type options: `str`_
+
+        :returns: A stream, call its add_frame() method for each frame
+            then close() to finish the movie
+        :rtype: vcs.ffmpegstream.FFMPEGStream
+        """
+        return FFMPEGStream(movie, self, rate, options)
+
     def getantialiasing(self):
         """Returns the current antialiasing rate for the canvas.
 
@@ -4937,6 +5041,7 @@ class Canvas(vcs.bestMatch):
         W, H = self._compute_width_height(
             width, height, units, background=True)
         if provenance is True:
+            import cdat_info
             provenance = cdat_info.generateProvenance(history=True)
         if isinstance(provenance, dict):
             metadata = args.get("metadata", {})
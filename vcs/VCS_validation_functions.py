@@ -257,6 +257,18 @@ def checkListOfNumbers(self, name, value, minvalue=None,
     return list(value)
 
 
+def checkArrayOfCoordinates(self, name, value):
+    """Checks a numpy array of coordinates, 1D for a single line or marker
+    group, 2D for several, and returns it as (a list of) lists.
+    The values are checked at once instead of one by one."""
+    checkName(self, name, value)
+    if value.ndim not in [1, 2] or value.dtype.kind not in "biuf":
+        checkedRaise(self, value, ValueError, name + ' must be a 1D or 2D array of numbers')
+    if numpy.ma.is_masked(value):
+        checkedRaise(self, value, ValueError, name + ' must not have missing values')
+    return numpy.ma.getdata(value).astype(float).tolist()
+
+
 def checkInStringList(self, name, value, options):
     checkName(self, name, value)
     if value not in options:
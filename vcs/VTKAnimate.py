@@ -8,8 +8,12 @@ import hashlib
 import os
 import shutil
 import glob
+import multiprocessing
 import vcs
 
+# State inherited (through fork) by the processes rendering animation frames
+_workerState = {}
+
 
 def update_input(canvas, dimensions, frame_num, update=True):
     # Ok let's loop through the arrays and figure out the slice needed and
@@ -44,6 +48,46 @@ def update_input(canvas, dimensions, frame_num, update=True):
                 update=update)
 
 
+def _renderFrames(frames):
+    """Renders frames to png files in a VTKAnimationCreate worker process.
+
+    Each worker plots the displays once on its own background canvas then
+    only updates the data for each frame.
+    """
+    creator = _workerState["creator"]
+    controller = creator.controller
+    canvas = _workerState.get("canvas")
+    if canvas is None:
+        width, height = _workerState["size"]
+        canvas = vcs.init(geometry={"width": width, "height": height}, bg=True)
+        canvas.setbgoutputdimensions(width, height, units="pixels")
+        canvas.setcolormap(controller.vcs_self.getcolormapname())
+        canvas.setantialiasing(controller.vcs_self.getantialiasing())
+        if not controller.vcs_self.getdrawlogo():
+            canvas.drawlogooff()
+        controller.plot_to_canvas(canvas, _workerState["displays"], bg=1)
+        _workerState["canvas"] = canvas
+    for frame_num in frames:
+        update_input(
+            canvas,
+            controller._number_of_dims_used_for_plot,
+            frame_num,
+            update=False)
+        _writeFrame(canvas, creator.get_frame_name(frame_num))
+    return frames
+
+
+def _writeFrame(canvas, png_name):
+    """Writes the canvas to png_name through a hidden temporary file.
+
+    The rename only happens once the png is complete, so a frame file
+    that exists is never a partial one, even if its process is killed.
+    """
+    tmp_name = os.path.join(os.path.dirname(png_name), "." + os.path.basename(png_name))
+    canvas.png(tmp_name)
+    os.rename(tmp_name, png_name)
+
+
 class VTKAnimationCreate(animate_helper.StoppableThread):
 
     def __init__(self, controller):
@@ -57,6 +101,10 @@ class VTKAnimationCreate(animate_helper.StoppableThread):
         self.canvas.width *= 2
         self.canvas.height *= 2
         self.controller.animation_created = True
+        self.pool = None
+        workers = controller.create_params.workers
+        if workers > 1 and controller.number_of_frames() > 1:
+            self.start_pool(workers)
         import atexit
         atexit.register(self.close)
 
@@ -65,7 +113,74 @@ class VTKAnimationCreate(animate_helper.StoppableThread):
             time.asctime().encode("utf-8") + str(random.randint(0, 10000)).encode("utf8")).hexdigest()
 
     def run(self):
-        pass
+        if self.pool is not None:
+            self.render_frames()
+
+    def start_pool(self, workers):
+        """
+        Forks the 'workers' processes rendering the frames, each one with
+        its own background canvas.
+
+        This is called from the thread creating the animation (the main
+        thread), not from run(): forking from the create thread could
+        copy locks held by other threads. The workers inherit the state of
+        the main canvas, including its render window, but only ever draw
+        on the canvas they create.
+        """
+        try:
+            context = multiprocessing.get_context("fork")
+        except (AttributeError, ValueError):
+            # no fork on this platform, frames are drawn on demand
+            return
+        nframes = self.controller.number_of_frames()
+        # create the animation directory before the workers use it
+        self.get_frame_name(0)
+        chunk = max(1, nframes // (workers * 4))
+        self.shards = [list(range(i, min(i + chunk, nframes)))
+                       for i in range(0, nframes, chunk)]
+        _workerState.clear()
+        _workerState.update({
+            "creator": self,
+            "displays": list(self.controller.vcs_self.display_names),
+            "size": self.controller.vcs_self.backend.renWin.GetSize(),
+        })
+        self.pool = context.Pool(min(workers, len(self.shards)))
+
+    def stop_pool(self):
+        """Kills the workers and removes the frames they did not finish."""
+        if self.pool is None:
+            return
+        self.pool.terminate()
+        self.pool.join()
+        self.pool = None
+        _workerState.clear()
+        for tmp_name in glob.glob(os.path.join(os.path.dirname(self.get_frame_name(0)), ".anim_*.png")):
+            os.remove(tmp_name)
+
+    def render_frames(self):
+        """
+        Renders all the frames with the pool of processes. The frames are
+        split in contiguous chunks so each worker only updates the data
+        between frames.
+        Emits the controller's drawn signal as frames are written, in order.
+        """
+        try:
+            for frames in self.pool.imap(_renderFrames, self.shards):
+                if self.is_stopped():
+                    break
+                self.wait_if_paused()
+                if self.controller.signals is not None:
+                    for frame_num in frames:
+                        self.controller.signals.drawn.emit(frame_num)
+        finally:
+            self.stop_pool()
+        self.controller.animation_files = sorted(
+            glob.glob(
+                os.path.join(
+                    os.path.dirname(self.get_frame_name(0)),
+                    "*.png")))
+        if self.controller.signals is not None and not self.is_stopped():
+            self.controller.signals.created.emit()
 
     def get_frame_name(self, frame_num):
         png_name = os.path.join(
@@ -102,7 +217,7 @@ class VTKAnimationCreate(animate_helper.StoppableThread):
             frame_num,
             update=False)
 
-        self.canvas.png(png_name)
+        _writeFrame(self.canvas, png_name)
 
     def describe(self):
         for info in self.controller.animate_info:
@@ -116,6 +231,7 @@ class VTKAnimationCreate(animate_helper.StoppableThread):
                 print("No Array")
 
     def close(self):
+        self.stop_pool()
         self.canvas.close()
 
 
@@ -342,6 +458,37 @@ class VTKAnimate(animate_helper.AnimationController):
             self.create_thread.create_prefix()
             self.reclaim_renderers()
 
+    def save(self, movie, bitrate=1024, rate=None, options=None, stream=False):
+        """Save animation to a file
+
+        With stream=True the frames are drawn on the canvas and piped to
+        ffmpeg (see vcs.Canvas.Canvas.ffmpeg_stream) instead of going
+        through png files.
+        """
+        if not stream:
+            return super(VTKAnimate, self).save(movie, bitrate, rate, options)
+        if self.created():
+            if rate is None:
+                rate = self.playback_params.fps()
+            self.reclaim_renderers()
+            ffmpeg = self.vcs_self.ffmpeg_stream(movie, rate, options)
+            try:
+                for frame_num in range(self.number_of_frames()):
+                    update_input(
+                        self.vcs_self,
+                        self._number_of_dims_used_for_plot,
+                        frame_num,
+                        update=False)
+                    ffmpeg.add_frame()
+            finally:
+                result = ffmpeg.close()
+            # back to the current frame
+            update_input(
+                self.vcs_self,
+                self._number_of_dims_used_for_plot,
+                self.frame_num)
+            return result
+
     def frame(self, frame):
         self.draw_frame(
             frame_num=frame,
@@ -248,6 +248,9 @@ class VTKVCSBackend(object):
             # "vtk_backend_pipeline_context_area",
             "vtk_backend_viewport_scale",
             "vtk_backend_draw_area_bounds",
+            # block average rectilinear data to the resolution of the
+            # template data area
+            "adaptive_resolution",
         ]
         self.numberOfPlotCalls = 0
         self.renderWindowSize = None
@@ -268,6 +271,12 @@ class VTKVCSBackend(object):
             self.oldCursor = None
 
         self._animationActorTransforms = {}
+        # text actors reused after each clear
+        self._textActorPool = vcs2vtk.textcache.TextActorPool(vcs2vtk.TextActorWrapperItem)
+        # nesting level of Canvas.deferred_render and whether a render was
+        # skipped meanwhile
+        self._deferRender = 0
+        self._renderPending = False
 
     def setAnimationStepper(self, stepper):
         for plot in list(self.plotApps.values()):
@@ -558,6 +567,20 @@ class VTKVCSBackend(object):
         if restart_anim:
             self.canvas.configurator.start_animating()
 
+    def _releaseTextActors(self):
+        """Gives the text actors back to the pool, after removing them from
+        the displays of the canvas: updating a cleared display must not
+        change the labels of a new plot reusing its actors."""
+        for dnm in self.canvas.display_names:
+            backend = getattr(vcs.elements["display"].get(dnm), "backend", None)
+            if not isinstance(backend, dict):
+                continue
+            for key in list(backend.keys()):
+                if key == "vtk_backend_text_actors" or \
+                        (key.startswith("vtk_backend_") and key.endswith("_text_actor")):
+                    del backend[key]
+        self._textActorPool.release()
+
     def clear(self, render=True):
         if self.renWin is None:  # Nothing to clear
             return
@@ -581,6 +604,7 @@ class VTKVCSBackend(object):
                 self.popupInfoContextArea = None
 
             self.contextView.GetScene().ClearItems()
+            self._releaseTextActors()
             r, g, b = [c / 255. for c in self.canvas.backgroundcolor]
             self.contextView.GetRenderer().SetBackground(r, g, b)
 
@@ -596,7 +620,7 @@ class VTKVCSBackend(object):
         self.showGUI(render=False)
 
         if hasValidRenderer and self.renWin.IsDrawable() and render:
-            self.renWin.Render()
+            self.render()
         self.numberOfPlotCalls = 0
         self.logoRenderer = None
         self.createLogo()
@@ -825,7 +849,33 @@ class VTKVCSBackend(object):
 
     def flush(self):
         if self.renWin is not None:
-            self.renWin.Render()
+            self.render(force=True)
+
+    def render(self, force=False):
+        """Renders the window, unless renders are deferred and force is
+        False in which case the render is only recorded as pending."""
+        if self._deferRender and not force:
+            self._renderPending = True
+            return
+        self._renderPending = False
+        self.renWin.Render()
+
+    def renderPending(self):
+        """Renders the window if a render was deferred."""
+        if self._renderPending and self.renWin is not None:
+            self.render(force=True)
+
+    def deferRender(self, defer):
+        """Starts (defer=True) or ends deferring the renders done after
+        each plot, nested calls are counted. When the outermost one ends
+        an on screen window is rendered once if needed, a background
+        window is only rendered by its outputs (png, svg, pdf...)."""
+        if defer:
+            self._deferRender += 1
+            return
+        self._deferRender = max(0, self._deferRender - 1)
+        if self._deferRender == 0 and not self.bg:
+            self.renderPending()
 
     def plot(self, data1, data2, template, gtype, gname, bg, *args, **kargs):
         self.numberOfPlotCalls += 1
@@ -921,7 +971,8 @@ class VTKVCSBackend(object):
                     area,
                     to=to,
                     tt=tt,
-                    cmap=self.canvas.colormap, geoBounds=bounds, geo=vtk_backend_geo)
+                    cmap=self.canvas.colormap, geoBounds=bounds, geo=vtk_backend_geo,
+                    pool=self._textActorPool)
         elif gtype == "line":
             if gm.priority != 0:
                 vcs2vtk.prepLine(self, gm, geoBounds=bounds,
@@ -985,7 +1036,7 @@ class VTKVCSBackend(object):
 
         if not kargs.get("donotstoredisplay", False) and kargs.get(
                 "render", True):
-            self.renWin.Render()
+            self.render()
 
         return returned
 
@@ -1039,19 +1090,26 @@ class VTKVCSBackend(object):
         continents_path = self.canvas._continentspath(continentType)
         if continents_path is None:
             return (None, 1, 1)
-        xforward = vcs.utils.axisConvertFunctions[kargs.get(
-            'xaxisconvert', 'linear')]['forward']
-        yforward = vcs.utils.axisConvertFunctions[kargs.get(
-            'yaxisconvert', 'linear')]['forward']
-        contData = vcs2vtk.prepContinents(continents_path, xforward, yforward)
-        contData = vcs2vtk.doWrapData(contData, wc, fastClip=False)
-
-        if projection.type != "linear":
-            cpts = contData.GetPoints()
-            # we use plotting coordinates for doing the projection so
-            # that parameters such that central meridian are set correctly.
-            _, gcpts = vcs2vtk.project(cpts, projection, wc)
-            contData.SetPoints(gcpts)
+        xaxisconvert = kargs.get('xaxisconvert', 'linear')
+        yaxisconvert = kargs.get('yaxisconvert', 'linear')
+        cacheKey = vcs2vtk.continentsFingerprint(
+            continents_path, xaxisconvert, yaxisconvert, wc, projection)
+        cached = vcs2vtk.continentsCache.get(cacheKey)
+        if cached is not None:
+            contData = cached[0]
+        else:
+            xforward = vcs.utils.axisConvertFunctions[xaxisconvert]['forward']
+            yforward = vcs.utils.axisConvertFunctions[yaxisconvert]['forward']
+            contData = vcs2vtk.prepContinents(continents_path, xforward, yforward)
+            contData = vcs2vtk.doWrapData(contData, wc, fastClip=False)
+
+            if projection.type != "linear":
+                cpts = contData.GetPoints()
+                # we use plotting coordinates for doing the projection so
+                # that parameters such that central meridian are set correctly.
+                _, gcpts = vcs2vtk.project(cpts, projection, wc)
+                contData.SetPoints(gcpts)
+            vcs2vtk.continentsCache.put(cacheKey, contData)
 
         contLine = self.canvas.getcontinentsline()
 
@@ -1084,17 +1142,7 @@ class VTKVCSBackend(object):
 
         vcs2vtk.configureContextArea(area, contBounds, geom)
 
-        color_arr = vtk.vtkUnsignedCharArray()
-        color_arr.SetNumberOfComponents(4)
-        color_arr.SetName("Colors")
-
-        for i in range(contData.GetNumberOfCells()):
-            if len(color) == 4:
-                color_arr.InsertNextTypedTuple(color)
-            else:
-                color_arr.InsertNextTypedTuple(
-                    [color[0], color[1], color[2], 255])
-
+        color_arr = vcs2vtk.generateSolidColorArray(contData.GetNumberOfCells(), color, "Colors")
         contData.GetCellData().AddArray(color_arr)
 
         # Handle line drawing properties (line width + stipple)
@@ -1189,7 +1237,7 @@ class VTKVCSBackend(object):
                 tt = vcs.elements["texttable"][tt]
                 to = vcs.elements["textorientation"][to]
                 if crdate.priority > 0:
-                    actors = vcs2vtk.genTextActor(area, to=to, tt=tt)
+                    actors = vcs2vtk.genTextActor(area, to=to, tt=tt, pool=self._textActorPool)
                     returned["vtk_backend_crdate_text_actor"] = actors[0]
                 del(vcs.elements["texttable"][tt.name])
                 del(vcs.elements["textorientation"][to.name])
@@ -1198,7 +1246,7 @@ class VTKVCSBackend(object):
                 tt = vcs.elements["texttable"][tt]
                 to = vcs.elements["textorientation"][to]
                 if crtime.priority > 0:
-                    actors = vcs2vtk.genTextActor(area, to=to, tt=tt)
+                    actors = vcs2vtk.genTextActor(area, to=to, tt=tt, pool=self._textActorPool)
                     returned["vtk_backend_crtime_text_actor"] = actors[0]
                 del(vcs.elements["texttable"][tt.name])
                 del(vcs.elements["textorientation"][to.name])
@@ -1219,7 +1267,7 @@ class VTKVCSBackend(object):
                 tt = vcs.elements["texttable"][tt]
                 to = vcs.elements["textorientation"][to]
                 if zname.priority > 0:
-                    vcs2vtk.genTextActor(area, to=to, tt=tt)
+                    vcs2vtk.genTextActor(area, to=to, tt=tt, pool=self._textActorPool)
                 del(vcs.elements["texttable"][tt.name])
                 del(vcs.elements["textorientation"][to.name])
                 del(vcs.elements["textcombined"][zname.name])
@@ -1230,7 +1278,7 @@ class VTKVCSBackend(object):
                         tt, to = zunits.name.split(":::")
                         tt = vcs.elements["texttable"][tt]
                         to = vcs.elements["textorientation"][to]
-                        vcs2vtk.genTextActor(area, to=to, tt=tt)
+                        vcs2vtk.genTextActor(area, to=to, tt=tt, pool=self._textActorPool)
                         del(vcs.elements["texttable"][tt.name])
                         del(vcs.elements["textorientation"][to.name])
                         del(vcs.elements["textcombined"][zunits.name])
@@ -1238,7 +1286,7 @@ class VTKVCSBackend(object):
                 tt = vcs.elements["texttable"][tt]
                 to = vcs.elements["textorientation"][to]
                 if zvalue.priority > 0:
-                    actors = vcs2vtk.genTextActor(area, to=to, tt=tt)
+                    actors = vcs2vtk.genTextActor(area, to=to, tt=tt, pool=self._textActorPool)
                     returned["vtk_backend_zvalue_text_actor"] = actors[0]
                 del(vcs.elements["texttable"][tt.name])
                 del(vcs.elements["textorientation"][to.name])
@@ -1422,6 +1470,7 @@ class VTKVCSBackend(object):
 
     def pdf(self, file, width=None, height=None, units=None, textAsPaths=True):
         self.hideGUI()
+        self.renderPending()
 
         exporter = vtk.vtkPDFExporter()
         exporter.SetRenderWindow(self.contextView.GetRenderWindow())
@@ -1436,6 +1485,7 @@ class VTKVCSBackend(object):
 
     def svg(self, file, width=None, height=None, units=None, textAsPaths=True):
         self.hideGUI()
+        self.renderPending()
 
         exporter = vtk.vtkSVGExporter()
         exporter.SetRenderWindow(self.contextView.GetRenderWindow())
@@ -1497,7 +1547,7 @@ x.geometry(1200,800)
             imgfiltr.SetInputBufferTypeToRGBA()
 
         self.hideGUI()
-        self.renWin.Render()
+        self.render(force=True)
         self.showGUI(render=False)
 
         writer = vtk.vtkPNGWriter()
@@ -1515,6 +1565,26 @@ x.geometry(1200,800)
             self.setsize(self.canvas.width, self.canvas.height)
             self.renWin.Render()
 
+    def rgb(self):
+        """Renders the window and returns (width, height, pixels), pixels
+        being the RGB bytes of the image starting with the bottom row."""
+        if self.renWin is None:
+            raise Exception("Nothing to dump aborting")
+
+        imgfiltr = vtk.vtkWindowToImageFilter()
+        imgfiltr.SetInput(self.renWin)
+        imgfiltr.SetInputBufferTypeToRGB()
+
+        self.hideGUI()
+        self.render(force=True)
+        self.showGUI(render=False)
+
+        imgfiltr.Update()
+        img = imgfiltr.GetOutput()
+        width, height = img.GetDimensions()[:2]
+        pixels = VN.vtk_to_numpy(img.GetPointData().GetScalars())
+        return width, height, pixels.tobytes()
+
     def cgm(self, file):
         if self.renWin is None:
             raise Exception("Nothing to dump aborting")
@@ -1563,14 +1633,10 @@ x.geometry(1200,800)
 
         from .vtk_ui.text import text_box
 
-        text_property = vtk.vtkTextProperty()
         info = self.canvasinfo()
         win_size = info["width"], info["height"]
-        vcs2vtk.prepTextProperty(
-            text_property,
-            win_size,
-            to=textorientation,
-            tt=texttable)
+        values = vcs2vtk.textPropertyValues(win_size, to=textorientation, tt=texttable)
+        text_property = vcs2vtk.textCache.textProperty(values, vcs2vtk.applyTextPropertyValues)
 
         dpi = self.renWin.GetDPI()
 
@@ -1585,12 +1651,12 @@ x.geometry(1200,800)
 
         extents = []
 
+        if angle is None:
+            angle = textorientation.angle
         for s, x, y in labels:
-            if angle is None:
-                coords = text_box(
-                    s, text_property, dpi, -textorientation.angle)
-            else:
-                coords = text_box(s, text_property, dpi, -angle)
+            # measuring is slow and the same labels come back on every plot
+            coords = vcs2vtk.textCache.extent(s, values, dpi, -angle,
+                                              lambda: text_box(s, text_property, dpi, -angle))
             vp = texttable.viewport
             coords[0] = x +\
                 (texttable.worldcoordinate[1] - texttable.worldcoordinate[0]) *\
@@ -1607,6 +1673,14 @@ x.geometry(1200,800)
             extents.append(coords)
         return extents
 
+    def textCacheInfo(self):
+        """Counters of the text properties and extents reused (layoutsAvoided)
+        and of the text actors created or reused on this canvas."""
+        info = vcs2vtk.textCache.info()
+        for k, v in self._textActorPool.info().items():
+            info["actors" + k.capitalize()] = v
+        return info
+
     def getantialiasing(self):
         if self.renWin is None:
             return self.antialiasing
@@ -1735,101 +1809,49 @@ x.geometry(1200,800)
         if "vtk_backend_grid" in vtkobjects:
             # Ok ths is where we update the input data
             vg = vtkobjects["vtk_backend_grid"]
-            vcs2vtk.setArray(vg, array1.filled(0).flat, "scalar",
-                             isCellData=vg.GetCellData().GetScalars(),
-                             isScalars=True)
-
-            if "vtk_backend_filter" in vtkobjects:
-                vtkobjects["vtk_backend_filter"].Update()
+            # the grid may have a lower resolution than the data, the
+            # template uses the data
+            data1, data2 = array1, array2
+            if "vtk_backend_thinning" in vtkobjects:
+                ystride, xstride = vtkobjects["vtk_backend_thinning"]
+                data1 = array1[..., ::ystride, ::xstride]
+                if array2 is not None:
+                    data2 = array2[..., ::ystride, ::xstride]
+            elif "vtk_backend_block_average" in vtkobjects:
+                data1 = vcs.utils.blockAverage2D(array1, *vtkobjects["vtk_backend_block_average"])
+            if "vtk_backend_glyphfilters" in vtkobjects:
+                # Vector plot
+                vcs2vtk.updateVectorArray(vg, data1, data2,
+                                          vtkobjects.get("vtk_backend_geo"))
+            else:
+                vcs2vtk.setArray(vg, data1.filled(0).flat, "scalar",
+                                 isCellData=vg.GetCellData().GetScalars(),
+                                 isScalars=True)
             if "vtk_backend_missing_mapper" in vtkobjects:
                 missingMapper, color, cellData = vtkobjects[
                     "vtk_backend_missing_mapper"]
-                missingMapper2 = vcs2vtk.putMaskOnVTKGrid(
-                    array1,
-                    vg,
-                    color,
-                    cellData,
-                    deep=False)
-            else:
-                missingMapper = None
-            if "vtk_backend_contours" in vtkobjects:
-                for c in vtkobjects["vtk_backend_contours"]:
-                    c.Update()
-                ports = vtkobjects["vtk_backend_contours"]
-            elif "vtk_backend_geofilters" in vtkobjects:
-                ports = vtkobjects["vtk_backend_geofilters"]
-            else:
-                # Vector plot
-                # TODO: this does not work with wrapping
-                ports = vtkobjects["vtk_backend_glyphfilters"]
-                w = vcs2vtk.generateVectorArray(array1, array2, vg)
-                vg.GetPointData().AddArray(w)
-                ports[0].SetInputData(vg)
-
-            if "vtk_backend_actors" in vtkobjects:
-                i = 0
-                for a in vtkobjects["vtk_backend_actors"]:
-                    beItem = a[0]
-                    if a[1] is missingMapper:
-                        i -= 1
-                        mapper = missingMapper2
-                    else:
-                        # Labeled contours are a different kind
-                        if "vtk_backend_luts" in vtkobjects:
-                            lut, rg = vtkobjects["vtk_backend_luts"][i]
-                            mapper = vtk.vtkPolyDataMapper()
-                        elif "vtk_backend_labeled_luts" in vtkobjects:
-                            lut, rg = vtkobjects["vtk_backend_labeled_luts"][i]
-                            mapper = vtk.vtkLabeledContourMapper()
-
-                        algo_i = ports[i]
-                        coloring = None
-                        scalarRange = None
-
-                        if lut is not None:
-                            if mapper.IsA("vtkPolyDataMapper"):
-                                coloring = 'points'
-                            else:
-                                stripper = vtk.vtkStripper()
-                                stripper.SetInputConnection(
-                                    ports[i].GetOutputPort())
-                                mapper.SetInputConnection(
-                                    stripper.GetOutputPort())
-                                algo_i = stripper
-                                coloring = 'points'
-                                scalarRange = rg
-
-                            if rg[2]:
-                                coloring = 'cells'
-
-                            scalarRange = rg
-
-                        algo_i.Update()
-                        new_pd = algo_i.GetOutput()
-
-                        beItem.SetPolyData(new_pd)
-
-                        if coloring:
-                            attrs = new_pd.GetPointData()
-                            beItem.SetScalarMode(
-                                vtk.VTK_SCALAR_MODE_USE_POINT_DATA)
-
-                            if coloring == 'cells':
-                                attrs = new_pd.GetCellData()
-                                beItem.SetScalarMode(
-                                    vtk.VTK_SCALAR_MODE_USE_CELL_DATA)
-
-                            colorByArray = attrs.GetScalars()
-
-                            if scalarRange:
-                                lut.SetRange(scalarRange[0], scalarRange[1])
-
-                            mappedColors = lut.MapScalars(
-                                colorByArray, vtk.VTK_COLOR_MODE_DEFAULT, 0)
-                            beItem.SetMappedColors(mappedColors)
-                            mappedColors.FastDelete()
-
-                    i += 1
+                vcs2vtk.updateMaskOnVTKGrid(data1, vg, missingMapper, cellData)
+            vg.Modified()
+
+            # Re-execute the pipeline downstream of the grid, all the filters
+            # and mappers are reused.
+            if "vtk_backend_filter" in vtkobjects:
+                vtkobjects["vtk_backend_filter"].Update()
+            if "vtk_backend_glyphfilters" in vtkobjects:
+                # glyphs use a (scaled) copy of the filter output
+                output = vtkobjects["vtk_backend_filter"].GetOutput()
+                for glyphFilter in vtkobjects["vtk_backend_glyphfilters"]:
+                    glyphInput = glyphFilter.GetInput()
+                    vectors = output.GetPointData().GetArray("vector")
+                    glyphInput.GetPointData().SetVectors(vectors)
+                    if "vtk_backend_vector_scaling" in vtkobjects:
+                        glyphInput.GetPointData().SetScalars(
+                            vcs2vtk.linearVectorScalars(
+                                vectors, *vtkobjects["vtk_backend_vector_scaling"]))
+                    glyphInput.Modified()
+            for item, source, cellData, color in vtkobjects.get(
+                    "vtk_backend_item_sources", []):
+                vcs2vtk.updatePolyDataItem(item, source, cellData, color)
 
         taxis = array1.getTime()
         if taxis is not None:
@@ -48,8 +48,14 @@ model for defining a plot, that is decomposed into three parts:
 """
 import warnings
 import difflib
-import pkg_resources
-vcs_egg_path = pkg_resources.resource_filename(pkg_resources.Requirement.parse("vcs"), "share/vcs")
+import importlib
+import os
+import sys
+# pkg_resources is slow to import, only use it if vcs is not installed in the prefix
+vcs_egg_path = os.path.join(sys.prefix, "share", "vcs")
+if not os.path.exists(os.path.join(vcs_egg_path, "initial.attributes")):
+    import pkg_resources
+    vcs_egg_path = pkg_resources.resource_filename(pkg_resources.Requirement.parse("vcs"), "share/vcs")
 
 
 class bestMatch(object):
@@ -99,17 +105,36 @@ warnings.filterwarnings('ignore', message="Using a non-tuple sequence for multid
 
 _doValidation = True
 next_canvas_id = 1
-import cdat_info  # noqa
-prefix = cdat_info.get_prefix()
-sample_data = cdat_info.get_sampledata_path()
+# Attributes loaded when first used, the Canvas module (and VTK) is not
+# needed to create or query graphics methods and templates
+_lazy_attributes = {
+    "Canvas": (".Canvas", None),
+    "batchplot": (".batchplot", None),
+    "batch": (".batchplot", "batch"),
+}
+
+
+def __getattr__(name):
+    if name in ["prefix", "sample_data"]:
+        import cdat_info
+        globals()["prefix"] = cdat_info.get_prefix()
+        globals()["sample_data"] = cdat_info.get_sampledata_path()
+        return globals()[name]
+    if name in _lazy_attributes:
+        module, attribute = _lazy_attributes[name]
+        value = importlib.import_module(module, __name__)
+        if attribute is not None:
+            value = getattr(value, attribute)
+        globals()[name] = value
+        return value
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 
 from .utils import *  # noqa
 from . import colors  # noqa
-from . import Canvas  # noqa
 from .vcshelp import *  # noqa
 from .queries import *  # noqa
 from . import install_vcs  # noqa
-import os  # noqa
 from .manageElements import *  # noqa
 import collections  # noqa
 
@@ -377,6 +402,7 @@ def init(mode=1, pause_time=0, call_from_gui=0, size=None, backend="vtk",
     :return: An initialized canvas
     :rtype: vcs.Canvas.Canvas
     """
+    from . import Canvas
     canvas = Canvas.Canvas(
         mode=mode,
         pause_time=pause_time,
@@ -389,3 +415,9 @@ def init(mode=1, pause_time=0, call_from_gui=0, size=None, backend="vtk",
     global canvaslist
     canvaslist.append(canvas)
     return canvas
+
+
+# module __getattr__ (PEP 562) needs python 3.7
+if sys.version_info < (3, 7):
+    for _name in ["prefix", "Canvas", "batch"]:
+        __getattr__(_name)
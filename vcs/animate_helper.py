@@ -630,10 +630,12 @@ class StoppableThread(threading.Thread):
 
 class AnimationCreateParams(vcs.bestMatch):
 
-    def __init__(self, a_min=None, a_max=None, axis=0):
+    def __init__(self, a_min=None, a_max=None, axis=0, workers=1):
         self.a_min = a_min
         self.a_max = a_max
         self.axis = axis
+        # number of processes rendering the frames
+        self.workers = workers
 
 
 class AnimationCreate(StoppableThread):
@@ -787,10 +789,19 @@ class AnimationController(animate_obj_old):
     def created(self):
         return self.animation_created
 
-    def create(self, thread_it=True, min=None, max=None):
+    def create(self, thread_it=True, min=None, max=None, workers=None):
+        """Creates the animation frames.
+
+        workers is the number of processes used to render the frames
+        (default: create_params.workers), 1 renders them on demand.
+        """
         self.generate_number_of_frames()
         if thread_it == 0:
             thread_it = False
+        if workers is not None:
+            if workers < 1:
+                raise ValueError("workers must be at least 1")
+            self.create_params.workers = int(workers)
         if self.create_thread is None or not self.create_thread.is_alive():
             self.canvas_info = self.vcs_self.canvasinfo()
             self.animate_info = self.vcs_self.animate_info
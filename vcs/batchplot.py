@@ -0,0 +1,425 @@
+import collections
+import json
+import multiprocessing
+import os
+import time
+
+import cdms2
+import numpy
+import vcs
+
+
+BatchResult = collections.namedtuple("BatchResult", ["index", "output", "seconds", "error"])
+BatchResult.__doc__ = """Result of a :py:func:`vcs.batch` job.
+
+index is the position of the job, output the file written, seconds the
+time spent plotting and saving it and error the exception raised by the
+job (None on success).
+"""
+
+_outputMethods = {
+    ".png": "png",
+    ".svg": "svg",
+    ".pdf": "pdf",
+    ".ps": "postscript",
+}
+
+# the element types that can be associated to a graphics method or template
+_associatedTypes = ["projection", "colormap", "line", "texttable", "textorientation"]
+
+# cdms2 files opened by FileVariable in this process
+_openFiles = {}
+
+
+class FileVariable(object):
+    """A variable that a :py:func:`vcs.batch` job reads from a file.
+
+    With several workers, the worker process reads the data itself
+    (cdms2 files are opened once per worker) instead of receiving it from
+    the main process. This is needed for variables on curvilinear or
+    generic grids.
+
+    :Example:
+
+        .. doctest:: batchplot_FileVariable
+
+            >>> clt = vcs.batchplot.FileVariable(vcs.sample_data + "/clt.nc", "clt", time=slice(0, 1))
+            >>> clt.read().shape
+            (1, 46, 72)
+
+    :param path: Path of the file
+    :type path: str
+
+    :param name: Name of the variable in the file
+    :type name: str
+
+    :param selectors: cdms2 selectors (time=slice(0, 1), latitude=(-30, 30), ...)
+    """
+
+    def __init__(self, path, name, **selectors):
+        self.path = path
+        self.name = name
+        self.selectors = selectors
+
+    def read(self):
+        """Reads the variable.
+
+        :returns: The selected data
+        :rtype: cdms2.tvariable.TransientVariable
+        """
+        f = _openFiles.get(self.path)
+        if f is None:
+            f = _openFiles[self.path] = cdms2.open(self.path)
+        return f(self.name, **self.selectors)
+
+
+class _PackedVariable(object):
+    """The data, axes and attributes of a rectilinear cdms2 variable sent
+    to a worker process."""
+
+    def __init__(self, variable):
+        grid = variable.getGrid()
+        if grid is not None and not isinstance(grid, cdms2.grid.AbstractRectGrid):
+            raise ValueError("variable %s is not on a rectilinear grid, use a vcs.batchplot.FileVariable" %
+                             variable.id)
+        self.id = variable.id
+        self.data = numpy.ma.asarray(variable)
+        self.attributes = dict(variable.attributes)
+        self.axes = []
+        for axis in variable.getAxisList():
+            self.axes.append((axis.id, numpy.asarray(axis[:]), axis.getBounds(), dict(axis.attributes),
+                              axis.isLatitude(), axis.isLongitude()))
+
+    def read(self):
+        axes = []
+        for id, values, bounds, attributes, isLatitude, isLongitude in self.axes:
+            axis = cdms2.createAxis(values, bounds=bounds, id=id)
+            for name, value in attributes.items():
+                setattr(axis, name, value)
+            if isLatitude:
+                axis.designateLatitude()
+            elif isLongitude:
+                axis.designateLongitude()
+            axes.append(axis)
+        return cdms2.createVariable(self.data, axes=axes, attributes=self.attributes, id=self.id)
+
+
+def _elementJSON(element):
+    dic = vcs.utils.dumpToDict(element, skipped=["info", "member", "attributes"])[0]
+    for key in ["g_name", "s_name", "p_name", "name"]:
+        dic.pop(key, None)
+    return json.dumps(dic)
+
+
+def _packElement(element, elementType):
+    """Returns the (type, name, JSON) of element and of the elements it uses
+    that are not protected, the worker loads them before plotting."""
+    packed = []
+    associated = vcs.utils.dumpToDict(element, skipped=["info", "member", "attributes"])[1]
+    for etype in _associatedTypes:
+        for name in associated.get(etype, ()):
+            if name is not None and name in vcs.elements[etype] and \
+                    name not in vcs._protected_elements[etype]:
+                packed.append((etype, name, _elementJSON(vcs.elements[etype][name])))
+    if element.name not in vcs._protected_elements.get(elementType, ()):
+        packed.append((elementType, element.name, _elementJSON(element)))
+    return packed, element.name
+
+
+def _packJob(job):
+    """Returns the arguments of a job for a worker process: the elements to
+    load and the canvas.plot arguments, with the variables packed."""
+    elements = []
+    arguments = []
+    for argument in job:
+        if cdms2.isVariable(argument):
+            argument = _PackedVariable(argument)
+        elif vcs.istemplate(argument):
+            packed, argument = _packElement(argument, "template")
+            elements.extend(packed)
+        elif vcs.isgraphicsmethod(argument):
+            gtype = vcs.graphicsmethodtype(argument)
+            packed, name = _packElement(argument, gtype)
+            elements.extend(packed)
+            argument = (gtype, name)
+        arguments.append(argument)
+    return elements, arguments
+
+
+def _unpackJob(elements, arguments):
+    for etype, name, dic in elements:
+        if etype == "template":
+            vcs.utils.loadTemplate(str(name), json.loads(dic))
+        else:
+            vcs.utils.loadVCSItem(etype, str(name), json.loads(dic))
+    job = []
+    for argument in arguments:
+        if isinstance(argument, (_PackedVariable, FileVariable)):
+            argument = argument.read()
+        elif isinstance(argument, tuple):
+            argument = vcs.getgraphicsmethod(*argument)
+        job.append(argument)
+    return job
+
+
+def _removeElements(elements):
+    """Removes the elements a worker loaded for a job and did not have
+    before, the last loaded first as it may use the others."""
+    for etype, name in reversed(elements):
+        if name in vcs.elements[etype]:
+            vcs.removeobject(vcs.elements[etype][name])
+
+
+def _plotJob(canvas, job, output, plot_keyargs):
+    try:
+        with canvas.deferred_render():
+            canvas.plot(*job, **plot_keyargs)
+        method = _outputMethods.get(os.path.splitext(output)[1].lower(), "png")
+        getattr(canvas, method)(output)
+    finally:
+        canvas.clear()
+
+
+def _worker(connection, geometry, plot_keyargs):
+    """Main function of the worker processes: plots the jobs received on
+    connection with a background canvas created once."""
+    canvas = vcs.init(bg=True, geometry=geometry)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        index, elements, arguments, output = message
+        start = time.time()
+        error = None
+        loaded = [(etype, name) for etype, name, dic in elements if name not in vcs.elements[etype]]
+        try:
+            _plotJob(canvas, _unpackJob(elements, arguments), output, plot_keyargs)
+        except Exception as err:
+            error = err
+        finally:
+            _removeElements(loaded)
+        result = (index, time.time() - start, error)
+        try:
+            connection.send(result)
+        except Exception:
+            # the exception can not be pickled
+            connection.send((index, result[1], RuntimeError(repr(error))))
+    canvas.close()
+    connection.close()
+
+
+class _WorkerProcess(object):
+
+    def __init__(self, context, geometry, plot_keyargs):
+        self.connection, workerConnection = context.Pipe()
+        self.process = context.Process(target=_worker, args=(workerConnection, geometry, plot_keyargs))
+        self.process.daemon = True
+        self.process.start()
+        workerConnection.close()
+        self.job = None
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except Exception:
+            pass
+        self.process.join(5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+
+class Batch(object):
+    """Iterable running the jobs of :py:func:`vcs.batch`.
+
+    Iterating yields a :py:class:`BatchResult` per job. count, elapsed
+    and throughput describe the jobs done so far.
+    """
+
+    def __init__(self, jobs, canvas=None, geometry=None, stop_on_error=True, workers=1, retries=1,
+                 **plot_keyargs):
+        if workers < 1:
+            raise ValueError("workers must be at least 1, got %s" % workers)
+        if workers > 1 and canvas is not None:
+            raise ValueError("a canvas can not be shared by several workers")
+        self.jobs = jobs
+        self.canvas = canvas
+        self.geometry = geometry
+        self.stop_on_error = stop_on_error
+        self.workers = workers
+        self.retries = retries
+        self.plot_keyargs = plot_keyargs
+        self.plot_keyargs["bg"] = True
+        self.count = 0
+        self.elapsed = 0.
+
+    @property
+    def throughput(self):
+        """Jobs done per second of wall time."""
+        if self.elapsed == 0.:
+            return 0.
+        return self.count / self.elapsed
+
+    def __iter__(self):
+        start = time.time()
+        results = self._serial() if self.workers == 1 else self._parallel()
+        for result in results:
+            self.count += 1
+            self.elapsed = time.time() - start
+            if result.error is not None and self.stop_on_error:
+                raise result.error
+            yield result
+
+    def _serial(self):
+        canvas = self.canvas
+        if canvas is None:
+            canvas = vcs.init(bg=True, geometry=self.geometry)
+        try:
+            for index, job in enumerate(self.jobs):
+                job = list(job)
+                output = job.pop()
+                start = time.time()
+                error = None
+                try:
+                    _plotJob(canvas, job, output, self.plot_keyargs)
+                except Exception as err:
+                    error = err
+                yield BatchResult(index, output, time.time() - start, error)
+        finally:
+            if self.canvas is None:
+                canvas.close()
+
+    def _packedJobs(self):
+        """Yields the message sent to a worker for each job, or the
+        BatchResult of the jobs that can not be packed."""
+        for index, job in enumerate(self.jobs):
+            job = list(job)
+            output = job.pop()
+            try:
+                elements, arguments = _packJob(job)
+            except Exception as err:
+                yield BatchResult(index, output, 0., err)
+            else:
+                yield (index, elements, arguments, output)
+
+    def _parallel(self):
+        try:
+            context = multiprocessing.get_context("fork")
+        except (AttributeError, ValueError):
+            # python 2 forks, no fork on windows
+            context = multiprocessing
+        workers = [_WorkerProcess(context, self.geometry, self.plot_keyargs) for i in range(self.workers)]
+        jobs = self._packedJobs()
+        retry = []
+        moreJobs = True
+        try:
+            while True:
+                for worker in workers:
+                    if worker.job is not None:
+                        continue
+                    if retry:
+                        worker.job = retry.pop(0)
+                    elif moreJobs:
+                        try:
+                            message = next(jobs)
+                        except StopIteration:
+                            moreJobs = False
+                            break
+                        if isinstance(message, BatchResult):
+                            # the job can not be sent to a worker
+                            yield message
+                            continue
+                        worker.job = [message, 0]
+                    else:
+                        break
+                    worker.connection.send(worker.job[0])
+                running = [worker for worker in workers if worker.job is not None]
+                if not running and not moreJobs:
+                    break
+                for i, worker in enumerate(workers):
+                    if worker.job is None:
+                        continue
+                    message, attempts = worker.job
+                    try:
+                        if not worker.connection.poll(0.01):
+                            if worker.process.is_alive():
+                                continue
+                            raise EOFError()
+                        index, seconds, error = worker.connection.recv()
+                        worker.job = None
+                        yield BatchResult(index, message[3], seconds, error)
+                    except (EOFError, IOError, OSError):
+                        # the worker died: start a new one and retry the job
+                        worker.stop()
+                        workers[i] = _WorkerProcess(context, self.geometry, self.plot_keyargs)
+                        if attempts < self.retries:
+                            retry.append([message, attempts + 1])
+                        else:
+                            yield BatchResult(message[0], message[3], 0.,
+                                              RuntimeError("worker crashed plotting %s" % message[3]))
+        finally:
+            for worker in workers:
+                worker.stop()
+
+
+def batch(jobs, canvas=None, geometry=None, stop_on_error=True, workers=1, retries=1, **plot_keyargs):
+    """Plots many jobs to image files with a background canvas per process.
+
+    Each job is a tuple (variable, template, graphics method, output) or,
+    for vector and streamline plots, (u, v, template, graphics method,
+    output). The output format is chosen from the file extension: png,
+    svg, pdf or ps (png if there is no extension).
+    The canvas, its renderers and the cached geometry (continents, ...)
+    are kept from one job to the next; results are yielded as soon as each
+    file is written so that jobs can be generated lazily.
+
+    With several workers, the jobs are plotted by as many processes, each
+    with its own canvas, and the results come in the order the jobs end.
+    Templates and graphics methods are sent to the workers as dictionaries
+    (see :py:func:`vcs.utils.dumpToDict`), rectilinear variables with
+    their axes; a :py:class:`vcs.batchplot.FileVariable` is read by the
+    worker. A job whose worker crashes is retried by a new worker.
+
+    :Example:
+
+        .. doctest:: vcs_batch
+
+            >>> import cdms2
+            >>> f = cdms2.open(vcs.sample_data + "/clt.nc")
+            >>> jobs = (([f("clt", time=slice(i, i + 1)), "default", vcs.getboxfill(),
+            ...           "clt_%d.png" % i]) for i in range(3))
+            >>> for result in vcs.batch(jobs):
+            ...     print(result.output)
+            clt_0.png
+            clt_1.png
+            clt_2.png
+
+    :param jobs: The plots to make
+    :type jobs: iterable of tuples
+
+    :param canvas: The canvas to plot with, by default a background canvas
+        is created and closed once all the jobs are done. Only for one worker.
+    :type canvas: vcs.Canvas.Canvas
+
+    :param geometry: Size of the created canvases, see :py:func:`vcs.init`
+    :type geometry: dict or tuple
+
+    :param stop_on_error: Raise the exception of a failed job, otherwise it
+        is returned in the result and the next job is plotted
+    :type stop_on_error: bool
+
+    :param workers: Number of processes plotting the jobs
+    :type workers: int
+
+    :param retries: Number of times a job is retried when its worker crashes
+    :type retries: int
+
+    :param plot_keyargs: Keywords passed to :py:func:`vcs.Canvas.Canvas.plot`
+        for every job
+
+    :returns: An iterable of :py:class:`vcs.batchplot.BatchResult` also
+        reporting the throughput
+    :rtype: vcs.batchplot.Batch
+    """
+    return Batch(jobs, canvas=canvas, geometry=geometry, stop_on_error=stop_on_error, workers=workers,
+                 retries=retries, **plot_keyargs)
@@ -25,6 +25,7 @@
 #
 from . import VCS_validation_functions
 import vcs
+import numpy
 import tempfile
 from .xmldocs import listdoc  # noqa
 from functools import partial
@@ -544,6 +545,58 @@ class Dp(vcs.bestMatch):
     #                                                                        #
     ##########################################################################
 
+    def set_data(self, array1, array2=None, render=True):
+        """Replaces the data plotted by this display, reusing its VTK
+        pipeline instead of clearing and plotting again.
+
+        Supported for boxfill, isofill, isoline, meshfill and vector plots.
+        The new data must be on the same grid as the plotted data, levels,
+        colors and vector scaling are kept.
+
+        :Example:
+
+            .. doctest:: displayplot_set_data
+
+                >>> a=vcs.init(bg=True)
+                >>> import cdms2 # We need cdms2 to create a slab
+                >>> f = cdms2.open(vcs.sample_data+'/clt.nc') # use cdms2 to open a data file
+                >>> dsp = a.plot(f('clt', slice(0, 1)))
+                >>> dsp.set_data(f('clt', slice(1, 2))) # draws the second time step
+
+        :param array1: The new data
+        :type array1: cdms2.tvariable.TransientVariable
+
+        :param array2: The new second array (v component for vector plots)
+        :type array2: cdms2.tvariable.TransientVariable
+
+        :param render: Render the canvas once the data is updated
+        :type render: bool
+        """
+        if self.g_type not in ["boxfill", "isofill", "isoline", "meshfill", "vector"]:
+            raise ValueError("set_data is not supported for %s plots" % self.g_type)
+        if self._parent is None or not self.backend or self.array[0] is None:
+            raise ValueError("display %s is not plotted on a canvas" % self.name)
+        gm = vcs.getgraphicsmethod(self.g_type, self.g_name)
+        n = vcs.graphicsmethodinfo(gm)["dimensions_used_on_plot"]
+        for new, old in ((array1, self.array[0]), (array2, self.array[1])):
+            if new is None or old is None:
+                continue
+            if numpy.ma.size(new) != numpy.prod(old.shape[-n:]):
+                raise ValueError("new data must have the shape %s of the plotted data, got %s" %
+                                 (old.shape[-n:], new.shape))
+        if self.g_type == "vector":
+            if array2 is None:
+                raise ValueError("vector plots need two arrays")
+        else:
+            array2 = self.array[1]
+        plotted = array1
+        if self.g_type == "boxfill" and gm.boxfill_type == "log10":
+            # same transformation as the boxfill pipeline
+            plotted = array1.clone()
+            plotted[:] = numpy.ma.log10(array1[:])
+        self._parent.backend.update_input(self.backend, plotted, array2, update=render)
+        self.array = [array1, array2]
+
     def list(self):
         """Lists the current values of object attributes
 
@@ -9,10 +9,11 @@ import vcs
 import time
 import warnings
 try:
-    from DV3D.ConfigurationFunctions import ConfigManager
-    HAS_DV3D = True
-except Exception:
-    HAS_DV3D = False
+    from importlib.util import find_spec
+except ImportError:
+    from pkgutil import find_loader as find_spec
+# DV3D imports VTK, its configuration is only loaded once a graphics method is used
+HAS_DV3D = find_spec("DV3D") is not None
 
 from .xmldocs import toggle_surface, toggle_volume, xslider, yslider, zslider, verticalscaling, scalecolormap  # noqa
 from .xmldocs import scaletransferfunction, toggleclipping, isosurfacevalue, scaleopacity, basemapopacity, camera, scriptdocs  # noqa
@@ -149,32 +150,74 @@ class Gfdv3d(object):
 
         # Use parent config values if possible
         if isinstance(Gfdv3d_name_src, str):
-            # Make sure we aren't inheriting from ourself
-            if Gfdv3d_name_src != Gfdv3d_name:
-                parent_cfg = vcs.elements[self.g_name][Gfdv3d_name_src].cfgManager
-                self._axes = vcs.elements[self.g_name][Gfdv3d_name_src]._axes
-            else:
-                parent_cfg = None
+            Gfdv3d_name_src = vcs.elements[self.g_name][Gfdv3d_name_src]
+        # Make sure we aren't inheriting from ourself
+        if Gfdv3d_name_src.name != self.name:
+            self._source = Gfdv3d_name_src
+            self._axes = Gfdv3d_name_src._axes
         else:
-            # Make sure we aren't inheriting from ourself
-            if Gfdv3d_name_src.name != self.name:
-                parent_cfg = Gfdv3d_name_src.cfgManager
-                self._axes = Gfdv3d_name_src._axes
-            else:
-                parent_cfg = None
-
-        self.cfgManager = ConfigManager(cm=parent_cfg)
+            self._source = None
 
         if Gfdv3d_name == "Hovmoller3D":
             self._axes = "xyt"
 
         self.ncores = multiprocessing.cpu_count()
 
-        self.addParameters()
-
         self.plot_attributes['name'] = self.g_name
         self.plot_attributes['template'] = Gfdv3d_name
 
+        self._cfgManager = None
+        self._copies = []
+        # parameters set before the configuration is loaded
+        self._pending = {}
+        if self._source is not None:
+            if self._source._cfgManager is not None:
+                self._configure()
+            else:
+                # configured from the source's initial configuration, plus
+                # the parameters set on the source so far
+                self._pending.update(self._source._pending)
+                self._source._copies.append(self)
+
+    def _configure(self):
+        """Loads the DV3D configuration and parameters on first use."""
+        if self._cfgManager is not None:
+            return
+        from DV3D.ConfigurationFunctions import ConfigManager
+        parent_cfg = None if self._source is None else self._source.cfgManager
+        # configuring the source may have configured this copy
+        if self._cfgManager is not None:
+            return
+        pending, self._pending = self._pending, None
+        self._cfgManager = ConfigManager(cm=parent_cfg)
+        self._source = None
+        self.addParameters()
+        copies, self._copies = self._copies, []
+        for copy in copies:
+            copy._configure()
+        for name, value in pending.items():
+            setattr(self, name, value)
+
+    def _getcfgManager(self):
+        self._configure()
+        return self._cfgManager
+    cfgManager = property(_getcfgManager)
+
+    def __getattr__(self, name):
+        # DV3D parameters are only defined once the configuration is loaded
+        if name.startswith("_") or self.__dict__.get("_pending") is None:
+            raise AttributeError(name)
+        self._configure()
+        return getattr(self, name)
+
+    def __setattr__(self, name, value):
+        pending = self.__dict__.get("_pending")
+        if (pending is not None and not name.startswith("_") and
+                name not in self.__dict__ and not hasattr(type(self), name)):
+            pending[name] = value
+        else:
+            object.__setattr__(self, name, value)
+
     def setProvenanceHandler(self, provenanceHandler):
         self.provenanceHandler = provenanceHandler
 
@@ -213,6 +256,7 @@ class Gfdv3d(object):
 
     @staticmethod
     def getParameterList():
+        from DV3D.ConfigurationFunctions import ConfigManager
         from DV3D.DV3DPlot import PlotButtonNames
         cfgManager = ConfigManager()
         parameterList = cfgManager.getParameterList(extras=PlotButtonNames)
@@ -0,0 +1,103 @@
+import subprocess
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class FFMPEGStream(object):
+    """Encodes frames into a movie by piping raw RGB images to ffmpeg.
+
+    Unlike :py:func:`vcs.Canvas.Canvas.ffmpeg` no image file is written:
+    each frame is sent to the standard input of ffmpeg by a writer thread.
+    At most queue_size frames wait for ffmpeg, add_frame blocks when the
+    queue is full so memory use does not depend on the movie length.
+
+    See :py:func:`vcs.Canvas.Canvas.ffmpeg_stream`.
+    """
+
+    def __init__(self, movie, canvas=None, rate=None, options=None, queue_size=2):
+        self.movie = movie
+        self.canvas = canvas
+        self.rate = rate
+        self.options = options
+        self.size = None
+        self.frames = 0
+        self._process = None
+        self._thread = None
+        self._error = None
+        self._queue = queue.Queue(maxsize=queue_size)
+
+    def _start(self, width, height):
+        args = ["ffmpeg", "-y", "-f", "rawvideo", "-pix_fmt", "rgb24",
+                "-s", "%dx%d" % (width, height)]
+        if self.rate is not None:
+            args.extend(("-framerate", str(self.rate)))
+        args.extend(("-i", "-", "-pix_fmt", "yuv420p"))
+        # vtk images start with the bottom row, H264 requires even sizes
+        args.extend(("-vf", "vflip,scale=%d:%d" % (width + width % 2, height + height % 2)))
+        if self.options is not None:
+            args.append(self.options)
+        args.append(self.movie)
+        self._process = subprocess.Popen(args, stdin=subprocess.PIPE)
+        self._thread = threading.Thread(target=self._write)
+        self._thread.daemon = True
+        self._thread.start()
+        self.size = (width, height)
+
+    def _write(self):
+        while True:
+            frame = self._queue.get()
+            if frame is None:
+                break
+            if self._error is not None:
+                # ffmpeg is gone, drain the queue so add_frame does not block
+                continue
+            try:
+                self._process.stdin.write(frame)
+            except Exception as err:
+                self._error = err
+
+    def add_frame(self, width=None, height=None, pixels=None):
+        """Adds a frame to the movie.
+
+        pixels is a bytes-like RGB image of width x height starting with the
+        bottom row, by default the current content of the canvas.
+        """
+        if pixels is None:
+            width, height, pixels = self.canvas.backend.rgb()
+        if self._error is not None:
+            raise RuntimeError("ffmpeg stopped reading frames: %s" % self._error)
+        if self.size is None:
+            self._start(width, height)
+        elif self.size != (width, height):
+            raise ValueError("frame size %dx%d differs from the movie size %dx%d" %
+                             ((width, height) + self.size))
+        self._queue.put(pixels)
+        self.frames += 1
+
+    def close(self):
+        """Waits for ffmpeg to encode all the frames.
+
+        :returns: A object that Jupyter notebook can display
+        :rtype: vcs.Canvas.JupyterFFMPEG
+        """
+        from .Canvas import JupyterFFMPEG
+        result = None
+        if self._process is not None:
+            self._queue.put(None)
+            self._thread.join()
+            try:
+                self._process.stdin.close()
+            except Exception:
+                pass
+            result = self._process.wait()
+            self._process = None
+        return JupyterFFMPEG(self.movie, result)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
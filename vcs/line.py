@@ -26,6 +26,7 @@ from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
 import genutil
+import numpy
 from .xmldocs import scriptdocs, listdoc
 
 
@@ -145,6 +146,7 @@ class Tl(vcs.bestMatch):
 
                 >>> ln.x=[[0,.1,.2], [.3,.4,.5]] # List of floats
                 >>> ln.y=[[.5,.4,.3], [.2,.1,0]] # List of floats
+                >>> ln.x=numpy.linspace(0, 1, 100000) # 1D or 2D numpy array
 
     .. ln.x and ln.y above cause ln to be unplottable. Need a better example.
     .. Use doctests in this class as a model for converting other class docstrings to use doctests.
@@ -264,6 +266,12 @@ class Tl(vcs.bestMatch):
         if value is None:
             self._x = None
             return
+        if isinstance(value, numpy.ndarray):
+            self._x = VCS_validation_functions.checkArrayOfCoordinates(
+                self,
+                'x',
+                value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError('%s must be a tuple or list of values.')
         try:
@@ -290,6 +298,12 @@ class Tl(vcs.bestMatch):
         if value is None:
             self._y = None
             return
+        if isinstance(value, numpy.ndarray):
+            self._y = VCS_validation_functions.checkArrayOfCoordinates(
+                self,
+                'y',
+                value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError('%s must be a tuple or list of values.')
         try:
@@ -25,6 +25,7 @@ from __future__ import print_function
 from . import VCS_validation_functions
 import vcs
 import genutil
+import numpy
 from .xmldocs import scriptdocs, listdoc
 
 
@@ -216,6 +217,8 @@ class Tm(vcs.bestMatch):
                 mk.x=[[0,.1,.2], [.3,.4,.5]]
                 # List of FloatTypes
                 mk.y=[[.5,.4,.3], [.2,.1,0]]
+                # 2D numpy array, one row per marker group
+                mk.x=numpy.random.random((2, 100000))
 
         .. pragma: skip-doctest
         """
@@ -344,6 +347,12 @@ class Tm(vcs.bestMatch):
         if value is None:
             self._x = None
             return
+        if isinstance(value, numpy.ndarray):
+            self._x = VCS_validation_functions.checkArrayOfCoordinates(
+                self,
+                'x',
+                value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError(
                 'x must be a tuple or list of values. You sent: %s' %
@@ -372,6 +381,12 @@ class Tm(vcs.bestMatch):
         if value is None:
             self._y = None
             return
+        if isinstance(value, numpy.ndarray):
+            self._y = VCS_validation_functions.checkArrayOfCoordinates(
+                self,
+                'y',
+                value)
+            return
         if not isinstance(value, (list, tuple)):
             raise ValueError(
                 'y must be a tuple or list of values. You sent: %s' %
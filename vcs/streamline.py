@@ -205,6 +205,7 @@ class Gs(vcs.bestMatch):
         '_filledglyph',
         '_coloredbyvector',
         '_numberofglyphs',
+        '_thinning',
     ]
 
     colormap = VCS_validation_functions.colormap
@@ -702,6 +703,21 @@ class Gs(vcs.bestMatch):
         self._numberofglyphs = value
     numberofglyphs = property(_getnumberofglyphs, _setnumberofglyphs)
 
+    """
+    Screen space thinning of the data: None (default) draws all the grid
+    points, a number N of pixels keeps at most one grid point every N pixels
+    of the plot area in each direction. The strides are computed from the
+    template data area and the canvas size when plotting.
+    """
+    def _getthinning(self):
+        return self._thinning
+
+    def _setthinning(self, value):
+        if value is not None:
+            value = VCS_validation_functions.checkNumber(self, 'thinning', value, minvalue=1)
+        self._thinning = value
+    thinning = property(_getthinning, _setthinning)
+
     def _getlinewidth(self):
         return self._linewidth
 
@@ -808,6 +824,7 @@ class Gs(vcs.bestMatch):
             self._filledglyph = True
             self._coloredbyvector = True
             self._numberofglyphs = 1
+            self._thinning = None
         else:
             if isinstance(Gs_name_src, Gs):
                 Gs_name_src = Gs_name_src.name
@@ -832,7 +849,7 @@ class Gs(vcs.bestMatch):
                  'maximumsteplength', 'maximumsteps', 'maximumstreamlinelength',
                  'terminalspeed', 'maximumerror', 'glyphscalefactor',
                  'glyphbasefactor', 'filledglyph', 'coloredbyvector',
-                 'numberofglyphs', 'reference']:
+                 'numberofglyphs', 'reference', 'thinning']:
 
                 setattr(self, att, getattr(src, att))
         # Ok now we need to stick in the elements
@@ -939,6 +956,7 @@ class Gs(vcs.bestMatch):
         print("filledglyph = ", self.filledglyph)
         print("coloredbyvector = ", self.coloredbyvector)
         print("numberofglyphs = ", self.numberofglyphs)
+        print("thinning = ", self.thinning)
 
     ##########################################################################
     #                                                                         #
@@ -1092,6 +1110,7 @@ class Gs(vcs.bestMatch):
             fp.write("%s.filledglyph = %r\n" % (unique_name, self.filledglyph))
             fp.write("%s.coloredbyvector = %r\n" % (unique_name, self.coloredbyvector))
             fp.write("%s.numberofglyphs = %d\n" % (unique_name, self.numberofglyphs))
+            fp.write("%s.thinning = %s\n" % (unique_name, self.thinning))
         else:
             # Json type
             mode += "+"
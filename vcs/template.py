@@ -34,6 +34,7 @@
 #
 #
 from __future__ import print_function
+import collections
 import copy
 import vcs
 import numpy
@@ -181,6 +182,71 @@ def process_src(nm, code):
     t.orientation = int(code[i + 12])
 
 
+class _TemplatePrimitives(object):
+    """Collects the tick marks, tick labels, boxes and lines of a template
+    drawn in a linear projection. Primitives sharing the same attributes
+    are then plotted with a single temporary line or text element instead
+    of one per tick set, label group or box."""
+
+    def __init__(self):
+        self.lines = collections.OrderedDict()
+        self.texts = collections.OrderedDict()
+
+    def addLine(self, source, projection, priority, xs, ys):
+        if priority == 0 or len(xs) == 0:
+            return
+        line = vcs.elements["line"][source]
+        key = (line.colormap, tuple(line.viewport), tuple(line.worldcoordinate), projection, priority)
+        if key not in self.lines:
+            self.lines[key] = (source, [], [], [], [], [])
+        source, X, Y, colors, widths, types = self.lines[key]
+        X.extend(xs)
+        Y.extend(ys)
+        for i in range(len(xs)):
+            colors.append(line.color[min(i, len(line.color) - 1)])
+            widths.append(line.width[min(i, len(line.width) - 1)])
+            types.append(line.type[min(i, len(line.type) - 1)])
+
+    def addText(self, texttable, textorientation, projection, priority, strings, xs, ys):
+        if priority == 0 or len(xs) == 0:
+            return
+        key = (texttable, textorientation, projection, priority)
+        if key not in self.texts:
+            self.texts[key] = ([], [], [])
+        S, X, Y = self.texts[key]
+        S.extend(strings)
+        X.extend(xs)
+        Y.extend(ys)
+
+    def plot(self, x, bg=False, **kargs):
+        displays = []
+        for (texttable, textorientation, projection, priority), (S, X, Y) in self.texts.items():
+            tt = x.createtext(Tt_source=texttable, To_source=textorientation)
+            tt.projection = projection
+            tt.priority = priority
+            tt.string = S
+            tt.x = X
+            tt.y = Y
+            displays.append(x.text(tt, bg=bg, ratio="none", **kargs))
+            sp = tt.name.split(":::")
+            del(vcs.elements["texttable"][sp[0]])
+            del(vcs.elements["textorientation"][sp[1]])
+            del(vcs.elements["textcombined"][tt.name])
+        for key, (source, X, Y, colors, widths, types) in self.lines.items():
+            ln = x.createline(source=source)
+            ln.projection = key[3]
+            ln.priority = key[4]
+            # assigning directly, these come from existing lines
+            ln._x = X
+            ln._y = Y
+            ln._color = colors
+            ln._width = widths
+            ln._type = types
+            displays.append(x.plot(ln, bg=bg, ratio="none", **kargs))
+            del(vcs.elements["line"][ln.name])
+        return displays
+
+
 #############################################################################
 #                                                                           #
 # Template (P) graphics method Class.                                       #
@@ -1053,11 +1119,13 @@ class P(vcs.bestMatch):
     # Adding the drawing functionnality to plot all these attributes on the
     # Canvas
     def drawTicks(self, slab, gm, x, axis, number,
-                  vp, wc, bg=False, X=None, Y=None, mintic=False, **kargs):
+                  vp, wc, bg=False, X=None, Y=None, mintic=False, primitives=None, **kargs):
         """Draws the ticks for the axis x number number
         using the label passed by the graphic  method
         vp and wc are from the actual canvas, they have
         been reset when they get here...
+        In a linear projection, ticks and labels are added to primitives
+        (a _TemplatePrimitives) if it is passed instead of being plotted.
 
         .. pragma: skip-doctest TODO add example/doctest
         """
@@ -1113,19 +1181,23 @@ class P(vcs.bestMatch):
             obj = getattr(self, axis + 'tic' + number)
         else:
             obj = getattr(self, axis + 'mintic' + number)
-        # the following to make sure we have a unique name,
-        # i put them together assuming it would be faster
-        ticks = x.createline(source=obj.line)
-        ticks.projection = gm.projection
-        ticks.priority = obj.priority
         if mintic is False:
             # the labels
             objlabl = getattr(self, axis + 'label' + number)
-            tt = x.createtext(
-                Tt_source=objlabl.texttable,
-                To_source=objlabl.textorientation)
-            tt.projection = gm.projection
-            tt.priority = objlabl.priority
+        if vcs.elements["projection"][gm.projection].type != "linear":
+            primitives = None
+        if primitives is None:
+            # the following to make sure we have a unique name,
+            # i put them together assuming it would be faster
+            ticks = x.createline(source=obj.line)
+            ticks.projection = gm.projection
+            ticks.priority = obj.priority
+            if mintic is False:
+                tt = x.createtext(
+                    Tt_source=objlabl.texttable,
+                    To_source=objlabl.textorientation)
+                tt.projection = gm.projection
+                tt.priority = objlabl.priority
         if vcs.elements["projection"][gm.projection].type != "linear":
             ticks.viewport = vp
             ticks.worldcoordinate = wc
@@ -1234,6 +1306,12 @@ class P(vcs.bestMatch):
                             txs.append(wc[0])
                     if mintic is False:
                         tstring.append(loc[l_tmp])
+        if primitives is not None:
+            if mintic is False:
+                primitives.addText(objlabl.texttable, objlabl.textorientation, gm.projection,
+                                   objlabl.priority, tstring, txs, tys)
+            primitives.addLine(obj.line, gm.projection, obj.priority, xs, ys)
+            return displays
         if mintic is False and txs != []:
             tt.string = tstring
             tt.x = txs
@@ -1801,6 +1879,7 @@ class P(vcs.bestMatch):
         vp2 = kargs.get("ratio_autot_viewport", vp2)
 
         # Do the tickmarks/labels
+        primitives = _TemplatePrimitives()
         if not isinstance(gm, vcs.taylor.Gtd):
             for axis in ["x", "y"]:
                 for number in ["1", "2"]:
@@ -1816,6 +1895,7 @@ class P(vcs.bestMatch):
                                                    X=X,
                                                    Y=Y,
                                                    mintic=mintic,
+                                                   primitives=primitives,
                                                    **kargs)
 
         if X is None:
@@ -1831,6 +1911,15 @@ class P(vcs.bestMatch):
             for num in ["1", "2"]:
                 e = getattr(self, tp + num)
                 if e.priority != 0:
+                    if hasattr(gm, "projection"):
+                        projection = gm.projection
+                    else:
+                        projection = vcs.elements["line"][e.line].projection
+                    if vcs.elements["projection"][projection].type == "linear":
+                        primitives.addLine(e.line, projection, e._priority,
+                                           [[e._x1, e._x2, e._x2, e._x1, e._x1]],
+                                           [[e._y1, e._y1, e._y2, e._y2, e._y1]])
+                        continue
                     ln_tmp = x.createline(source=e.line)
                     if hasattr(gm, "projection"):
                         ln_tmp.projection = gm.projection
@@ -1867,6 +1956,7 @@ class P(vcs.bestMatch):
                     ln_tmp._priority = e._priority
                     displays.append(x.plot(ln_tmp, bg=bg, ratio="none", **kargs))
                     del(vcs.elements["line"][ln_tmp.name])
+        displays += primitives.plot(x, bg=bg, **kargs)
 
         # x.mode=m
         # I think i have to use dict here because it's a valid value
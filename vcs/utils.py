@@ -33,14 +33,13 @@ from . import vector
 from . import marker
 from . import colormap
 import os
+import sys
+import glob
+import hashlib
+import pickle
 import tempfile
 import cdms2
 import genutil
-try:
-    import vtk
-    HAS_VTK = True
-except Exception:
-    HAS_VTK = False
 import struct
 from .clickMap import mapPng, getPngDimensions, meshToPngCoords, vcsToHtml, axisToPngCoords  # noqa
 try:
@@ -1003,15 +1002,8 @@ def saveinitialfile():
 #
 
 
-def scriptrun(script):
-    if script.split(".")[-1] == "scr":
-        scriptrun_scr(script)
-    elif script.split(".")[-1] == "py":
-        exec(compile(open(script).read(), script, 'exec'))
-    else:
-        if os.path.split(script)[-1] == "initial.attributes":
-            vcs._doValidation = False
-        loader = {"P": 'template',
+# Loaders of the element types of json files
+_scriptLoaders = {"P": 'template',
                   "Gfb": 'boxfill',
                   "Gfi": 'isofill',
                   "Gi": 'isoline',
@@ -1032,29 +1024,162 @@ def scriptrun(script):
                   "Cp": "colormap",
                   "L": "L",
                   }
+
+# Snapshots of the elements loaded from json files, bump the version when
+# the content of the snapshots changes
+_snapshotVersion = 2
+_snapshotSignature = None
+
+
+def _elementsSignature():
+    """Digest of the vcs version and of the slots of the elements classes,
+    snapshots pickled by other versions of the classes are not used"""
+    global _snapshotSignature
+    if _snapshotSignature is None:
         try:
-            f = open(script)
-            jsn = json.load(f)
-            keys = []
-            for k in ["Tt", "To", "Tl",
-                      "Tm", "Proj"]:  # always read these first
-                if k in list(jsn.keys()):
-                    keys.append(k)
-            for k in list(jsn.keys()):
-                if k not in keys:
-                    keys.append(k)
-            for typ in keys:
-                for nm, v in jsn[typ].items():
-                    if typ == "P":
-                        try:
-                            loadTemplate(str(nm), v)
-                        except Exception as err:
-                            print("could not load tmpl:", nm, err)
-                    else:
-                        try:
-                            loadVCSItem(loader[typ], nm, v)
-                        except Exception as err:
-                            print("failed", typ, nm, err)
+            from importlib import metadata
+            version = metadata.version("vcs")
+        except Exception:
+            version = getattr(vcs, "__version__", "")
+        classes = set(type(elt) for elts in vcs.elements.values() for elt in elts.values())
+        slots = sorted((cls.__module__, cls.__name__,
+                        [s for c in cls.__mro__ for s in getattr(c, "__slots__", ())]) for cls in classes)
+        _snapshotSignature = hashlib.sha1(repr((version, slots)).encode("utf-8")).hexdigest()[:12]
+    return _snapshotSignature
+
+
+def _snapshotPath(script, content):
+    """Path of the snapshot of a json file in the dot directory, it is named
+    after the file path, the hash of the file content and the elements
+    signature. With content None, returns the glob pattern of the snapshots
+    of any content of the file for this signature"""
+    dotdir, dotdirenv = getdotdirectory()
+    directory = os.path.join(os.path.expanduser("~"), os.environ.get(dotdirenv, dotdir))
+    directory = os.path.join(directory, "snapshots")
+    source = hashlib.sha1(os.path.abspath(script).encode("utf-8")).hexdigest()[:12]
+    prefix = "%s_%s_" % (os.path.basename(script), source)
+    suffix = "_%s_py%i%i_v%i.pickle" % (
+        _elementsSignature(), sys.version_info[0], sys.version_info[1], _snapshotVersion)
+    if content is None:
+        return os.path.join(glob.escape(directory), glob.escape(prefix) + "?" * 40 + glob.escape(suffix))
+    return os.path.join(directory, prefix + hashlib.sha1(content).hexdigest() + suffix)
+
+
+def _scriptElementType(typ):
+    """Type in vcs.elements of the json type typ"""
+    return {"P": "template", "L": "list"}.get(typ, _scriptLoaders.get(typ))
+
+
+def _loadScriptElement(typ, nm, v):
+    """Loads the element nm of the json type typ ("P", "Gfb", ...) from its
+    json dictionary v"""
+    if typ == "P":
+        try:
+            loadTemplate(str(nm), v)
+        except Exception as err:
+            print("could not load tmpl:", nm, err)
+    else:
+        try:
+            loadVCSItem(_scriptLoaders[typ], nm, v)
+        except Exception as err:
+            print("failed", typ, nm, err)
+
+
+def _saveSnapshot(script, before, content, keys):
+    """Saves the snapshot of script: the elements added to vcs.elements
+    since before with the json dictionaries, read from content in the order
+    of keys, of the elements the file names. Existing elements are restored
+    from these like the json file does."""
+    jsn = json.loads(content.decode("utf-8"))
+    named = set()
+    elements = []
+    for typ in keys:
+        etype = _scriptElementType(typ)
+        for nm, v in jsn[typ].items():
+            nm = str(nm)
+            elt = None
+            if etype in vcs.elements and before[etype].get(nm) is not vcs.elements[etype].get(nm):
+                elt = vcs.elements[etype][nm]
+            elements.append((etype, nm, elt, typ, v))
+            named.add((etype, nm))
+    # elements created along with the named ones go first
+    created = []
+    for typ, elts in vcs.elements.items():
+        for nm, elt in elts.items():
+            if (typ, nm) not in named and before[typ].get(nm) is not elt:
+                created.append((typ, nm, elt, None, None))
+    path = _snapshotPath(script, content)
+    try:
+        if not os.path.exists(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        # removes the snapshots of older contents of the file, the ones of
+        # other vcs or python versions sharing the dot directory are kept
+        for old in glob.glob(_snapshotPath(script, None)):
+            if old != path:
+                os.remove(old)
+        tmp = path + ".%i" % os.getpid()
+        with open(tmp, "wb") as f:
+            pickle.dump(created + elements, f, pickle.HIGHEST_PROTOCOL)
+        os.rename(tmp, path)
+    except Exception:
+        # snapshots are only an optimization (read-only home, element not picklable, ...)
+        pass
+
+
+def _loadSnapshot(path):
+    """Restores a snapshot saved by _saveSnapshot, returns False if there is
+    no usable snapshot. The pickled elements are only used if they do not
+    exist, the existing elements named in the json file are loaded from
+    their json dictionary."""
+    try:
+        with open(path, "rb") as f:
+            elements = pickle.load(f)
+    except Exception:
+        return False
+    existing = []
+    for etype, nm, elt, typ, v in elements:
+        if elt is not None and nm not in vcs.elements[etype]:
+            vcs.elements[etype][nm] = elt
+        elif typ is not None:
+            existing.append((typ, nm, v))
+    for typ, nm, v in existing:
+        _loadScriptElement(typ, nm, v)
+    return True
+
+
+def _scriptrunJSON(script):
+    """Loads the elements of a json file, from its snapshot if there is one"""
+    with open(script, "rb") as f:
+        content = f.read()
+    snapshot = _snapshotPath(script, content)
+    if _loadSnapshot(snapshot):
+        return
+    jsn = json.loads(content.decode("utf-8"))
+    before = dict((typ, dict(elts)) for typ, elts in vcs.elements.items())
+    keys = []
+    for k in ["Tt", "To", "Tl",
+              "Tm", "Proj"]:  # always read these first
+        if k in list(jsn.keys()):
+            keys.append(k)
+    for k in list(jsn.keys()):
+        if k not in keys:
+            keys.append(k)
+    for typ in keys:
+        for nm, v in jsn[typ].items():
+            _loadScriptElement(typ, nm, v)
+    _saveSnapshot(script, before, content, keys)
+
+
+def scriptrun(script):
+    if script.split(".")[-1] == "scr":
+        scriptrun_scr(script)
+    elif script.split(".")[-1] == "py":
+        exec(compile(open(script).read(), script, 'exec'))
+    else:
+        if os.path.split(script)[-1] == "initial.attributes":
+            vcs._doValidation = False
+        try:
+            _scriptrunJSON(script)
         # ok could not read json file maybe it is an old initial.attributes
         except Exception as err:
             if os.path.split(script)[-1] == "initial.attributes":
@@ -2534,7 +2659,9 @@ def rgba_color(color, colormap):
 
 
 def png_read_metadata(path):
-    if not HAS_VTK:
+    try:
+        import vtk
+    except ImportError:
         warnings.warn("You need vtk to read metadata from png")
         return {}
     reader = vtk.vtkPNGReader()
@@ -3060,3 +3187,111 @@ def trimData2D(data, frame=0):
     if not cdms2.isVariable(data):
         data = cdms2.MV2.array(data)
     return pickFrame(data, dimensions_on_plot=2, frame=frame)
+
+
+def _blockMean(values, strides):
+    """Averages the last len(strides) dimensions of the masked array values
+    over blocks of strides values, the last blocks may be smaller.
+    A block is masked if all its values are masked.
+    """
+    values = numpy.ma.asarray(values)
+    nd = values.ndim - len(strides)
+    padding = [(0, 0)] * nd + [(0, -n % s) for n, s in zip(values.shape[nd:], strides)]
+    mask = numpy.pad(numpy.ma.getmaskarray(values), padding, mode="constant", constant_values=True)
+    padded = numpy.ma.array(numpy.pad(values.filled(0), padding, mode="constant"), mask=mask)
+    shape = list(values.shape[:nd])
+    for n, s in zip(padded.shape[nd:], strides):
+        shape.extend((n // s, s))
+    blocks = padded.reshape(shape)
+    return blocks.mean(axis=tuple(range(nd + 1, len(shape), 2)))
+
+
+def minMaxDecimate(x, y, x1, x2, pixels, breaks=None):
+    """Selects the points of the polyline x, y to draw at most four points
+    per pixel column of a plot pixels wide showing x1 to x2: the first, the
+    last, the lowest and the highest point of each run of consecutive
+    points in the same column. The line drawn through them covers the same
+    pixels as the full line.
+
+    :param x: The x coordinates of the points
+    :type x: numpy.ndarray
+
+    :param y: The y coordinates of the points
+    :type y: numpy.ndarray
+
+    :param x1: The world coordinate at the left of the plot
+    :type x1: float
+
+    :param x2: The world coordinate at the right of the plot
+    :type x2: float
+
+    :param pixels: The width of the plot in pixels
+    :type pixels: int
+
+    :param breaks: Indices of the points starting a new polyline, runs do
+        not extend over them
+    :type breaks: list or numpy.ndarray
+
+    :returns: The sorted indices of the points kept
+    :rtype: numpy.ndarray
+    """
+    x = numpy.asarray(x, dtype=float)
+    y = numpy.asarray(y, dtype=float)
+    n = len(x)
+    if n == 0:
+        return numpy.arange(0)
+    if x2 != x1:
+        columns = numpy.floor((x - x1) * (pixels / float(x2 - x1)))
+    else:
+        columns = numpy.zeros(n)
+    newRun = numpy.ones(n, dtype=bool)
+    newRun[1:] = columns[1:] != columns[:-1]
+    if breaks is not None:
+        newRun[numpy.asarray(breaks, dtype=int)] = True
+    starts = numpy.flatnonzero(newRun)
+    ends = numpy.append(starts[1:], n) - 1
+    # sorted by run then y, the lowest and highest points of a run are at
+    # its first and last positions
+    order = numpy.lexsort((y, numpy.cumsum(newRun)))
+    return numpy.unique(numpy.concatenate((starts, ends, order[starts], order[ends])))
+
+
+def blockAverage2D(data, ystride, xstride):
+    """Averages the last two dimensions of data over blocks of
+    ystride x xstride values, to plot it at a lower resolution.
+
+    A block is masked only if all its values are masked. For a cdms2
+    variable the last two axes are replaced by axes whose values are the
+    means of the block values and whose bounds are the block bounds.
+
+    :param data: The data to average
+    :type data: cdms2.tvariable.TransientVariable or numpy.ma.MaskedArray
+
+    :param ystride: Number of values along the y (second to last) axis per block
+    :type ystride: int
+
+    :param xstride: Number of values along the x (last) axis per block
+    :type xstride: int
+
+    :returns: The averaged data
+    :rtype: cdms2.tvariable.TransientVariable or numpy.ma.MaskedArray
+    """
+    averaged = _blockMean(data, (ystride, xstride))
+    if not cdms2.isVariable(data):
+        return averaged
+    axes = data.getAxisList()[:-2]
+    for axis, stride in ((data.getAxis(-2), ystride), (data.getAxis(-1), xstride)):
+        values = _blockMean(axis[:], (stride,)).filled()
+        bounds = axis.getBounds()
+        if bounds is not None:
+            last = numpy.minimum(numpy.arange(stride - 1, len(axis) + stride - 1, stride), len(axis) - 1)
+            bounds = numpy.array([bounds[::stride, 0], bounds[last, 1]]).T
+        newAxis = cdms2.createAxis(values, bounds=bounds, id=axis.id)
+        for name, value in axis.attributes.items():
+            setattr(newAxis, name, value)
+        if axis.isLatitude():
+            newAxis.designateLatitude()
+        elif axis.isLongitude():
+            newAxis.designateLongitude()
+        axes.append(newAxis)
+    return cdms2.createVariable(averaged, axes=axes, attributes=data.attributes, id=data.id)
@@ -12,8 +12,13 @@ import cdms2
 import warnings
 from .projection import round_projections, no_over_proj4_parameter_projections
 from .vcsvtk import fillareautils
+from .vcsvtk import datasetcache
+from .vcsvtk import textcache
+from .vcsvtk.continents import loadContinents
 import sys
 import numbers
+import time
+import weakref
 
 
 DEBUG_MODE = False
@@ -179,15 +184,56 @@ def applyTransformationToDataset(T, data):
     return outputData
 
 
-def generateSolidColorArray(numTuples, color):
-    np_colors = numpy.empty([numTuples, 4])
-    np_colors[:, 0] = color[0]
-    np_colors[:, 1] = color[1]
-    np_colors[:, 2] = color[2]
-    np_colors[:, 3] = color[3]
-    return VN.numpy_to_vtk(num_array=np_colors,
-                           deep=True,
-                           array_type=vtk.VTK_UNSIGNED_CHAR)
+def generateSolidColorArray(numTuples, color, name=None):
+    '''
+    Returns a vtkUnsignedCharArray with 'numTuples' copies of the RGBA
+    'color' (0-255 values), an RGB color is opaque.
+    '''
+    if len(color) == 3:
+        color = list(color) + [255]
+    np_colors = numpy.empty((numTuples, 4), dtype=numpy.uint8)
+    np_colors[:] = color
+    colors = VN.numpy_to_vtk(num_array=np_colors,
+                             deep=True,
+                             array_type=vtk.VTK_UNSIGNED_CHAR)
+    if name is not None:
+        colors.SetName(name)
+    return colors
+
+
+def updatePolyDataItem(item, source, cellData, color=None):
+    '''
+    Re-executes 'source' (a mapper or a polydata algorithm) and draws its
+    output with the vtkPolyDataItem 'item'. The item is colored with the
+    mapper lookup table applied to cell or point scalars ('cellData') or
+    with the solid RGBA 'color' if not None.
+    '''
+    # keep the drawing properties (LineWidth, StippleType, ...)
+    fieldData = vtk.vtkFieldData()
+    if item.GetPolyData() is not None:
+        fieldData.ShallowCopy(item.GetPolyData().GetFieldData())
+    source.Update()
+    poly = source.GetInput() if source.IsA("vtkMapper") else source.GetOutput()
+    for i in range(fieldData.GetNumberOfArrays()):
+        array = fieldData.GetAbstractArray(i)
+        if not poly.GetFieldData().HasArray(array.GetName()):
+            poly.GetFieldData().AddArray(array)
+    item.SetPolyData(poly)
+    if color is None:
+        attributes = poly.GetCellData() if cellData else poly.GetPointData()
+        scalars = attributes.GetScalars()
+        if scalars is not None:
+            mapper = source.GetPolyDataMapper() if source.IsA("vtkLabeledContourMapper") else source
+            lut = mapper.GetLookupTable()
+            lut.SetRange(mapper.GetScalarRange())
+            mappedColors = lut.MapScalars(scalars, vtk.VTK_COLOR_MODE_DEFAULT, 0)
+            mappedColors.SetName('Colors')
+            item.SetMappedColors(mappedColors)
+            mappedColors.FastDelete()
+            return
+        color = [0, 0, 0, 255]
+    numTuples = poly.GetNumberOfCells() if cellData else poly.GetNumberOfPoints()
+    item.SetMappedColors(generateSolidColorArray(numTuples, color))
 
 
 def applyAttributesFromVCStmpl(tmpl, tmplattribute, txtobj=None):
@@ -218,8 +264,8 @@ def setArray(grid, array, arrayName, isCellData, isScalars):
     if (pedigreeId):
         vtkarray = attributes.GetArray(arrayName)
         if vtkarray is not None:
-            for i in range(0, vtkarray.GetNumberOfTuples()):
-                vtkarray.SetValue(i, array[pedigreeId.GetValue(i)])
+            VN.vtk_to_numpy(vtkarray)[:] = numpy.asarray(array).ravel()[VN.vtk_to_numpy(pedigreeId)]
+            vtkarray.Modified()
     else:
         vtkarray = numpy_to_vtk_wrapper(array, deep=False)
         vtkarray.SetName(arrayName)
@@ -228,12 +274,22 @@ def setArray(grid, array, arrayName, isCellData, isScalars):
         attributes.SetActiveScalars(arrayName)
 
 
+def maskToGhost(mask, cellData):
+    '''
+    Returns the ghost array values (uint8) hiding the cells or points
+    where the boolean 'mask' is set.
+    '''
+    invalidMaskValue = vtk.vtkDataSetAttributes.HIDDENCELL if cellData else \
+        vtk.vtkDataSetAttributes.HIDDENPOINT
+    return numpy.asarray(mask, dtype=numpy.bool_).ravel() * numpy.uint8(invalidMaskValue)
+
+
 def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
     msk = data.mask
     mapper = None
     if msk is not numpy.ma.nomask and not numpy.allclose(msk, False):
         if actorColor is not None:
-            flatIMask = msk.astype(numpy.double).flat
+            flatIMask = msk.astype(numpy.double).ravel()
             grid2 = grid.NewInstance()
             if grid.IsA("vtkStructuredGrid"):
                 vtkmask = numpy_to_vtk_wrapper(flatIMask, deep=deep, array_type=vtk.VTK_DOUBLE)
@@ -248,10 +304,8 @@ def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
                 if (attributes.GetPedigreeIds()):
                     attributes2.SetPedigreeIds(attributes.GetPedigreeIds())
                     pedigreeId = attributes2.GetPedigreeIds()
-                    vtkmask = vtk.vtkDoubleArray()
-                    vtkmask.SetNumberOfTuples(attributes2.GetPedigreeIds().GetNumberOfTuples())
-                    for i in range(0, vtkmask.GetNumberOfTuples()):
-                        vtkmask.SetValue(i, flatIMask[pedigreeId.GetValue(i)])
+                    vtkmask = numpy_to_vtk_wrapper(flatIMask[VN.vtk_to_numpy(pedigreeId)],
+                                                   deep=True, array_type=vtk.VTK_DOUBLE)
                 else:
                     # the unstructured grid is not wrapped
                     vtkmask = numpy_to_vtk_wrapper(flatIMask, deep=deep, array_type=vtk.VTK_DOUBLE)
@@ -286,13 +340,7 @@ def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
         # The ghost array now stores information about hidden (blanked)
         # points/cells. Setting an array entry to the bitwise value
         # `vtkDataSetAttributes.HIDDEN(CELL|POINT)` will blank the cell/point.
-        flatMask = msk.flat
-        ghost = numpy.zeros(len(flatMask), dtype=numpy.uint8)
-        invalidMaskValue = vtk.vtkDataSetAttributes.HIDDENCELL if cellData else \
-            vtk.vtkDataSetAttributes.HIDDENPOINT
-        for i, isInvalid in enumerate(flatMask):
-            if isInvalid:
-                ghost[i] = invalidMaskValue
+        ghost = maskToGhost(msk, cellData)
         attributes = grid.GetCellData() if cellData else grid.GetPointData()
         pedigreeIds = attributes.GetPedigreeIds()
         if (pedigreeIds):
@@ -309,6 +357,196 @@ def putMaskOnVTKGrid(data, grid, actorColor=None, cellData=True, deep=True):
     return mapper
 
 
+def updateMaskOnVTKGrid(data, grid, mapper=None, cellData=True):
+    '''
+    Updates in place the mask set by putMaskOnVTKGrid on 'grid' and the
+    input of the missing values 'mapper' it returned (if not None),
+    using the mask of 'data'. As with putMaskOnVTKGrid, masked cells
+    of polydata or unstructured grids are removed.
+    '''
+    dataMask = numpy.ma.getmaskarray(data).ravel()
+    attributes = grid.GetCellData() if cellData else grid.GetPointData()
+    pedigreeIds = attributes.GetPedigreeIds()
+    msk = dataMask[VN.vtk_to_numpy(pedigreeIds)] if pedigreeIds else dataMask
+    ghost = attributes.GetArray(vtk.vtkDataSetAttributes.GhostArrayName())
+    # as putMaskOnVTKGrid, the ghost array is replaced by the mask if any.
+    # It was set from the mask at plot time if there was a missing mapper.
+    if msk.any() or (ghost is not None and mapper is not None):
+        if pedigreeIds and (ghost is None or ghost.GetNumberOfTuples() != len(msk)):
+            # setArray only fills an existing array on wrapped grids
+            ghost = vtk.vtkUnsignedCharArray()
+            ghost.SetName(vtk.vtkDataSetAttributes.GhostArrayName())
+            ghost.SetNumberOfTuples(len(msk))
+            attributes.AddArray(ghost)
+        setArray(grid, maskToGhost(dataMask, cellData), vtk.vtkDataSetAttributes.GhostArrayName(),
+                 cellData, isScalars=False)
+        if grid.GetExtentType() == vtk.VTK_PIECES_EXTENT and msk.any():
+            removeHiddenPointsOrCells(grid, celldata=cellData)
+    if mapper is not None:
+        # the mapper input comes from a surface filter (possibly followed by
+        # a point to cell filter) on a copy of grid with the mask as scalars
+        algorithm = mapper.GetInputAlgorithm()
+        while not algorithm.IsA("vtkDataSetSurfaceFilter"):
+            algorithm = algorithm.GetInputAlgorithm()
+        maskGrid = algorithm.GetInputDataObject(0, 0)
+        maskAttributes = maskGrid.GetCellData() if cellData else maskGrid.GetPointData()
+        maskPedigreeIds = maskAttributes.GetPedigreeIds()
+        maskScalars = maskAttributes.GetScalars()
+        VN.vtk_to_numpy(maskScalars)[:] = (
+            dataMask[VN.vtk_to_numpy(maskPedigreeIds)] if maskPedigreeIds else dataMask)
+        maskScalars.Modified()
+        maskGrid.Modified()
+    grid.Modified()
+
+
+def levelIndices(values, levels):
+    '''
+    Returns the index in 'levels' (list of [min, max] intervals, bounds
+    included) of the interval containing each of 'values', -1 if none.
+    A value in several intervals gets the last one, as when the levels
+    are drawn in order.
+    '''
+    values = numpy.asarray(values)
+    lows = numpy.array([level[0] for level in levels], dtype=numpy.float64)
+    highs = numpy.array([level[1] for level in levels], dtype=numpy.float64)
+    if len(levels) > 0 and numpy.all(lows < highs) and numpy.array_equal(lows[1:], highs[:-1]):
+        # contiguous increasing levels
+        edges = numpy.append(lows, highs[-1])
+        indices = numpy.searchsorted(edges, values, side="right").astype(numpy.int32) - 1
+        indices[indices >= len(levels)] = -1
+        indices[values == edges[-1]] = len(levels) - 1
+    else:
+        indices = numpy.full(values.shape, -1, dtype=numpy.int32)
+        for i, (low, high) in enumerate(zip(lows, highs)):
+            indices[(values >= low) & (values <= high)] = i
+    return indices
+
+
+def bandLevelIndices(values, contourValues, levels):
+    '''
+    Returns the index in 'levels' (see levelIndices) of the bands made by
+    a vtkBandedPolyDataContourFilter for the sorted 'contourValues' in
+    value scalar mode: 'values' are the band lower contour values.
+    -1 for bands that are not in a level.
+    '''
+    values = numpy.asarray(values)
+    contourValues = numpy.asarray(contourValues, dtype=numpy.float64)
+    bandLevels = numpy.full(max(len(contourValues) - 1, 0), -1, dtype=numpy.int32)
+    for i, (low, high) in enumerate(levels):
+        bandLevels[(contourValues[:-1] >= low) & (contourValues[1:] <= high)] = i
+    # the filter stores the contour values with the scalars type
+    keys = contourValues[:-1].astype(values.dtype)
+    if len(keys) == 0:
+        return numpy.full(values.shape, -1, dtype=numpy.int32)
+    positions = numpy.minimum(numpy.searchsorted(keys, values), len(keys) - 1)
+    return numpy.where(keys[positions] == values, bandLevels[positions], -1).astype(numpy.int32)
+
+
+def firstPointIds(poly):
+    '''
+    Returns the id of the first point of each cell of the vtkPolyData 'poly'.
+    '''
+    firstIds = []
+    for cells in [poly.GetVerts(), poly.GetLines(), poly.GetPolys(), poly.GetStrips()]:
+        offsets, connectivity = cellArrayToNumpy(cells)
+        firstIds.append(connectivity[offsets[:-1]])
+    return numpy.concatenate(firstIds)
+
+
+def contourGroupIndices(poly, groups):
+    '''
+    Returns the index in 'groups' (list of lists of values) of the value of
+    each cell of 'poly', the output of a vtkContourFilter on all the values
+    of 'groups'. The value of a cell is the scalar of its first point.
+    '''
+    values = numpy.array([v for group in groups for v in group], dtype=numpy.float64)
+    groupIds = numpy.array([i for i, group in enumerate(groups) for v in group], dtype=numpy.int32)
+    order = numpy.argsort(values, kind="mergesort")
+    values = values[order]
+    groupIds = groupIds[order]
+    scalars = poly.GetPointData().GetScalars()
+    if scalars is None or poly.GetNumberOfCells() == 0 or len(values) == 0:
+        return numpy.full(poly.GetNumberOfCells(), -1, dtype=numpy.int32)
+    cellValues = VN.vtk_to_numpy(scalars)[firstPointIds(poly)]
+    # the output scalars are the contour values (up to rounding): use the
+    # nearest one
+    above = numpy.minimum(numpy.searchsorted(values, cellValues), len(values) - 1)
+    below = numpy.maximum(above - 1, 0)
+    nearest = numpy.where(numpy.abs(values[below] - cellValues) < numpy.abs(values[above] - cellValues),
+                          below, above)
+    return groupIds[nearest]
+
+
+def cellIndexFilter(name, cellIndices, active=True):
+    '''
+    Returns a vtkProgrammableFilter that adds to its input the cell array
+    'name' with the values returned by cellIndices(output) (one integer
+    per cell), and makes it the active cell scalars if 'active'.
+    The caller has to keep a reference to the returned filter.
+    '''
+    indexFilter = vtk.vtkProgrammableFilter()
+    # a weak reference does not make a cycle through the execute method
+    reference = weakref.ref(indexFilter)
+
+    def execute():
+        algorithm = reference()
+        if algorithm is None:
+            return
+        output = algorithm.GetOutput()
+        output.ShallowCopy(algorithm.GetInput())
+        indices = numpy_to_vtk_wrapper(numpy.asarray(cellIndices(output), dtype=numpy.int32), deep=True)
+        indices.SetName(name)
+        output.GetCellData().AddArray(indices)
+        if active:
+            output.GetCellData().SetActiveScalars(name)
+
+    indexFilter.SetExecuteMethod(execute)
+    return indexFilter
+
+
+def levelIndexFilter(levels, contourValues=None):
+    '''
+    Returns a cellIndexFilter computing the "levelIndex" of each cell from
+    its scalar with levelIndices, or with bandLevelIndices if the input
+    comes from a banded contour filter on 'contourValues'.
+    '''
+    def cellIndices(data):
+        scalars = data.GetCellData().GetScalars()
+        values = VN.vtk_to_numpy(scalars) if scalars is not None else numpy.zeros(0)
+        if contourValues is None:
+            return levelIndices(values, levels)
+        return bandLevelIndices(values, contourValues, levels)
+    return cellIndexFilter("levelIndex", cellIndices)
+
+
+def contourGroupFilter(groups):
+    '''
+    Returns a cellIndexFilter computing the "levelGroup" of each cell of a
+    contour filter output with contourGroupIndices.
+    '''
+    def cellIndices(data):
+        return contourGroupIndices(data, groups)
+    return cellIndexFilter("levelGroup", cellIndices, active=False)
+
+
+def addTimingObservers(algorithm, name, timings):
+    '''
+    Accumulates in timings[name] the time in seconds spent executing
+    'algorithm'.
+    '''
+    starts = []
+
+    def start(obj, event):
+        starts.append(time.time())
+
+    def end(obj, event):
+        if starts:
+            timings[name] = timings.get(name, 0.) + time.time() - starts.pop()
+
+    algorithm.AddObserver("StartEvent", start)
+    algorithm.AddObserver("EndEvent", end)
+
+
 def getBoundsList(axis, hasCellData, dualGrid):
     '''
     Returns the bounds list for 'axis'. If axis has n elements the
@@ -361,28 +599,26 @@ def setInfToValid(_geoPoints, ghost=None, validPoint=None):
         geoPoints = _geoPoints.GetData()
     else:
         geoPoints = _geoPoints
-    anyInfinity = False
+    if geoPoints.GetNumberOfTuples() == 0:
+        return False
+    points = VN.vtk_to_numpy(geoPoints)
+    isInf = numpy.isinf(points[:, :2])
+    infPoints = isInf.any(axis=1)
+    if not infPoints.any():
+        return False
     if (validPoint is None):
         validPoint = [0, 0, 0]
-        for i in range(geoPoints.GetNumberOfTuples()):
-            point = geoPoints.GetTuple(i)
-            if (not math.isinf(point[0]) and not math.isinf(point[1])):
-                validPoint[0] = point[0]
-                validPoint[1] = point[1]
-                break
-    for i in range(geoPoints.GetNumberOfTuples()):
-        point = geoPoints.GetTuple(i)
-        if (math.isinf(point[0]) or math.isinf(point[1])):
-            anyInfinity = True
-            newPoint = list(point)
-            if (math.isinf(point[0])):
-                newPoint[0] = validPoint[0]
-            if (math.isinf(point[1])):
-                newPoint[1] = validPoint[1]
-            geoPoints.SetTuple(i, newPoint)
-            if (ghost):
-                ghost.SetValue(i, vtk.vtkDataSetAttributes.HIDDENPOINT)
-    return anyInfinity
+        finite = numpy.flatnonzero(~infPoints)
+        if len(finite):
+            validPoint[0] = points[finite[0], 0]
+            validPoint[1] = points[finite[0], 1]
+    points[isInf[:, 0], 0] = validPoint[0]
+    points[isInf[:, 1], 1] = validPoint[1]
+    geoPoints.Modified()
+    if (ghost):
+        VN.vtk_to_numpy(ghost)[infPoints] = vtk.vtkDataSetAttributes.HIDDENPOINT
+        ghost.Modified()
+    return True
 
 
 def removeHiddenPointsOrCells(grid, celldata=False):
@@ -404,52 +640,39 @@ def removeHiddenPointsOrCells(grid, celldata=False):
     ghost = grid.GetCellGhostArray() if celldata else grid.GetPointGhostArray()
     if (not ghost):
         return
-    minScalar = sys.float_info.max
-    minVector = [0, 0, 0]
-    minVectorNorm = sys.float_info.max
-    num = grid.GetNumberOfCells() if celldata else grid.GetNumberOfPoints()
     hidden = vtk.vtkDataSetAttributes.HIDDENCELL if celldata else vtk.vtkDataSetAttributes.HIDDENPOINT
+    isHidden = (VN.vtk_to_numpy(ghost) & hidden) != 0
+    visible = ~isHidden
     if not celldata:
         scalars = grid.GetPointData().GetScalars()
         vectors = grid.GetPointData().GetVectors()
     else:
         scalars = grid.GetCellData().GetScalars()
         vectors = grid.GetCellData().GetVectors()
-    if (scalars or vectors):
-        vector = [0, 0, 0]
-        for i in range(num):
-            if (not (ghost.GetValue(i) & hidden)):
-                if (scalars):
-                    scalar = scalars.GetValue(i)
-                    if (scalar < minScalar):
-                        minScalar = scalar
-                if (vectors):
-                    vectors.GetTypedTuple(i, vector)
-                    vectorNorm = numpy.linalg.norm(vector)
-                    if (vectorNorm < minVectorNorm):
-                        minVector = vector
-                        minVectorNorm = vectorNorm
     hiddenScalars = False
     hiddenVectors = False
-    for i in range(num):
-        if (ghost.GetValue(i) & hidden):
-            if not celldata:
-                cells = vtk.vtkIdList()
-                # point hidden, remove all cells used by this point
-                grid.GetPointCells(i, cells)
-                for j in range(cells.GetNumberOfIds()):
-                    grid.DeleteCell(cells.GetId(j))
-                # hidden points are not removed. This causes problems
-                # because it changes the scalar range.
-                if(scalars):
-                    hiddenScalars = True
-                    scalars.SetValue(i, minScalar)
-                if(vectors):
-                    hiddenVectors = True
-                    vectors.SetTypedTuple(i, minVector)
-            else:
-                grid.DeleteCell(i)
-    # SetValue does not call modified - we'll have to call it after all calls.
+    if celldata:
+        for i in numpy.flatnonzero(isHidden):
+            grid.DeleteCell(int(i))
+    elif isHidden.any():
+        cells = vtk.vtkIdList()
+        for i in numpy.flatnonzero(isHidden):
+            # point hidden, remove all cells used by this point
+            grid.GetPointCells(int(i), cells)
+            for j in range(cells.GetNumberOfIds()):
+                grid.DeleteCell(cells.GetId(j))
+        # hidden points are not removed. This causes problems
+        # because it changes the scalar range: they are given the
+        # smallest visible scalar and vector instead.
+        if (scalars and visible.any()):
+            hiddenScalars = True
+            values = VN.vtk_to_numpy(scalars)
+            values[isHidden] = values[visible].min()
+        if (vectors and visible.any()):
+            hiddenVectors = True
+            values = VN.vtk_to_numpy(vectors)
+            values[isHidden] = values[numpy.flatnonzero(visible)[numpy.argmin(vectorNorms(vectors)[visible])]]
+    # the arrays are modified through numpy views, VTK has to be told.
     if (hiddenScalars):
         scalars.Modified()
     if (hiddenVectors):
@@ -465,6 +688,146 @@ def removeHiddenPointsOrCells(grid, celldata=False):
     attributes.SetActiveAttribute(globalIdsIndex, attributes.GLOBALIDS)
 
 
+# numpy type matching vtkIdType
+vtkIdTypeCode = VN.get_numpy_array_type(vtk.VTK_ID_TYPE)
+
+
+def numpyToVTKCellArray(offsets, connectivity):
+    '''
+    Builds a vtkCellArray in one bulk operation from numpy arrays.
+    'offsets' has one entry per cell plus a last entry equal to
+    len(connectivity), 'connectivity' contains the point ids of all cells.
+    '''
+    offsets = numpy.ascontiguousarray(offsets, dtype=vtkIdTypeCode)
+    connectivity = numpy.ascontiguousarray(connectivity, dtype=vtkIdTypeCode)
+    cells = vtk.vtkCellArray()
+    if hasattr(cells, "SetData"):
+        # VTK >= 9 stores offsets and connectivity directly
+        cells.SetData(VN.numpy_to_vtkIdTypeArray(offsets, deep=True),
+                      VN.numpy_to_vtkIdTypeArray(connectivity, deep=True))
+    else:
+        # legacy layout: [n0, id0, id1, ..., n1, id0, ...]
+        numberOfCells = len(offsets) - 1
+        counts = numpy.diff(offsets)
+        legacy = numpy.empty(numberOfCells + len(connectivity),
+                             dtype=vtkIdTypeCode)
+        headers = offsets[:-1] + numpy.arange(numberOfCells)
+        isHeader = numpy.zeros(len(legacy), dtype=bool)
+        isHeader[headers] = True
+        legacy[headers] = counts
+        legacy[~isHeader] = connectivity
+        cells.SetCells(numberOfCells,
+                       VN.numpy_to_vtkIdTypeArray(legacy, deep=True))
+    return cells
+
+
+def genMeshCells(m3, numberOfCells, nVertices):
+    '''
+    Returns the vtkCellArray of polygons for a mesh whose vertices are
+    stored cell after cell in 'm3' (nVertices per cell).
+    Vertices with a missing (NaN) x coordinate are skipped.
+    '''
+    valid = ~numpy.isnan(m3[:numberOfCells * nVertices, 0])
+    counts = valid.reshape((numberOfCells, nVertices)).sum(axis=1)
+    offsets = numpy.zeros(numberOfCells + 1, dtype=vtkIdTypeCode)
+    numpy.cumsum(counts, out=offsets[1:])
+    connectivity = numpy.flatnonzero(valid)
+    return numpyToVTKCellArray(offsets, connectivity)
+
+
+# Earth ellipsoid (WGS84) used to convert vectors from m/s to lon/lat
+polarRadius = 6356752.3142
+equatorialRadius = 6378137.0
+# ellipse circumference Ramanujan approximation
+_h = ((equatorialRadius - polarRadius) /
+      (equatorialRadius + polarRadius)) ** 2
+polarCircumference = math.pi * (equatorialRadius + polarRadius) * \
+    (1 + (3 * _h) / (10 + math.sqrt(4 - 3 * _h)))
+
+
+def vectorsToLonLat(lonlat, vectors):
+    '''
+    Converts 'vectors' in meters/s located at 'lonlat' points into
+    lon/lat increments. Both arguments are (N, 3) numpy arrays,
+    returns a new (N, 3) array.
+    '''
+    # use Philippe de La Hire point construction to compute
+    # see Wikipedia entry for ellipse
+    t = numpy.arctan(equatorialRadius / polarRadius *
+                     numpy.tan(numpy.radians(lonlat[:, 1])))
+    # this is the radius of the circle perpendicular on
+    # north axis at latitude lonlat[:, 1]
+    radiusLat = equatorialRadius * numpy.cos(t)
+    result = numpy.zeros((len(vectors), 3))
+    result[:, 0] = vectors[:, 0] * 360.0 / (2 * math.pi * radiusLat)
+    # this could be more precise I think
+    result[:, 1] = vectors[:, 1] * 360.0 / polarCircumference
+    return result
+
+
+def projectVectors(lonlat, vectors, geopts, geo):
+    '''
+    Returns the vtk "vector" array of 'vectors' (in meters / s) at points
+    'lonlat' projected with 'geo' (vtkGeoTransform) to 'geopts'.
+    All inputs are numpy arrays of shape (N, 3).
+    '''
+    # points are in lon lat, vectors are in meters / s so:
+    # 1. convert vectors in lon lat and add them to points to get vector heads
+    vectorsHead = vtk.vtkPoints()
+    vectorsHead.SetData(numpy_to_vtk_wrapper(
+        numpy.add(lonlat, vectorsToLonLat(lonlat, vectors))))
+    # 2. project vector heads
+    geoVectorsHead = vtk.vtkPoints()
+    geo.TransformPoints(vectorsHead, geoVectorsHead)
+    # 3. subtract geopoints from projected vector heads
+    newVector = numpy_to_vtk_wrapper(
+        numpy.subtract(VN.vtk_to_numpy(geoVectorsHead.GetData()), geopts))
+    newVector.SetName("vector")
+    setInfToValid(newVector, ghost=None, validPoint=[0, 0, 0])
+    return newVector
+
+
+# Projected and wrapped geometry generated by genGrid, reused when
+# plotting several variables on the same grid.
+gridCache = datasetcache.DataSetCache()
+
+
+def geometryFingerprint(vg, points, projection, wc, wrap, cellData):
+    '''
+    Returns the gridCache key for the geometry built from 'points'
+    with the topology of 'vg'.
+    '''
+    if vg.IsA("vtkStructuredGrid"):
+        topology = vg.GetDimensions()
+    else:
+        topology = vg.GetNumberOfCells()
+    return datasetcache.fingerprint(
+        vg.GetClassName(), topology, points, projection.type,
+        projection.parameters, [float(w) for w in wc], wrap, cellData)
+
+
+def setCachedGeometryScalars(vg, data1, cellData):
+    '''
+    Sets 'data1' as the scalars of a geometry retrieved from gridCache,
+    using the PedigreeIds to map data values to (wrapped) cells or points.
+    '''
+    attributes = vg.GetCellData() if cellData else vg.GetPointData()
+    pedigreeIds = VN.vtk_to_numpy(attributes.GetPedigreeIds())
+    values = numpy.ravel(data1.filled(0.))[pedigreeIds]
+    ghost = vg.GetPointGhostArray()
+    if (not cellData and ghost is not None and
+            vg.GetExtentType() == vtk.VTK_PIECES_EXTENT):
+        # same as removeHiddenPointsOrCells: hidden points get the
+        # minimum so that they do not change the scalar range
+        hidden = (VN.vtk_to_numpy(ghost) &
+                  vtk.vtkDataSetAttributes.HIDDENPOINT) != 0
+        if hidden.any() and not hidden.all():
+            values[hidden] = values[~hidden].min()
+    scalars = numpy_to_vtk_wrapper(values, deep=False)
+    scalars.SetName("scalar")
+    attributes.SetScalars(scalars)
+
+
 def genGrid(data1, data2, gm, grid=None, geo=None, genVectors=False,
             dualGrid=False):
     continents = False
@@ -488,6 +851,7 @@ def genGrid(data1, data2, gm, grid=None, geo=None, genVectors=False,
                 ym = m[:, 0].min()
                 yM = m[:, 0].max()
                 numberOfCells = m.shape[0]
+                nVertices = m.shape[-1]
                 # For vtk we need to reorder things
                 m2 = numpy.ascontiguousarray(numpy.transpose(m, (0, 2, 1)))
                 m2.resize((m2.shape[0] * m2.shape[1], m2.shape[2]))
@@ -524,15 +888,8 @@ def genGrid(data1, data2, gm, grid=None, geo=None, genVectors=False,
     if m3 is not None:
         # Create unstructured grid points
         vg = vtk.vtkUnstructuredGrid()
-        for i in range(numberOfCells):
-            pt_ids = []
-            for j in range(nVertices):
-                indx = i * nVertices + j
-                if not numpy.isnan(m3[indx][0]):  # missing value means skip vertex
-                    pt_ids.append(indx)
-            vg.InsertNextCell(vtk.VTK_POLYGON,
-                              len(pt_ids),
-                              pt_ids)
+        vg.SetCells(vtk.VTK_POLYGON,
+                    genMeshCells(m3, numberOfCells, nVertices))
     else:
         # Ok a simple structured grid is enough
         if grid is None:
@@ -660,114 +1017,80 @@ def genGrid(data1, data2, gm, grid=None, geo=None, genVectors=False,
                                                data1.getAxis(-1),
                                                data1.getAxis(-2))
 
-        vg.SetPoints(pts)
-        # index into the scalar array. Used for upgrading
-        # the scalar after wrapping. Note this will work
-        # correctly only for cell data. For point data
-        # the indexes for points on the border will be incorrect after
-        # wrapping
-        pedigreeId = vtk.vtkIntArray()
-        pedigreeId.SetName("PedigreeIds")
-        pedigreeId.SetNumberOfTuples(attribute.GetNumberOfTuples())
-        for i in range(0, attribute.GetNumberOfTuples()):
-            pedigreeId.SetValue(i, i)
-        if cellData:
-            vg.GetCellData().SetPedigreeIds(pedigreeId)
+        # The projected and wrapped geometry only depends on the grid,
+        # the projection and the world coordinates, reuse it if possible.
+        cacheKey = None
+        transientWrapX = (isinstance(g, cdms2.hgrid.TransientCurveGrid) and
+                          xRange > 360 and not numpy.isclose(xRange, 360))
+        if not genVectors and not transientWrapX:
+            cacheKey = geometryFingerprint(vg, m3, projection, wc, wrap, cellData)
+        cached = gridCache.get(cacheKey)
+        if cached is not None:
+            vg, (xm, xM, ym, yM, geo) = cached
+            setCachedGeometryScalars(vg, data1, cellData)
         else:
-            vg.GetPointData().SetPedigreeIds(pedigreeId)
+            vg.SetPoints(pts)
+            # index into the scalar array. Used for upgrading
+            # the scalar after wrapping. Note this will work
+            # correctly only for cell data. For point data
+            # the indexes for points on the border will be incorrect after
+            # wrapping
+            pedigreeId = numpy_to_vtk_wrapper(
+                numpy.arange(attribute.GetNumberOfTuples(), dtype=numpy.intc),
+                deep=True, array_type=vtk.VTK_INT)
+            pedigreeId.SetName("PedigreeIds")
+            if cellData:
+                vg.GetCellData().SetPedigreeIds(pedigreeId)
+            else:
+                vg.GetPointData().SetPedigreeIds(pedigreeId)
 
-        if (isinstance(g, cdms2.hgrid.TransientCurveGrid) and
-                xRange > 360 and not numpy.isclose(xRange, 360)):
-            vg = wrapDataSetX(vg)
+            if transientWrapX:
+                vg = wrapDataSetX(vg)
+                pts = vg.GetPoints()
+                xm, xM, ym, yM, tmp, tmp2 = vg.GetPoints().GetBounds()
+            vg = doWrapData(vg, wc, wrap)
             pts = vg.GetPoints()
             xm, xM, ym, yM, tmp, tmp2 = vg.GetPoints().GetBounds()
-        vg = doWrapData(vg, wc, wrap)
-        pts = vg.GetPoints()
-        xm, xM, ym, yM, tmp, tmp2 = vg.GetPoints().GetBounds()
-        projection = vcs.elements["projection"][gm.projection]
-        vg.SetPoints(pts)
-        wrb = getWrappedBounds(wc, [xm, xM, ym, yM], wrap)
-        geo, geopts = project(pts, projection, wrb)
-        # proj4 returns inf for points that are not visible. Set those to a
-        # valid point and hide them.
-        if (geo):
-            # project vectors
-            if (genVectors):
-                polarRadius = 6356752.3142
-                equatorialRadius = 6378137.0
-                # points are in lon lat, vectors are in meters / s so:
-                # 1. convert vectors in lon lat
-                vectors = vg.GetPointData().GetVectors()
-                vectors.SetName("original_vector")
-                ptsData = pts.GetData()
-                vectorsLonLat = vectors.NewInstance()
-                vectorsLonLat.SetNumberOfComponents(
-                    vectors.GetNumberOfComponents())
-                vectorsLonLat.SetNumberOfTuples(
-                    vectors.GetNumberOfTuples())
-                for i in range(ptsData.GetNumberOfTuples()):
-                    lonlat = ptsData.GetTuple(i)
-                    vector = vectors.GetTuple(i)
-                    # use Philippe de La Hire point construction to compute
-                    # see Wikipedia entry for ellipse
-                    t = math.atan(equatorialRadius / polarRadius *
-                                  math.tan(math.radians(lonlat[1])))
-                    # this is the radius of the circle perpendicular on
-                    # north axis at latitue lonlat[0]
-                    radiusLat = equatorialRadius * math.cos(t)
-                    vectorLonLat = [0.0, 0.0, 0.0]
-                    vectorLonLat[0] = \
-                        vector[0] * 360.0 / (2 * math.pi * radiusLat)
-                    # ellipse circumference Ramanujan approximation
-                    h = ((equatorialRadius - polarRadius) /
-                         (equatorialRadius + polarRadius)) ** 2
-                    polarCircumference = math.pi * \
-                        (equatorialRadius + polarRadius) * \
-                        (1 + (3 * h) / (10 + math.sqrt(4 - 3 * h)))
-                    # this could be more precise I think
-                    vectorLonLat[1] = vector[1] * 360 / polarCircumference
-                    vectorsLonLat.SetTuple(i, vectorLonLat)
-
-                # 2. add vectors to points to get new points
-                vectorsHeadLonLat = numpy_to_vtk_wrapper(
-                    numpy.add(VN.vtk_to_numpy(ptsData),
-                              VN.vtk_to_numpy(vectorsLonLat)))
-                # 3. project vector head
-                vectorsHeadPts = vtk.vtkPoints()
-                vectorsHeadPts.SetData(vectorsHeadLonLat)
-                _, geoVectorsHead = project(vectorsHeadPts, projection, wrb)
-                # 4. subtract geopoints from projected vector head
-                newVector = numpy_to_vtk_wrapper(
-                    numpy.subtract(VN.vtk_to_numpy(geoVectorsHead.GetData()),
-                                   VN.vtk_to_numpy(geopts.GetData())))
-                # 5. replace the vector array
-                newVector.SetName("vector")
-                setInfToValid(newVector, ghost=None, validPoint=[0, 0, 0])
-                vg.GetPointData().AddArray(newVector)
-                vg.GetPointData().SetActiveVectors("vector")
-            ghost = vg.AllocatePointGhostArray()
-            if (setInfToValid(geopts, ghost)):
-                # if there are hidden points, we recompute the bounds
-                xm = ym = sys.float_info.max
-                xM = yM = - sys.float_info.max
-                for i in range(pts.GetNumberOfPoints()):
-                    if (ghost.GetValue(i) & vtk.vtkDataSetAttributes.HIDDENPOINT == 0):
-                        # point not hidden
-                        p = pts.GetPoint(i)
-                        if (p[0] < xm):
-                            xm = p[0]
-                        if (p[0] > xM):
-                            xM = p[0]
-                        if (p[1] < ym):
-                            ym = p[1]
-                        if (p[1] > yM):
-                            yM = p[1]
-                # hidden point don't work for polys or unstructured grids.
-                # We remove the cells in this case.
-                if (vg.GetExtentType() == vtk.VTK_PIECES_EXTENT):
-                    removeHiddenPointsOrCells(vg, celldata=False)
-            # Sets the vertics into the grid
-            vg.SetPoints(geopts)
+            projection = vcs.elements["projection"][gm.projection]
+            vg.SetPoints(pts)
+            wrb = getWrappedBounds(wc, [xm, xM, ym, yM], wrap)
+            geo, geopts = project(pts, projection, wrb)
+            # proj4 returns inf for points that are not visible. Set those to a
+            # valid point and hide them.
+            if (geo):
+                # project vectors
+                if (genVectors):
+                    vectors = vg.GetPointData().GetVectors()
+                    vectors.SetName("original_vector")
+                    # keep the lon lat points to project updated vectors
+                    lonlat = pts.GetData()
+                    lonlat.SetName("lonlat")
+                    vg.GetPointData().AddArray(lonlat)
+                    newVector = projectVectors(VN.vtk_to_numpy(lonlat),
+                                               VN.vtk_to_numpy(vectors),
+                                               VN.vtk_to_numpy(geopts.GetData()),
+                                               geo)
+                    # replace the vector array
+                    vg.GetPointData().AddArray(newVector)
+                    vg.GetPointData().SetActiveVectors("vector")
+                ghost = vg.AllocatePointGhostArray()
+                if (setInfToValid(geopts, ghost)):
+                    # if there are hidden points, we recompute the bounds
+                    xm = ym = sys.float_info.max
+                    xM = yM = - sys.float_info.max
+                    visible = (VN.vtk_to_numpy(ghost) &
+                               vtk.vtkDataSetAttributes.HIDDENPOINT) == 0
+                    if visible.any():
+                        visiblePts = VN.vtk_to_numpy(pts.GetData())[visible]
+                        xm, ym = visiblePts[:, :2].min(axis=0)
+                        xM, yM = visiblePts[:, :2].max(axis=0)
+                    # hidden point don't work for polys or unstructured grids.
+                    # We remove the cells in this case.
+                    if (vg.GetExtentType() == vtk.VTK_PIECES_EXTENT):
+                        removeHiddenPointsOrCells(vg, celldata=False)
+                # Sets the vertics into the grid
+                vg.SetPoints(geopts)
+            gridCache.put(cacheKey, vg, (xm, xM, ym, yM, geo))
     else:
         xm, xM, ym, yM, tmp, tmp2 = grid.GetPoints().GetBounds()
         vg = grid
@@ -795,6 +1118,20 @@ def genGrid(data1, data2, gm, grid=None, geo=None, genVectors=False,
 # Continents first
 # Try to save time and memorize these continents
 vcsContinents = {}
+# Projected, wrapped and clipped continents, see continentsFingerprint
+continentsCache = datasetcache.DataSetCache(maxMemory=32 * 1024 * 1024)
+
+
+def continentsFingerprint(fnm, xaxisconvert, yaxisconvert, wc, projection):
+    '''
+    Returns the continentsCache key for the continents file 'fnm'
+    converted, wrapped and clipped to 'wc' and projected with 'projection'.
+    '''
+    path = os.path.abspath(fnm)
+    stat = os.stat(path)
+    return datasetcache.fingerprint(
+        path, stat.st_mtime, stat.st_size, xaxisconvert, yaxisconvert,
+        [float(w) for w in wc], projection.type, projection.parameters)
 
 
 def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y: y):
@@ -802,52 +1139,16 @@ def prepContinents(fnm, xConvertFunction=lambda x: x, yConvertFunction=lambda y:
     Author: Charles Doutriaux
     Input: vcs continent file name
     """
-    poly = vtk.vtkPolyData()
-    cells = vtk.vtkCellArray()
+    lat, lon, offsets = loadContinents(fnm)
+    points = numpy.zeros((len(lat), 3), dtype=numpy.float32)
+    points[:, 0] = xConvertFunction(lon)
+    points[:, 1] = yConvertFunction(lat)
     pts = vtk.vtkPoints()
-    f = open(fnm)
-    ln = f.readline()
-    while ln.strip().split() != ["-99", "-99"]:
-        # Many lines, need to know number of points
-        N = int(ln.split()[0])
-        # Now create and store these points
-        n = 0
-        npts = pts.GetNumberOfPoints()
-        while n < N:
-            ln = str(f.readline())
-            sp = ln.split()
-            sn = len(sp)
-            didIt = False
-            if sn % 2 == 0:
-                try:
-                    spts = []
-                    for i in range(sn // 2):
-                        l, L = float(sp[i * 2]), float(sp[i * 2 + 1])
-                        spts.append([l, L])
-                    for p in spts:
-                        x = xConvertFunction(p[1])
-                        y = yConvertFunction(p[0])
-                        pts.InsertNextPoint(x, y, 0.)
-                    n += sn
-                    didIt = True
-                except Exception:
-                    didIt = False
-            if didIt is False:
-                while len(ln) > 2:
-                    l, L = float(ln[:8]), float(ln[8:16])
-                    x = xConvertFunction(L)
-                    y = yConvertFunction(l)
-                    pts.InsertNextPoint(x, y, 0.)
-                    ln = ln[16:]
-                    n += 2
-        ln = vtk.vtkPolyLine()
-        ln.GetPointIds().SetNumberOfIds(N // 2)
-        for i in range(N // 2):
-            ln.GetPointIds().SetId(i, i + npts)
-        cells.InsertNextCell(ln)
-        ln = f.readline()
+    pts.SetData(numpy_to_vtk_wrapper(points, deep=False))
+    poly = vtk.vtkPolyData()
     poly.SetPoints(pts)
-    poly.SetLines(cells)
+    poly.SetLines(numpyToVTKCellArray(
+        offsets, numpy.arange(len(lat), dtype=vtkIdTypeCode)))
 
     # The dataset has some duplicate lines that extend
     # outside of x=[-180, 180],
@@ -1150,6 +1451,144 @@ def dump2VTK(obj, fnm=None):
     dsw.Write()
 
 
+def cellArrayToNumpy(cells):
+    '''
+    Returns the (offsets, connectivity) numpy arrays of a vtkCellArray,
+    this is the inverse of numpyToVTKCellArray.
+    '''
+    if hasattr(cells, "GetOffsetsArray"):
+        # VTK >= 9
+        return (VN.vtk_to_numpy(cells.GetOffsetsArray()).astype(vtkIdTypeCode),
+                VN.vtk_to_numpy(cells.GetConnectivityArray()).astype(vtkIdTypeCode))
+    numberOfCells = cells.GetNumberOfCells()
+    offsets = numpy.zeros(numberOfCells + 1, dtype=vtkIdTypeCode)
+    if numberOfCells == 0:
+        return offsets, numpy.zeros(0, dtype=vtkIdTypeCode)
+    legacy = VN.vtk_to_numpy(cells.GetData())
+    n = legacy[0]
+    if len(legacy) == numberOfCells * (n + 1) and numpy.all(legacy[::n + 1] == n):
+        # all cells have the same number of points
+        offsets[1:] = n
+        numpy.cumsum(offsets, out=offsets)
+        connectivity = legacy.reshape((numberOfCells, n + 1))[:, 1:].ravel()
+        return offsets, connectivity.astype(vtkIdTypeCode)
+    # legacy layout: [n0, id0, id1, ..., n1, id0, ...]
+    headers = numpy.empty(numberOfCells, dtype=vtkIdTypeCode)
+    position = 0
+    for i in range(numberOfCells):
+        headers[i] = position
+        position += legacy[position] + 1
+    numpy.cumsum(legacy[headers], out=offsets[1:])
+    isHeader = numpy.zeros(len(legacy), dtype=bool)
+    isHeader[headers] = True
+    return offsets, legacy[~isHeader].astype(vtkIdTypeCode)
+
+
+def gatherAttributes(source, target, ids):
+    '''
+    Adds to 'target' the tuples 'ids' of all the arrays in 'source'
+    (vtkPointData or vtkCellData) and sets the same active attributes.
+    '''
+    for i in range(source.GetNumberOfArrays()):
+        array = source.GetArray(i)
+        if array is None:
+            # not a vtkDataArray
+            continue
+        values = numpy.ascontiguousarray(VN.vtk_to_numpy(array)[ids])
+        copy = VN.numpy_to_vtk(values, deep=True,
+                               array_type=array.GetDataType())
+        copy.SetName(array.GetName())
+        target.AddArray(copy)
+    for attributeType in range(vtk.vtkDataSetAttributes.NUM_ATTRIBUTES):
+        active = source.GetAbstractAttribute(attributeType)
+        if active is not None and active.GetName():
+            target.SetActiveAttribute(active.GetName(), attributeType)
+
+
+def translateCells(data, translations, window):
+    '''
+    Returns a polydata made of copies of the cells of polydata 'data'
+    translated by each (dx, dy) in 'translations'. For each translation
+    only the cells whose bounding box intersects
+    window = [xmin, xmax, ymin, ymax] are copied, together with
+    their points and point/cell data.
+    '''
+    xmn, xmx, ymn, ymx = window
+    points = VN.vtk_to_numpy(data.GetPoints().GetData())
+    cellArrays = [data.GetVerts(), data.GetLines(),
+                  data.GetPolys(), data.GetStrips()]
+    # (offsets, connectivity, counts, selections) for each cell array
+    topology = []
+    for cells in cellArrays:
+        offsets, connectivity = cellArrayToNumpy(cells)
+        counts = numpy.diff(offsets)
+        nonEmpty = counts > 0
+        starts = offsets[:-1][nonEmpty]
+        selections = []
+        if len(starts):
+            x = points[connectivity, 0]
+            y = points[connectivity, 1]
+            cxmn = numpy.minimum.reduceat(x, starts)
+            cxmx = numpy.maximum.reduceat(x, starts)
+            cymn = numpy.minimum.reduceat(y, starts)
+            cymx = numpy.maximum.reduceat(y, starts)
+        for dx, dy in translations:
+            selected = numpy.zeros(len(counts), dtype=bool)
+            if len(starts):
+                selected[nonEmpty] = ((cxmx + dx >= xmn) & (cxmn + dx <= xmx) &
+                                      (cymx + dy >= ymn) & (cymn + dy <= ymx))
+            selections.append(selected)
+        topology.append((offsets, connectivity, counts, selections))
+
+    # points used by each copy and their new index in that copy
+    usedPoints = []
+    pointMaps = []
+    for k in range(len(translations)):
+        used = numpy.zeros(len(points), dtype=bool)
+        for offsets, connectivity, counts, selections in topology:
+            used[connectivity[numpy.repeat(selections[k], counts)]] = True
+        usedPoints.append(numpy.flatnonzero(used))
+        pointMaps.append(numpy.cumsum(used, dtype=vtkIdTypeCode) - 1)
+    pointBase = numpy.concatenate(
+        ([0], numpy.cumsum([len(used) for used in usedPoints])))
+
+    result = vtk.vtkPolyData()
+    newPoints = numpy.concatenate(
+        [points[used] + numpy.array([dx, dy, 0.], dtype=points.dtype)
+         for used, (dx, dy) in zip(usedPoints, translations)])
+    pts = vtk.vtkPoints()
+    pts.SetData(VN.numpy_to_vtk(newPoints, deep=True))
+    result.SetPoints(pts)
+
+    cellIds = []
+    cellBase = 0
+    newCellArrays = []
+    for offsets, connectivity, counts, selections in topology:
+        newCounts = []
+        newConnectivity = []
+        for k, selected in enumerate(selections):
+            ids = connectivity[numpy.repeat(selected, counts)]
+            newConnectivity.append(pointBase[k] + pointMaps[k][ids])
+            newCounts.append(counts[selected])
+            cellIds.append(cellBase + numpy.flatnonzero(selected))
+        cellBase += len(counts)
+        newOffsets = numpy.zeros(sum(len(c) for c in newCounts) + 1,
+                                 dtype=vtkIdTypeCode)
+        numpy.cumsum(numpy.concatenate(newCounts), out=newOffsets[1:])
+        newCellArrays.append(
+            numpyToVTKCellArray(newOffsets, numpy.concatenate(newConnectivity)))
+    result.SetVerts(newCellArrays[0])
+    result.SetLines(newCellArrays[1])
+    result.SetPolys(newCellArrays[2])
+    result.SetStrips(newCellArrays[3])
+
+    gatherAttributes(data.GetPointData(), result.GetPointData(),
+                     numpy.concatenate(usedPoints))
+    gatherAttributes(data.GetCellData(), result.GetCellData(),
+                     numpy.concatenate(cellIds))
+    return result
+
+
 def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
     '''
     Wrapping around and 'wrap' modulo' and clipping.
@@ -1159,25 +1598,14 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
         return data
 
     # convert to poly data
-    surface = vtk.vtkDataSetSurfaceFilter()
-    surface.SetInputData(data)
-    surface.Update()
-    data = surface.GetOutput()
+    if not data.IsA("vtkPolyData"):
+        surface = vtk.vtkDataSetSurfaceFilter()
+        surface.SetInputData(data)
+        surface.Update()
+        data = surface.GetOutput()
+    if data.GetNumberOfCells() == 0:
+        return data
     bounds = data.GetBounds()
-    # insure that GLOBALIDS are not removed by the append filter
-    attributes = data.GetCellData()
-    globalIds = attributes.GetGlobalIds()
-    globalIdsName = None
-    if (globalIds):
-        globalIdsName = globalIds.GetName()
-    attributes.SetActiveAttribute(-1, vtk.vtkDataSetAttributes.GLOBALIDS)
-    # insure that vtkTransformPolyData does not change the VECTORS attribute
-    pointAttributes = data.GetPointData()
-    vectors = pointAttributes.GetVectors()
-    vectorsName = None
-    if (vectors):
-        vectorsName = vectors.GetName()
-    pointAttributes.SetActiveAttribute(-1, vtk.vtkDataSetAttributes.VECTORS)
     xmn = min(wc[0], wc[1])
     xmx = max(wc[0], wc[1])
     if (numpy.allclose(xmn, 1.e20) or numpy.allclose(xmx, 1.e20)):
@@ -1195,9 +1623,6 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
         else:
             ymx = bounds[3]
 
-    appendFilter = vtk.vtkAppendPolyData()
-    appendFilter.AddInputData(data)
-    appendFilter.Update()
     # X axis wrappping
     Amn, Amx = bounds[0], bounds[1]
     nX = [0, 0]  # number of translations needed (neg and pos)
@@ -1218,21 +1643,31 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
             nY[1] += 1
             Amx += wrap[0]
 
-    nNeg = -max(nX[0], nY[0])  # Number of negative translation needed
-    nPos = max(nX[1], nY[1]) + 1  # Number of negative translation needed
-    # Negative translation
-    for i in range(nNeg, nPos):
-        for j in range(nNeg, nPos):
-            if i == 0 and j == 0:
-                continue
-            Tpf = vtk.vtkTransformPolyDataFilter()
-            Tpf.SetInputData(data)
-            T = vtk.vtkTransform()
-            T.Translate(i * wrap[1], j * wrap[0], 0)
-            Tpf.SetTransform(T)
-            Tpf.Update()
-            appendFilter.AddInputData(Tpf.GetOutput())
-            appendFilter.Update()
+    if (nX == [0, 0] and nY == [0, 0] and
+            xmn <= bounds[0] and bounds[1] <= xmx and
+            ymn <= bounds[2] and bounds[3] <= ymx):
+        # nothing to wrap or clip
+        return data
+
+    # Copy only the cells that end up in the window, then clip once
+    translations = [(i * wrap[1], j * wrap[0])
+                    for i in range(-nX[0], nX[1] + 1)
+                    for j in range(-nY[0], nY[1] + 1)]
+    data = translateCells(data, translations, [xmn, xmx, ymn, ymx])
+
+    # insure that GLOBALIDS are not removed by the clipper
+    attributes = data.GetCellData()
+    globalIds = attributes.GetGlobalIds()
+    globalIdsName = None
+    if (globalIds):
+        globalIdsName = globalIds.GetName()
+    attributes.SetActiveAttribute(-1, vtk.vtkDataSetAttributes.GLOBALIDS)
+    pointAttributes = data.GetPointData()
+    vectors = pointAttributes.GetVectors()
+    vectorsName = None
+    if (vectors):
+        vectorsName = vectors.GetName()
+    pointAttributes.SetActiveAttribute(-1, vtk.vtkDataSetAttributes.VECTORS)
 
     # Clip the data to the final window:
     clipBox = vtk.vtkBox()
@@ -1248,7 +1683,7 @@ def doWrapData(data, wc, wrap=[0., 360], fastClip=True):
         clipper = vtk.vtkClipPolyData()
         clipper.InsideOutOn()
         clipper.SetClipFunction(clipBox)
-    clipper.SetInputConnection(appendFilter.GetOutputPort())
+    clipper.SetInputData(data)
     clipper.Update()
     result = clipper.GetOutput()
     if (globalIdsName):
@@ -1371,8 +1806,10 @@ def setClipPlanes(mapper, xmin, xmax, ymin, ymax):
 #     return clp.GetOutput()
 
 
-def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
-                     overrideColorIndex=None):
+def textPropertyValues(winSize, to="default", tt="default", cmap=None,
+                       overrideColorIndex=None):
+    '''Returns the values set on a vtkTextProperty by prepTextProperty
+    as a tuple, they are used as key of the text cache'''
     if isinstance(to, str):
         to = vcs.elements["textorientation"][to]
     if isinstance(tt, str):
@@ -1389,40 +1826,58 @@ def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
         c = cmap.index[colorIndex]
     else:
         c = colorIndex
-    p.SetColor([C / 100. for C in c[:3]])
-    p.SetOpacity(c[-1] / 100.)
     bcolorIndex = tt.backgroundcolor if tt.backgroundcolor else 255
     if isinstance(bcolorIndex, int):
         bc = cmap.index[bcolorIndex]
     else:
         bc = bcolorIndex
-    p.SetBackgroundColor([C / 100. for C in bc[:3]])
     bopacity = (tt.backgroundopacity / 100.) if tt.backgroundopacity else 0
+    return (tuple(C / 100. for C in c[:3]), c[-1] / 100.,
+            tuple(C / 100. for C in bc[:3]), bopacity,
+            to.halign, -to.angle, to.valign,
+            vcs.elements["font"][vcs.elements["fontNumber"][tt.font]],
+            int(to.height * winSize[1] / 800.))
+
+
+def applyTextPropertyValues(p, values):
+    color, opacity, bcolor, bopacity, halign, angle, valign, fontFile, fontSize = values
+    p.SetColor(color)
+    p.SetOpacity(opacity)
+    p.SetBackgroundColor(bcolor)
     p.SetBackgroundOpacity(bopacity)
-    if to.halign in [0, 'left']:
+    if halign in [0, 'left']:
         p.SetJustificationToLeft()
-    elif to.halign in [2, 'right']:
+    elif halign in [2, 'right']:
         p.SetJustificationToRight()
-    elif to.halign in [1, 'center']:
+    elif halign in [1, 'center']:
         p.SetJustificationToCentered()
 
-    p.SetOrientation(-to.angle)
+    p.SetOrientation(angle)
 
-    if to.valign in [0, 'top']:
+    if valign in [0, 'top']:
         p.SetVerticalJustificationToTop()
-    elif to.valign in [2, 'half']:
+    elif valign in [2, 'half']:
         p.SetVerticalJustificationToCentered()
-    elif to.valign in [4, 'bottom']:
+    elif valign in [4, 'bottom']:
         p.SetVerticalJustificationToBottom()
-    elif to.valign in [1, 'cap']:
+    elif valign in [1, 'cap']:
         warnings.warn("VTK does not support 'cap' align, using 'top'")
         p.SetVerticalJustificationToTop()
-    elif to.valign in [3, 'base']:
+    elif valign in [3, 'base']:
         warnings.warn("VTK does not support 'base' align, using 'bottom'")
         p.SetVerticalJustificationToBottom()
     p.SetFontFamily(vtk.VTK_FONT_FILE)
-    p.SetFontFile(vcs.elements["font"][vcs.elements["fontNumber"][tt.font]])
-    p.SetFontSize(int(to.height * winSize[1] / 800.))
+    p.SetFontFile(fontFile)
+    p.SetFontSize(fontSize)
+
+
+def prepTextProperty(p, winSize, to="default", tt="default", cmap=None,
+                     overrideColorIndex=None):
+    applyTextPropertyValues(p, textPropertyValues(winSize, to, tt, cmap, overrideColorIndex))
+
+
+# Text properties and extents shared by all the canvases
+textCache = textcache.TextCache()
 
 
 class TextActorWrapperItem(object):
@@ -1445,7 +1900,9 @@ class TextActorWrapperItem(object):
 
 # def genTextActor(renderer, string=None, x=None, y=None,
 def genTextActor(contextArea, string=None, x=None, y=None,
-                 to='default', tt='default', cmap=None, geoBounds=None, geo=None):
+                 to='default', tt='default', cmap=None, geoBounds=None, geo=None, pool=None):
+    '''Adds a text actor per string to contextArea, the actors are taken
+    from pool (a textcache.TextActorPool) if it is passed'''
 
     renderer = contextArea.GetDrawAreaItem().GetScene().GetRenderer()
 
@@ -1478,10 +1935,15 @@ def genTextActor(contextArea, string=None, x=None, y=None,
         else:
             wc = None
 
+    prop = textCache.textProperty(textPropertyValues(sz, to, tt, cmap), applyTextPropertyValues)
     for i in range(n):
-        t = vtk.vtkTextActor()
-        p = t.GetTextProperty()
-        prepTextProperty(p, sz, to, tt, cmap)
+        if pool is None:
+            t = vtk.vtkTextActor()
+            item = vtk.vtkPythonItem()
+            item.SetPythonObject(TextActorWrapperItem(t))
+        else:
+            t, item = pool.acquire()
+        t.GetTextProperty().ShallowCopy(prop)
         pts = vtk.vtkPoints()
         pts.InsertNextPoint(x[i], y[i], 0.)
         if vcs.elements["projection"][tt.projection].type != "linear":
@@ -1508,8 +1970,6 @@ def genTextActor(contextArea, string=None, x=None, y=None,
         t.SetPosition(X, Y)
         t.SetInput(string[i])
 
-        item = vtk.vtkPythonItem()
-        item.SetPythonObject(TextActorWrapperItem(t))
         contextArea.GetDrawAreaItem().AddItem(item)
 
         actors.append(t)
@@ -1517,13 +1977,62 @@ def genTextActor(contextArea, string=None, x=None, y=None,
     return actors
 
 
+def nestCoordinates(values):
+    '''Returns the coordinates values of a primitive as a list with one
+    sequence (list, tuple or numpy array) per line, polygon or marker group'''
+    if isinstance(values, numpy.ndarray):
+        if values.ndim > 1:
+            return list(values)
+        return [values, ]
+    if not isinstance(values[0], (list, tuple, numpy.ndarray)):
+        return [values, ]
+    return values
+
+
+def extendCoordinates(x, y):
+    '''Extends the shorter of x and y with its last value, lists are
+    extended in place. Returns x and y as numpy arrays of floats'''
+    n = max(len(x), len(y))
+    extended = []
+    for a in [x, y]:
+        if len(a) < n:
+            if isinstance(a, list):
+                a.extend([a[-1]] * (n - len(a)))
+            else:
+                a = numpy.concatenate((a, numpy.repeat(a[-1:], n - len(a))))
+        extended.append(numpy.asarray(a, dtype=numpy.float64))
+    return extended
+
+
+def numpyToPoints(x, y):
+    '''Returns vtkPoints in the z=0 plane made from the x and y arrays'''
+    xyz = numpy.zeros((len(x), 3), dtype=numpy.float32)
+    xyz[:, 0] = x
+    xyz[:, 1] = y
+    pts = vtk.vtkPoints()
+    pts.SetData(numpy_to_vtk_wrapper(xyz, deep=True))
+    return pts
+
+
+def segmentsCellArray(sizes):
+    '''Returns a vtkCellArray of the two point lines joining consecutive
+    points of polylines stored one after the other, sizes being the number
+    of points of each polyline'''
+    ends = numpy.cumsum(numpy.asarray(sizes, dtype=vtkIdTypeCode))
+    isFirst = numpy.ones(ends[-1] if len(ends) else 0, dtype=bool)
+    isFirst[ends[ends > 0] - 1] = False
+    firsts = numpy.flatnonzero(isFirst)
+    connectivity = numpy.column_stack((firsts, firsts + 1)).ravel()
+    offsets = numpy.arange(0, len(connectivity) + 1, 2)
+    return numpyToVTKCellArray(offsets, connectivity)
+
+
 def prepPrimitive(prim):
     if prim.x is None or prim.y is None:
         return 0
-    if not isinstance(prim.x[0], (list, tuple)):
-        prim.x = [prim.x, ]
-    if not isinstance(prim.y[0], (list, tuple)):
-        prim.y = [prim.y, ]
+    # coordinates were validated when set, skip the setters
+    prim._x = nestCoordinates(prim.x)
+    prim._y = nestCoordinates(prim.y)
     if vcs.isfillarea(prim):
         atts = ["x", "y", "color", "style", "index"]
     elif vcs.ismarker(prim):
@@ -1535,9 +2044,10 @@ def prepPrimitive(prim):
         n = max(n, len(getattr(prim, a)))
     for a in atts:
         v = getattr(prim, a)
-        while len(v) < n:
-            v.append(v[-1])
-        setattr(prim, a, v)
+        if len(v) < n:
+            v.extend([v[-1]] * (n - len(v)))
+        if a not in ["x", "y"]:
+            setattr(prim, a, v)
 
     # Handle fillarea opacity case, where the default will depend on the style
     if vcs.isfillarea(prim):
@@ -1649,14 +2159,10 @@ def prepFillarea(context, renWin, farea, cmap=None):
         for a in [x, y]:
             assert(len(a) == N)
 
-        polygon = vtk.vtkPolygon()
         # Add current polygon
-        pid = polygon.GetPointIds()
-        pid.SetNumberOfIds(N)
-
-        for j in range(N):
-            pid.SetId(j, points.InsertNextPoint(x[j], y[j], 0.))
-        cellId = polys.InsertNextCell(polygon)
+        offset = points.GetNumberOfPoints()
+        points.InsertPoints(offset, N, 0, numpyToPoints(x, y))
+        cellId = polys.InsertNextCell(N, numpy.arange(offset, offset + N, dtype=vtkIdTypeCode))
 
         if isinstance(c, int):
             color = [C for C in cmap.index[c]]
@@ -1980,17 +2486,9 @@ def prepMarker(marker, screenGeom, scale=None, cmap=None):
     for i in range(n):
         g = vtk.vtkGlyph2D()
         markers = vtk.vtkPolyData()
-        x = marker.x[i]
-        y = marker.y[i]
+        x, y = extendCoordinates(marker.x[i], marker.y[i])
         c = marker.color[i]
-        N = max(len(x), len(y))
-        for a in [x, y]:
-            while len(a) < n:
-                a.append(a[-1])
-        pts = vtk.vtkPoints()
-        for j in range(N):
-            pts.InsertNextPoint(x[j], y[j], 0.)
-        geo, pts = project(pts, marker.projection, marker.worldcoordinate)
+        geo, pts = project(numpyToPoints(x, y), marker.projection, marker.worldcoordinate)
         markers.SetPoints(pts)
 
         if scale:
@@ -2013,32 +2511,13 @@ def prepMarker(marker, screenGeom, scale=None, cmap=None):
 
         vtk_color = getMarkerColor(marker, c, cmap)
 
-        colors = vtk.vtkUnsignedCharArray()
-        colors.SetName('Colors')
-        colors.SetNumberOfComponents(4)
-
-        for j in range(numCells):
-            colors.InsertNextTypedTuple(vtk_color)
-
-        cellData.AddArray(colors)
+        cellData.AddArray(generateSolidColorArray(numCells, vtk_color, 'Colors'))
 
         actors.append((glyphs, pd, geo))
 
     return actors
 
 
-def __build_ld__():
-    pts = vtk.vtkPoints()
-    lines = vtk.vtkCellArray()
-    linePolyData = vtk.vtkPolyData()
-    linePolyData.SetPoints(pts)
-    linePolyData.SetLines(lines)
-    colors = vtk.vtkUnsignedCharArray()
-    colors.SetNumberOfComponents(4)
-    colors.SetName("Colors")
-    return pts, lines, linePolyData, colors
-
-
 def stippleLine(prop, line_type):
     if line_type == 'long-dash':
         prop.SetLineStipplePattern(int('0000111111111111', 2))
@@ -2139,10 +2618,14 @@ def prepLine(plotsContext, line, geoBounds=None, cmap=None):
     if isinstance(cmap, str):
         cmap = vcs.elements["colormap"][cmap]
 
+    projectionType = vcs.elements["projection"][line.projection].type
+    if projectionType in round_projections:
+        NPointsInterp = 50
+    else:
+        NPointsInterp = 25
+
     for i in range(number_lines):
 
-        x = line.x[i]
-        y = line.y[i]
         if isinstance(line.color[i], int):
             c = cmap.index[line.color[i]]
         else:
@@ -2150,57 +2633,41 @@ def prepLine(plotsContext, line, geoBounds=None, cmap=None):
         w = line.width[i]
         t = line.type[i]
 
-        if (t, w) not in line_data:
-            line_data[(t, w)] = __build_ld__()
-        pts, lines, linesPoly, colors = line_data[(t, w)]
-        vtk_color = [int(component / 100. * 255) for component in c]
-
-        number_points = max(len(x), len(y))
-
-        point_offset = pts.GetNumberOfPoints()
         # Extend x or y to the length of the other by duplicating the last
         # coord.
-        for a in [x, y]:
-            while len(a) < number_points:
-                a.append(a[-1])
+        x, y = extendCoordinates(line.x[i], line.y[i])
+        if len(x) == 0:
+            continue
 
-        if vcs.elements["projection"][line.projection].type == "linear":
-            for j in range(number_points):
-                pts.InsertNextPoint(x[j], y[j], 0.)
-            n2 = number_points - 1
-        else:
-            pts.InsertNextPoint(x[0], y[0], 0.)
-            n2 = 0
-            for j in range(1, number_points):
-                if vcs.elements["projection"][
-                        line.projection].type in round_projections:
-                    NPointsInterp = 50
-                else:
-                    NPointsInterp = 25
-                for i in range(1, NPointsInterp + 1):
-                    if x[j] != x[j - 1]:
-                        tmpx = x[j - 1] + \
-                            float(i) / NPointsInterp * (x[j] - x[j - 1])
-                    else:
-                        tmpx = x[j]
-                    if y[j] != y[j - 1]:
-                        tmpy = y[j - 1] + \
-                            float(i) / NPointsInterp * (y[j] - y[j - 1])
-                    else:
-                        tmpy = y[j]
-                    pts.InsertNextPoint(tmpx, tmpy, 0.)
-                    n2 += 1
-        for j in range(n2):
-            colors.InsertNextTypedTuple(vtk_color)
-            ln_tmp = vtk.vtkLine()
-            ln_tmp.GetPointIds().SetId(0, j + point_offset)
-            ln_tmp.GetPointIds().SetId(1, j + point_offset + 1)
-            lines.InsertNextCell(ln_tmp)
+        # xs, ys, number of points and color of each line
+        if (t, w) not in line_data:
+            line_data[(t, w)] = ([], [], [], [])
+        xs, ys, sizes, colors = line_data[(t, w)]
+        vtk_color = [int(component / 100. * 255) for component in c]
 
-    for t, w in line_data:
-        pts, _, linesPoly, colors = line_data[(t, w)]
+        if projectionType != "linear" and len(x) > 1:
+            # NPointsInterp points on each segment, ending at its last point
+            fractions = numpy.arange(1, NPointsInterp + 1) / float(NPointsInterp)
+            x = numpy.concatenate((x[:1], (x[:-1, None] + fractions * numpy.diff(x)[:, None]).ravel()))
+            y = numpy.concatenate((y[:1], (y[:-1, None] + fractions * numpy.diff(y)[:, None]).ravel()))
+        xs.append(x)
+        ys.append(y)
+        sizes.append(len(x))
+        colors.append(vtk_color)
 
+    for t, w in line_data:
+        xs, ys, sizes, lineColors = line_data[(t, w)]
+
+        linesPoly = vtk.vtkPolyData()
+        linesPoly.SetLines(segmentsCellArray(sizes))
+        # one color per segment
+        colors = numpy_to_vtk_wrapper(
+            numpy.repeat(numpy.array(lineColors, dtype=numpy.uint8),
+                         numpy.array(sizes) - 1, axis=0),
+            deep=True, array_type=vtk.VTK_UNSIGNED_CHAR)
+        colors.SetName("Colors")
         linesPoly.GetCellData().SetScalars(colors)
+        pts = numpyToPoints(numpy.concatenate(xs), numpy.concatenate(ys))
         geoTransform, pts = project(pts, line.projection, line.worldcoordinate)
         linesPoly.SetPoints(pts)
 
@@ -2345,6 +2812,52 @@ def generateVectorArray(data1, data2):
     return w
 
 
+def vectorNorms(vectors):
+    '''
+    Returns the numpy array of the norms of 'vectors' (vtkDataArray).
+    '''
+    values = VN.vtk_to_numpy(vectors).reshape((vectors.GetNumberOfTuples(), -1))
+    return numpy.sqrt(numpy.einsum("ij,ij->i", values, values, dtype=numpy.float64))
+
+
+def linearVectorScalars(vectors, minNorm, oldRange, newRangeValues):
+    '''
+    Returns a vtkDoubleArray with the norms of 'vectors' (vtkDataArray)
+    linearly mapped from [minNorm, minNorm + oldRange] to newRangeValues.
+    '''
+    norms = vectorNorms(vectors)
+    newRange = newRangeValues[1] - newRangeValues[0]
+    scalars = ((norms - minNorm) * newRange) / oldRange + newRangeValues[0]
+    return numpy_to_vtk_wrapper(scalars.astype(numpy.float64), deep=True,
+                                array_type=vtk.VTK_DOUBLE)
+
+
+def updateVectorArray(grid, data1, data2, geo=None):
+    '''
+    Replaces the "vector" array of 'grid' (created by genGrid) with the
+    vectors made from 'data1' and 'data2', projecting them with 'geo'
+    if not None.
+    '''
+    vectors = numpy.zeros((numpy.ma.size(data1), 3))
+    vectors[:, 0] = numpy.ma.ravel(data1)
+    vectors[:, 1] = numpy.ma.ravel(data2)
+    attributes = grid.GetPointData()
+    pedigreeIds = attributes.GetPedigreeIds()
+    if pedigreeIds is not None:
+        vectors = vectors[VN.vtk_to_numpy(pedigreeIds)]
+    if geo is not None and attributes.GetArray("lonlat") is not None:
+        newVector = projectVectors(VN.vtk_to_numpy(attributes.GetArray("lonlat")),
+                                   vectors,
+                                   VN.vtk_to_numpy(grid.GetPoints().GetData()),
+                                   geo)
+    else:
+        newVector = numpy_to_vtk_wrapper(vectors, deep=False)
+        newVector.SetName("vector")
+    attributes.AddArray(newVector)
+    attributes.SetActiveVectors("vector")
+    grid.Modified()
+
+
 def vtkIterate(iterator):
     iterator.InitTraversal()
     obj = iterator.GetNextItemAsObject()
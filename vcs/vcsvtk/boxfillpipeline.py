@@ -159,6 +159,7 @@ class BoxfillPipeline(Pipeline2D):
                 if deleteColors:
                     mappedColors.FastDelete()
                 area.GetDrawAreaItem().AddItem(item)
+                self._addItemSource(item, mapper, self._needsCellData)
 
                 if mapper is self._maskedDataMapper:
                     actors.append([item, self._maskedDataMapper, plotting_dataset_bounds])
@@ -166,7 +167,7 @@ class BoxfillPipeline(Pipeline2D):
                     actors.append([item, plotting_dataset_bounds])
 
             if mapper is not self._maskedDataMapper:
-                if self._gm.boxfill_type == "custom":
+                if self._gm.boxfill_type == "custom" and _style != "solid":
                     # Patterns/hatches creation for custom boxfill plots
                     patact = None
 
@@ -228,7 +229,7 @@ class BoxfillPipeline(Pipeline2D):
             kwargs["ratio_autot_viewport"] = vp
         self._resultDict.update(self._context().renderTemplate(
             self._template,
-            self._data1,
+            self._fullData1,
             self._gm, t, z, **kwargs))
 
         if getattr(self._gm, "legend", None) is not None:
@@ -347,17 +348,22 @@ class BoxfillPipeline(Pipeline2D):
 
         style = self._gm.fillareastyle
 
+        if style == 'solid':
+            mapper, geoFilter = self._createSolidLevelsMapper(tmpLevels, tmpColors, tmpOpacities)
+            self._mappers.append(mapper)
+            self._resultDict["vtk_backend_luts"] = [[mapper.GetLookupTable(), [0, mapper.GetScalarRange()[1], False]]]
+            self._resultDict["vtk_backend_geofilters"] = [geoFilter]
+            return
+
         luts = []
         geos = []
         wholeDataMin, wholeDataMax = vcs.minmax(self._originalData1)
-        _colorMap = self.getColorMap()
         for i, l in enumerate(tmpLevels):
             # Ok here we are trying to group together levels can be, a join
             # will happen if: next set of levels continues where one left off
             # AND pattern is identical
-
-            # TODO this should really just be a single polydata/mapper/actor:
-            for j, color in enumerate(tmpColors[i]):
+            # Each level is split out for its pattern
+            for j in range(len(tmpColors[i])):
                 mapper = vtk.vtkPolyDataMapper()
                 lut = vtk.vtkLookupTable()
                 th = vtk.vtkThreshold()
@@ -371,16 +377,8 @@ class BoxfillPipeline(Pipeline2D):
                 geos.append(geoFilter2)
                 mapper.SetInputConnection(geoFilter2.GetOutputPort())
                 lut.SetNumberOfTableValues(1)
-                r, g, b, a = self.getColorIndexOrRGBA(_colorMap, color)
-                if style == 'solid':
-                    tmpOpacity = tmpOpacities[j]
-                    if tmpOpacity is None:
-                        tmpOpacity = a / 100.
-                    else:
-                        tmpOpacity = tmpOpacities[j] / 100.
-                    lut.SetTableValue(0, r / 100., g / 100., b / 100., tmpOpacity)
-                else:
-                    lut.SetTableValue(0, 1., 1., 1., 0.)
+                # the pattern is drawn separately
+                lut.SetTableValue(0, 1., 1., 1., 0.)
                 mapper.SetLookupTable(lut)
                 mapper.SetScalarRange(l[j], l[j + 1])
                 luts.append([lut, [l[j], l[j + 1], False]])
@@ -0,0 +1,116 @@
+import hashlib
+import os
+import tempfile
+import numpy
+
+import vcs
+
+# Continents outlines already loaded in this process, indexed by
+# (absolute path, modification time, size) of the ascii file.
+_loaded = {}
+
+
+def readContinents(fnm):
+    """Parse a vcs ascii continents file.
+
+    Returns (lat, lon, offsets): the coordinates of all the points and
+    the offsets of each line in these arrays (len(offsets) is the number
+    of lines + 1).
+    """
+    values = []
+    offsets = [0]
+    with open(fnm) as f:
+        ln = f.readline()
+        while ln.strip().split() != ["-99", "-99"]:
+            # Many lines, need to know number of points
+            N = int(ln.split()[0])
+            n = 0
+            while n < N:
+                ln = str(f.readline())
+                sp = ln.split()
+                sn = len(sp)
+                didIt = False
+                if sn % 2 == 0:
+                    try:
+                        values.extend([float(v) for v in sp])
+                        n += sn
+                        didIt = True
+                    except Exception:
+                        didIt = False
+                if didIt is False:
+                    # fixed width fields, that may not be separated
+                    while len(ln) > 2:
+                        values.append(float(ln[:8]))
+                        values.append(float(ln[8:16]))
+                        ln = ln[16:]
+                        n += 2
+            offsets.append(offsets[-1] + N // 2)
+            ln = f.readline()
+    values = numpy.array(values, dtype=numpy.float64).reshape((-1, 2))
+    return values[:, 0].copy(), values[:, 1].copy(), numpy.array(offsets, dtype=numpy.int64)
+
+
+def cacheDirectory():
+    """Directory where the binary continents files are stored."""
+    dotdir, dotdirenv = vcs.getdotdirectory()
+    return os.path.join(os.path.expanduser("~"),
+                        os.environ.get(dotdirenv, dotdir),
+                        "continents")
+
+
+def cachePath(fnm):
+    """Binary cache file used for the ascii continents file fnm."""
+    path = os.path.abspath(fnm)
+    key = hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cacheDirectory(),
+                        "%s-%s.npz" % (os.path.basename(path), key))
+
+
+def _writeCache(cache, lat, lon, offsets, stat):
+    directory = os.path.dirname(cache)
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    # write then rename, so concurrent processes never read a partial file
+    fd, tmp = tempfile.mkstemp(suffix=".npz", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            numpy.savez(f, lat=lat, lon=lon, offsets=offsets,
+                        source=numpy.array([stat.st_mtime, stat.st_size]))
+        os.rename(tmp, cache)
+    except Exception:
+        os.remove(tmp)
+        raise
+
+
+def loadContinents(fnm):
+    """Returns (lat, lon, offsets) for continents file fnm (see readContinents).
+
+    The parsed outlines are stored in a binary file in cacheDirectory(),
+    regenerated when the ascii file changes, and kept in memory for the
+    process lifetime. The returned arrays must not be modified.
+    """
+    path = os.path.abspath(fnm)
+    stat = os.stat(path)
+    key = (path, stat.st_mtime, stat.st_size)
+    if key in _loaded:
+        return _loaded[key]
+    cache = cachePath(path)
+    result = None
+    try:
+        with numpy.load(cache) as npz:
+            if npz["source"].tolist() == [stat.st_mtime, stat.st_size]:
+                result = npz["lat"], npz["lon"], npz["offsets"]
+    except Exception:
+        # no (valid) cache yet
+        pass
+    if result is None:
+        result = readContinents(path)
+        try:
+            _writeCache(cache, result[0], result[1], result[2], stat)
+        except Exception:
+            # read-only home, full disk...: simply parse again next time
+            pass
+    for array in result:
+        array.flags.writeable = False
+    _loaded[key] = result
+    return result
@@ -0,0 +1,114 @@
+import collections
+import hashlib
+import numpy
+
+
+def fingerprint(*parts):
+    """Return a hash string for parts made of numpy arrays and python values.
+
+    Arrays are hashed by content (shape, type and data), anything else by its
+    repr.
+    """
+    sha = hashlib.sha1()
+    for part in parts:
+        if isinstance(part, numpy.ndarray):
+            part = numpy.ascontiguousarray(numpy.ma.getdata(part))
+            sha.update(repr((part.shape, part.dtype.str)).encode("utf-8"))
+            sha.update(part.view(numpy.uint8).ravel())
+        else:
+            sha.update(repr(part).encode("utf-8"))
+        sha.update(b"|")
+    return sha.hexdigest()
+
+
+class DataSetCache(object):
+
+    """Least recently used cache of VTK data objects bounded by memory.
+
+    Entries are stored and returned as deep copies, so callers are free to
+    modify what they get (add arrays, blank or delete cells...) without
+    altering the cached data.
+
+    Attributes:
+        - maxMemory: Maximum memory (in bytes) used by the cached data
+            objects. Least recently used entries are evicted beyond it.
+            Setting it to 0 disables the cache.
+        - hits, misses, evictions: Counters since the last reset.
+    """
+
+    def __init__(self, maxMemory=256 * 1024 * 1024):
+        self._entries = collections.OrderedDict()
+        self._memory = 0
+        self.maxMemory = maxMemory
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    @property
+    def memory(self):
+        """Memory (in bytes) used by the cached data objects."""
+        return self._memory
+
+    def get(self, key):
+        """Return (dataObject copy, extra) stored for key or None.
+
+        A key of None is never cached.
+        """
+        if key is None or self.maxMemory <= 0:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        dataObject, extra, size = entry
+        copy = dataObject.NewInstance()
+        copy.DeepCopy(dataObject)
+        return copy, extra
+
+    def put(self, key, dataObject, extra=None):
+        """Store a copy of dataObject (and extra python data) under key."""
+        if key is None or self.maxMemory <= 0:
+            return
+        copy = dataObject.NewInstance()
+        copy.DeepCopy(dataObject)
+        # GetActualMemorySize returns kibibytes
+        size = copy.GetActualMemorySize() * 1024
+        if size > self.maxMemory:
+            return
+        self.remove(key)
+        self._entries[key] = (copy, extra, size)
+        self._memory += size
+        while self._memory > self.maxMemory:
+            _, (_, _, evictedSize) = self._entries.popitem(last=False)
+            self._memory -= evictedSize
+            self.evictions += 1
+
+    def remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._memory -= entry[2]
+
+    def clear(self):
+        """Empty the cache and reset the counters."""
+        self._entries.clear()
+        self._memory = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self):
+        """Return the cache counters as a dictionary."""
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "memory": self._memory,
+                "maxMemory": self.maxMemory}
@@ -18,6 +18,48 @@ class IsofillPipeline(Pipeline2D):
     def _updateContourLevelsAndColors(self):
         self._updateContourLevelsAndColorsGeneric()
 
+    def _createBatchedBandMappers(self, tmpLevels, tmpColors, tmpOpacities, style):
+        """Contours the values of all the groups of levels prepared by
+        _prepContours with a single banded contour filter.
+
+        Each band gets the index of its level (vcs2vtk.levelIndexFilter),
+        the solid style draws all the levels with one mapper, the other
+        styles get a mapper per group for its pattern.
+        Returns the contour filter, the mappers and their lookup tables.
+        """
+        values = sorted(set(v for group in tmpLevels for v in group))
+        cot = vtk.vtkBandedPolyDataContourFilter()
+        cot.ClippingOn()
+        # the band scalars are their lower values instead of an index
+        # that depends on the data range
+        cot.SetScalarModeToValue()
+        cot.SetInputData(self._vtkDataSetFittedToViewport)
+        cot.SetNumberOfContours(len(values))
+        cot.SetClipTolerance(0.)
+        for j, v in enumerate(values):
+            cot.SetValue(j, v)
+        self._timeFilter(cot, "contour")
+
+        levels, colors = self._solidLevelsAndColors(tmpLevels, tmpColors, tmpOpacities)
+        levelFilter = vcs2vtk.levelIndexFilter(levels, values)
+        levelFilter.SetInputConnection(cot.GetOutputPort())
+        self._timeFilter(levelFilter, "levelIndex")
+        self._resultDict["vtk_backend_level_filter"] = levelFilter
+
+        mappers = []
+        if style == 'solid':
+            mappers.append(self._createLevelsMapper(levelFilter, colors)[0])
+        else:
+            # the patterns are drawn over transparent bands
+            colors = [[1., 1., 1., 0.]] * len(levels)
+            first = 0
+            for group in tmpLevels:
+                last = first + len(group) - 2
+                mappers.append(self._createLevelsMapper(levelFilter, colors, first, last)[0])
+                first = last + 1
+        luts = [[mapper.GetLookupTable(), [0, len(levels), False]] for mapper in mappers]
+        return cot, mappers, luts
+
     def _plotInternal(self):
         """Overrides baseclass implementation."""
         preppedCountours = self._prepContours()
@@ -36,47 +78,54 @@ class IsofillPipeline(Pipeline2D):
         x1, x2, y1, y2 = plotting_dataset_bounds
         fareapixelspacing, fareapixelscale = self._patternSpacingAndScale()
 
-        for i, l in enumerate(tmpLevels):
-            # Ok here we are trying to group together levels can be, a join
-            # will happen if: next set of levels continues where one left off
-            # AND pattern is identical
-            mapper = vtk.vtkPolyDataMapper()
-            lut = vtk.vtkLookupTable()
-            cot = vtk.vtkBandedPolyDataContourFilter()
-            cot.ClippingOn()
-            # cot.SetInputData(self._vtkPolyDataFilter.GetOutput())
-            cot.SetInputData(self._vtkDataSetFittedToViewport)
-            cot.SetNumberOfContours(len(l))
-            cot.SetClipTolerance(0.)
-            for j, v in enumerate(l):
-                cot.SetValue(j, v)
-            cot.Update()
-
+        if len(tmpLevels) > 1:
+            # non contiguous levels or several patterns: contour all the
+            # values in one pass and split the bands by level
+            cot, mappers, luts = self._createBatchedBandMappers(tmpLevels, tmpColors, tmpOpacities, style)
             cots.append(cot)
-            mapper.SetInputConnection(cot.GetOutputPort())
-            lut.SetNumberOfTableValues(len(tmpColors[i]))
-            for j, color in enumerate(tmpColors[i]):
-                r, g, b, a = self.getColorIndexOrRGBA(_colorMap, color)
-                if style == 'solid':
-                    tmpOpacity = tmpOpacities[j]
-                    if tmpOpacity is None:
-                        tmpOpacity = a / 100.
+        else:
+            for i, l in enumerate(tmpLevels):
+                # Ok here we are trying to group together levels can be, a join
+                # will happen if: next set of levels continues where one left off
+                # AND pattern is identical
+                mapper = vtk.vtkPolyDataMapper()
+                lut = vtk.vtkLookupTable()
+                cot = vtk.vtkBandedPolyDataContourFilter()
+                cot.ClippingOn()
+                # cot.SetInputData(self._vtkPolyDataFilter.GetOutput())
+                cot.SetInputData(self._vtkDataSetFittedToViewport)
+                cot.SetNumberOfContours(len(l))
+                cot.SetClipTolerance(0.)
+                for j, v in enumerate(l):
+                    cot.SetValue(j, v)
+                self._timeFilter(cot, "contour")
+                cot.Update()
+
+                cots.append(cot)
+                mapper.SetInputConnection(cot.GetOutputPort())
+                lut.SetNumberOfTableValues(len(tmpColors[i]))
+                for j, color in enumerate(tmpColors[i]):
+                    r, g, b, a = self.getColorIndexOrRGBA(_colorMap, color)
+                    if style == 'solid':
+                        tmpOpacity = tmpOpacities[j]
+                        if tmpOpacity is None:
+                            tmpOpacity = a / 100.
+                        else:
+                            tmpOpacity = tmpOpacities[j] / 100.
+                        lut.SetTableValue(j, r / 100., g / 100., b / 100., tmpOpacity)
                     else:
-                        tmpOpacity = tmpOpacities[j] / 100.
-                    lut.SetTableValue(j, r / 100., g / 100., b / 100., tmpOpacity)
-                else:
-                    lut.SetTableValue(j, 1., 1., 1., 0.)
-            luts.append([lut, [0, len(l) - 1, True]])
-            mapper.SetLookupTable(lut)
-            minRange = 0
-            maxRange = len(l) - 1
-            if (i == 0 and self._scalarRange[0] < l[0]):
-                # band 0 is from self._scalarRange[0] to l[0]
-                # we don't show band 0
-                minRange += 1
-            mapper.SetScalarRange(minRange, maxRange)
-            mapper.SetScalarModeToUseCellData()
-            mappers.append(mapper)
+                        lut.SetTableValue(j, 1., 1., 1., 0.)
+                luts.append([lut, [0, len(l) - 1, True]])
+                mapper.SetLookupTable(lut)
+                minRange = 0
+                maxRange = len(l) - 1
+                if (i == 0 and self._scalarRange[0] < l[0]):
+                    # band 0 is from self._scalarRange[0] to l[0]
+                    # we don't show band 0
+                    minRange += 1
+                mapper.SetScalarRange(minRange, maxRange)
+                mapper.SetScalarModeToUseCellData()
+                mappers.append(mapper)
 
         self._resultDict["vtk_backend_luts"] = luts
         if len(cots) > 0:
@@ -174,6 +223,7 @@ class IsofillPipeline(Pipeline2D):
                 if deleteColors:
                     mappedColors.FastDelete()
                 area.GetDrawAreaItem().AddItem(item)
+                self._addItemSource(item, mapper, True)
 
             if mapper is self._maskedDataMapper:
                 actors.append([item, self._maskedDataMapper, plotting_dataset_bounds])
@@ -234,7 +284,7 @@ class IsofillPipeline(Pipeline2D):
             kwargs["ratio_autot_viewport"] = vp
         self._resultDict.update(self._context().renderTemplate(
             self._template,
-            self._data1,
+            self._fullData1,
             self._gm, t, z, **kwargs))
         legend = getattr(self._gm, "legend", None)
 
@@ -146,23 +146,48 @@ class IsolinePipeline(Pipeline2D):
 
         vcs2vtk.configureContextArea(area, drawAreaBounds, geom)
 
-        # FIXME: This render call is needed to work around a bug somewhere in the
-        # FIXME: vtkContextTransform code, where the transformation represented by
-        # FIXME: Map[To|From]Scene() isn't set up properly until after a render call.
-        self._context().renWin.Render()
+        groupFilter = None
+        if len(tmpLevels) > 1:
+            # contour all the values in one pass, the lines of each group
+            # of width and type are extracted from the contour output
+            cot = vtk.vtkContourFilter()
+            cot.SetInputData(self._vtkDataSetFittedToViewport)
+            values = [v for group in tmpLevels for v in group]
+            cot.SetNumberOfContours(len(values))
+            for n, v in enumerate(values):
+                cot.SetValue(n, v)
+            self._timeFilter(cot, "contour")
+            groupFilter = vcs2vtk.contourGroupFilter(tmpLevels)
+            groupFilter.SetInputConnection(cot.GetOutputPort())
+            self._timeFilter(groupFilter, "levelGroup")
+            self._resultDict["vtk_backend_level_filter"] = groupFilter
+            cots.append(cot)
 
         for i, l in enumerate(tmpLevels):
             numLevels = len(l)
 
-            cot = vtk.vtkContourFilter()
+            if groupFilter is None:
+                cot = vtk.vtkContourFilter()
 
-            cot.SetInputData(self._vtkDataSetFittedToViewport)
-            cot.SetNumberOfContours(numLevels)
+                cot.SetInputData(self._vtkDataSetFittedToViewport)
+                cot.SetNumberOfContours(numLevels)
 
-            for n in range(numLevels):
-                cot.SetValue(n, l[n])
-            # TODO remove update
-            cot.Update()
+                for n in range(numLevels):
+                    cot.SetValue(n, l[n])
+                self._timeFilter(cot, "contour")
+                # TODO remove update
+                cot.Update()
+                cots.append(cot)
+                contours = cot
+            else:
+                th = vtk.vtkThreshold()
+                th.SetInputConnection(groupFilter.GetOutputPort())
+                th.SetInputArrayToProcess(0, 0, 0, vtk.vtkDataObject.FIELD_ASSOCIATION_CELLS, "levelGroup")
+                th.ThresholdBetween(i, i)
+                self._timeFilter(th, "threshold")
+                contours = vtk.vtkDataSetSurfaceFilter()
+                contours.SetInputConnection(th.GetOutputPort())
+                self._timeFilter(contours, "surface")
 
             lut = vtk.vtkLookupTable()
             lut.SetNumberOfTableValues(len(tmpColors[i]))
@@ -264,13 +289,13 @@ class IsolinePipeline(Pipeline2D):
             pdMapper.SetScalarModeToUsePointData()
 
             stripper = vtk.vtkStripper()
-            stripper.SetInputConnection(cot.GetOutputPort())
+            stripper.SetInputConnection(contours.GetOutputPort())
+            self._timeFilter(stripper, "stripper")
             mapper.SetInputConnection(stripper.GetOutputPort())
             # TODO remove update, make pipeline
             stripper.Update()
             poly = stripper.GetOutput()
             mappers.append(mapper)
-            cots.append(cot)
 
             if self._needsCellData:
                 attrs = poly.GetCellData()
@@ -299,6 +324,7 @@ class IsolinePipeline(Pipeline2D):
             item.SetMappedColors(mappedColors)
             mappedColors.FastDelete()
             area.GetDrawAreaItem().AddItem(item)
+            self._addItemSource(item, mapper, self._needsCellData)
 
             actors.append([item, plotting_dataset_bounds])
 
@@ -319,15 +345,13 @@ class IsolinePipeline(Pipeline2D):
 
             self._maskedDataMapper.Update()
             maskedData = self._maskedDataMapper.GetInput()
-            maskedColors = vtk.vtkUnsignedCharArray()
-            maskedColors.SetNumberOfComponents(4)
-            for i in range(poly.GetNumberOfCells()):
-                maskedColors.InsertNextTypedTuple([0, 0, 0, 255])
+            maskedColors = vcs2vtk.generateSolidColorArray(maskedData.GetNumberOfCells(), [0, 0, 0, 255])
             maskItem = vtk.vtkPolyDataItem()
             maskItem.SetPolyData(maskedData)
             maskItem.SetScalarMode(vtk.VTK_SCALAR_MODE_USE_CELL_DATA)
             maskItem.SetMappedColors(maskedColors)
             area.GetDrawAreaItem().AddItem(maskItem)
+            self._addItemSource(maskItem, self._maskedDataMapper, True, [0, 0, 0, 255])
 
             actors.append([maskItem, self._maskedDataMapper, plotting_dataset_bounds])
 
@@ -351,7 +375,7 @@ class IsolinePipeline(Pipeline2D):
             kwargs["ratio_autot_viewport"] = vp
         self._resultDict.update(self._context().renderTemplate(
             self._template,
-            self._data1,
+            self._fullData1,
             self._gm, t, z, **kwargs))
 
         projection = vcs.elements["projection"][self._gm.projection]
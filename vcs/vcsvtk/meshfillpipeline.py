@@ -59,45 +59,41 @@ class MeshfillPipeline(Pipeline2D):
         x1 = _func(x1)
         x2 = _func(x2)
         _colorMap = self.getColorMap()
-        for i, l in enumerate(tmpLevels):
-            # Ok here we are trying to group together levels can be, a join
-            # will happen if: next set of levels contnues where one left off
-            # AND pattern is identical
-            # TODO this should really just be a single polydata that is
-            # colored by scalars:
-            for j, color in enumerate(tmpColors[i]):
-                mapper = vtk.vtkPolyDataMapper()
-                lut = vtk.vtkLookupTable()
-                th = vtk.vtkThreshold()
-                th.ThresholdBetween(l[j], l[j + 1])
-                # th.SetInputConnection(self._vtkPolyDataFilter.GetOutputPort())
-                th.SetInputData(self._vtkDataSetFittedToViewport)
-                geoFilter2 = vtk.vtkDataSetSurfaceFilter()
-                geoFilter2.SetInputConnection(th.GetOutputPort())
-                # Make the polydata output available here for patterning later
-                geoFilter2.Update()
-                geos.append(geoFilter2)
-                mapper.SetInputConnection(geoFilter2.GetOutputPort())
-                lut.SetNumberOfTableValues(1)
-                r, g, b, a = self.getColorIndexOrRGBA(_colorMap, color)
-                if style == 'solid':
-                    tmpOpacity = tmpOpacities[j]
-                    if tmpOpacity is None:
-                        tmpOpacity = a / 100.
-                    else:
-                        tmpOpacity = tmpOpacities[j] / 100.
-                    lut.SetTableValue(
-                        0, r / 100., g / 100., b / 100., tmpOpacity)
-                else:
+        if style == 'solid':
+            mapper, geoFilter = self._createSolidLevelsMapper(tmpLevels, tmpColors, tmpOpacities)
+            mappers.append(mapper)
+            luts.append([mapper.GetLookupTable(), [0, mapper.GetScalarRange()[1], True]])
+            geos.append(geoFilter)
+        else:
+            for i, l in enumerate(tmpLevels):
+                # Ok here we are trying to group together levels can be, a join
+                # will happen if: next set of levels contnues where one left off
+                # AND pattern is identical
+                # Each level is split out for its pattern
+                for j in range(len(tmpColors[i])):
+                    mapper = vtk.vtkPolyDataMapper()
+                    lut = vtk.vtkLookupTable()
+                    th = vtk.vtkThreshold()
+                    th.ThresholdBetween(l[j], l[j + 1])
+                    # th.SetInputConnection(self._vtkPolyDataFilter.GetOutputPort())
+                    th.SetInputData(self._vtkDataSetFittedToViewport)
+                    geoFilter2 = vtk.vtkDataSetSurfaceFilter()
+                    geoFilter2.SetInputConnection(th.GetOutputPort())
+                    # Make the polydata output available here for patterning later
+                    geoFilter2.Update()
+                    geos.append(geoFilter2)
+                    mapper.SetInputConnection(geoFilter2.GetOutputPort())
+                    lut.SetNumberOfTableValues(1)
+                    # the pattern is drawn separately
                     lut.SetTableValue(0, 1., 1., 1., 0.)
-                mapper.SetLookupTable(lut)
-                mapper.SetScalarRange(l[j], l[j + 1])
-                luts.append([lut, [l[j], l[j + 1], True]])
-                # Store the mapper only if it's worth it?
-                # Need to do it with the whole slab min/max for animation
-                # purposes
-                if not (l[j + 1] < wholeDataMin or l[j] > wholeDataMax):
-                    mappers.append(mapper)
+                    mapper.SetLookupTable(lut)
+                    mapper.SetScalarRange(l[j], l[j + 1])
+                    luts.append([lut, [l[j], l[j + 1], True]])
+                    # Store the mapper only if it's worth it?
+                    # Need to do it with the whole slab min/max for animation
+                    # purposes
+                    if not (l[j + 1] < wholeDataMin or l[j] > wholeDataMax):
+                        mappers.append(mapper)
 
         self._resultDict["vtk_backend_luts"] = luts
         if len(geos) > 0:
@@ -168,14 +164,11 @@ class MeshfillPipeline(Pipeline2D):
                 item = vtk.vtkPolyDataItem()
                 item.SetPolyData(poly)
 
-                colorArray = vtk.vtkUnsignedCharArray()
-                colorArray.SetNumberOfComponents(4)
-                for i in range(poly.GetNumberOfCells()):
-                    colorArray.InsertNextTypedTuple(wireColor)
-
+                colorArray = vcs2vtk.generateSolidColorArray(poly.GetNumberOfCells(), wireColor)
                 item.SetScalarMode(vtk.VTK_SCALAR_MODE_USE_CELL_DATA)
                 item.SetMappedColors(colorArray)
                 area.GetDrawAreaItem().AddItem(item)
+                self._addItemSource(item, mapper, True, wireColor)
             elif style == "solid":
                 if self._needsCellData:
                     attrs = poly.GetCellData()
@@ -217,6 +210,7 @@ class MeshfillPipeline(Pipeline2D):
                 if deleteColors:
                     mappedColors.FastDelete()
                 area.GetDrawAreaItem().AddItem(item)
+                self._addItemSource(item, mapper, self._needsCellData)
 
             # TODO See comment in boxfill.
             if item is not None:
@@ -227,7 +221,7 @@ class MeshfillPipeline(Pipeline2D):
 
             if mapper is not self._maskedDataMapper:
 
-                if not wireframe:
+                if not wireframe and style != 'solid':
                     # Since pattern creation requires a single color, assuming the
                     # first
                     if ctj >= len(tmpColors[cti]):
@@ -281,7 +275,7 @@ class MeshfillPipeline(Pipeline2D):
         }
         if ("ratio_autot_viewport" in self._resultDict):
             kwargs["ratio_autot_viewport"] = vp
-        self._resultDict.update(self._context().renderTemplate(self._template, self._data1, self._gm,
+        self._resultDict.update(self._context().renderTemplate(self._template, self._fullData1, self._gm,
                                 t, z,
                                 X=numpy.arange(min(x1, x2),
                                                max(x1, x2) * 1.1,
@@ -49,37 +49,17 @@ class Pipeline1D(Pipeline):
         Y = self.convertAxis(cdms2.createAxis(Y), "y")
 
         ln_tmp = self._context().canvas.createline()
-        try:  # Need to squeeze or list it too deep
-            Xs = X[:](squeeze=1).tolist()
-        except Exception:
-            Xs = X[:].tolist()
-        try:  # Need to squeeze or list it too deep
-            Ys = Y[:](squeeze=1).tolist()
-        except Exception:
-            Ys = Y[:].tolist()
-
-        xs = []
-        ys = []
-        prev = None
-        for i, v in enumerate(Ys):
-            if v is not None and Xs[i] is not None:  # Valid data
-                if prev is None:
-                    prev = []
-                    prev2 = []
-                prev.append(Xs[i])
-                prev2.append(v)
-            else:
-                if prev is not None:
-                    xs.append(prev)
-                    ys.append(prev2)
-                    prev = None
-
-        if prev is not None:
-            xs.append(prev)
-            ys.append(prev2)
+        # keep the data as arrays, the valid points are split in segments
+        # at the missing values
+        Xs = numpy.ma.ravel(X[:])
+        Ys = numpy.ma.ravel(Y[:])
+        valid = ~(numpy.ma.getmaskarray(Xs) | numpy.ma.getmaskarray(Ys))
+        xs = numpy.ma.getdata(Xs)[valid].astype(float)
+        ys = numpy.ma.getdata(Ys)[valid].astype(float)
+        edges = numpy.diff(numpy.concatenate(([0], valid.astype(numpy.int8), [0])))
+        # segment starts in the valid points
+        starts = numpy.cumsum(valid)[edges[:-1] == 1] - 1
 
-        ln_tmp._x = xs
-        ln_tmp._y = ys
         ln_tmp.color = [self._gm.linecolor, ]
         ln_tmp.priority = tmpl.data.priority
         if self._gm.linewidth > 0:
@@ -109,6 +89,7 @@ class Pipeline1D(Pipeline):
             x2 += .0001
 
         ln_tmp._worldcoordinate = [x1, x2, y1, y2]
+        ln_tmp._x, ln_tmp._y = self._lineSegments(xs, ys, starts, tmpl, x1, x2)
         if self._gm.marker is not None:
             m = self._context().canvas.createmarker()
             m.type = self._gm.marker
@@ -117,8 +98,9 @@ class Pipeline1D(Pipeline):
                 m.size = self._gm.markersize
             else:
                 m.priority = 0
-            m._x = ln_tmp.x
-            m._y = ln_tmp.y
+            # a single group of markers, the segments don't matter
+            m._x = [xs, ]
+            m._y = [ys, ]
             m._viewport = ln_tmp.viewport
             m._worldcoordinate = ln_tmp.worldcoordinate
 
@@ -161,3 +143,19 @@ class Pipeline1D(Pipeline):
             self._data1,
             self._gm, t, z)
         return {}
+
+    def _lineSegments(self, xs, ys, starts, tmpl, x1, x2):
+        """Returns the lists of x and y arrays of the line segments of the
+        valid points xs, ys, starts being the first point of each segment.
+        For the adaptive_resolution plot keyword, only the points needed
+        to draw the line at the resolution of the template data area are
+        kept.
+        """
+        if self._plot_kargs.get("adaptive_resolution", False) and len(xs) > 0:
+            width = self._context().renWin.GetSize()[0]
+            pixels = max(1, int(round(abs(tmpl.data.x2 - tmpl.data.x1) * width)))
+            kept = vcs.utils.minMaxDecimate(xs, ys, x1, x2, pixels, breaks=starts)
+            starts = numpy.searchsorted(kept, starts)
+            xs = xs[kept]
+            ys = ys[kept]
+        return numpy.split(xs, starts[1:]), numpy.split(ys, starts[1:])
@@ -2,6 +2,7 @@ from .pipeline import Pipeline
 from .. import vcs2vtk
 
 from . import fillareautils
+import cdms2
 import numpy
 import vcs
 import vtk
@@ -87,6 +88,7 @@ class IPipeline2D(Pipeline):
         self._needsCellData = None
         self._needsVectors = False
         self._scalarRange = None
+        self._fullData1 = None
         self._vectorRange = [0.0, 0.0]
         self._maskedDataMapper = None
 
@@ -273,6 +275,77 @@ class Pipeline2D(IPipeline2D):
 
         return result
 
+    def _timeFilter(self, algorithm, name):
+        """Accumulates the time spent executing algorithm in
+        vtk_backend_timings[name] (seconds) of the result dictionary.
+        """
+        vcs2vtk.addTimingObservers(algorithm, name,
+                                   self._resultDict.setdefault("vtk_backend_timings", {}))
+
+    def _solidLevelsAndColors(self, tmpLevels, tmpColors, tmpOpacities):
+        """Flattens the levels prepared by _prepContours into a list of
+        [min, max] and the list of their RGBA (0-1) colors for the solid
+        fill style.
+        """
+        levels = []
+        colors = []
+        _colorMap = self.getColorMap()
+        for i, l in enumerate(tmpLevels):
+            for j, color in enumerate(tmpColors[i]):
+                levels.append([l[j], l[j + 1]])
+                r, g, b, a = self.getColorIndexOrRGBA(_colorMap, color)
+                tmpOpacity = tmpOpacities[j]
+                if tmpOpacity is None:
+                    tmpOpacity = a
+                colors.append([r / 100., g / 100., b / 100., tmpOpacity / 100.])
+        return levels, colors
+
+    def _createLevelsMapper(self, levelFilter, colors, first=0, last=None):
+        """Creates a mapper drawing the cells of levelFilter (see
+        vcs2vtk.levelIndexFilter) in the levels first to last (included,
+        default to the last level) with the lookup table made of colors.
+        Returns the mapper and its surface filter.
+        """
+        if last is None:
+            last = len(colors) - 1
+        th = vtk.vtkThreshold()
+        th.SetInputConnection(levelFilter.GetOutputPort())
+        th.SetInputArrayToProcess(0, 0, 0, vtk.vtkDataObject.FIELD_ASSOCIATION_CELLS, "levelIndex")
+        th.ThresholdBetween(first, last)
+        self._timeFilter(th, "threshold")
+        geoFilter = vtk.vtkDataSetSurfaceFilter()
+        geoFilter.SetInputConnection(th.GetOutputPort())
+        self._timeFilter(geoFilter, "surface")
+
+        lut = vtk.vtkLookupTable()
+        lut.SetNumberOfTableValues(len(colors))
+        for i, color in enumerate(colors):
+            lut.SetTableValue(i, *color)
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputConnection(geoFilter.GetOutputPort())
+        mapper.SetLookupTable(lut)
+        # level i is mapped to table value i
+        mapper.SetScalarRange(0, len(colors))
+        mapper.SetScalarModeToUseCellData()
+        return mapper, geoFilter
+
+    def _createSolidLevelsMapper(self, tmpLevels, tmpColors, tmpOpacities):
+        """Creates a single mapper drawing the cells of the data set in the
+        levels prepared by _prepContours, for the solid fill style.
+
+        Each cell gets the index of its level (vcs2vtk.levelIndexFilter)
+        which the lookup table maps to the level color, cells outside
+        of the levels are removed. This replaces a threshold, surface
+        filter and mapper per level.
+        Returns the mapper and its surface filter.
+        """
+        levels, colors = self._solidLevelsAndColors(tmpLevels, tmpColors, tmpOpacities)
+        levelFilter = vcs2vtk.levelIndexFilter(levels)
+        levelFilter.SetInputData(self._vtkDataSetFittedToViewport)
+        self._timeFilter(levelFilter, "levelIndex")
+        self._resultDict["vtk_backend_level_filter"] = levelFilter
+        return self._createLevelsMapper(levelFilter, colors)
+
     def plot(self, data1, data2, tmpl, grid, transform, **kargs):
         """Overrides baseclass implementation."""
         # Clear old results:
@@ -286,9 +359,10 @@ class Pipeline2D(IPipeline2D):
 
         # Preprocess the input scalar data:
         self._updateScalarData()
-        self._min = self._data1.min()
-        self._max = self._data1.max()
-        self._scalarRange = vcs.minmax(self._data1)
+        self._reduceScalarData()
+        self._min = self._fullData1.min()
+        self._max = self._fullData1.max()
+        self._scalarRange = vcs.minmax(self._fullData1)
 
         # Create/update the VTK dataset.
         plotBasedDualGrid = kargs.get('plot_based_dual_grid', True)
@@ -338,6 +412,62 @@ class Pipeline2D(IPipeline2D):
         self._data1 = vcs.utils.trimData2D(data1, frame=frame)
         self._data2 = vcs.utils.trimData2D(self._originalData2, frame=frame)
 
+    def _reduceScalarData(self):
+        """Lowers the resolution of _data1 and _data2 to the resolution of
+        the template data area: strides them if the graphics method has a
+        thinning, block averages rectilinear data for the
+        adaptive_resolution plot keyword.
+        _fullData1 keeps the data for the scalar range and the template.
+        """
+        self._fullData1 = self._data1
+        pixels = getattr(self._gm, "thinning", None)
+        if pixels:
+            strides = self._reductionStrides(pixels, rectilinear=False)
+            if strides is not None:
+                self._data1 = self._data1[..., ::strides[0], ::strides[1]]
+                if self._data2 is not None:
+                    self._data2 = self._data2[..., ::strides[0], ::strides[1]]
+                self._resultDict["vtk_backend_thinning"] = strides
+        elif self._plot_kargs.get("adaptive_resolution", False) and self._data2 is None:
+            # about one data cell per pixel
+            strides = self._reductionStrides(1, rectilinear=True)
+            if strides is not None:
+                self._data1 = vcs.utils.blockAverage2D(self._data1, *strides)
+                self._resultDict["vtk_backend_block_average"] = strides
+
+    def _reductionStrides(self, pixels, rectilinear):
+        """Returns the (y, x) strides keeping at most one point of _data1
+        every pixels of the template data area, None if all the points are
+        kept or the grid is not supported: generic grids, and curvilinear
+        grids if rectilinear.
+        """
+        if self._data1.ndim < 2:
+            return None
+        grid = self._data1.getGrid()
+        if isinstance(grid, cdms2.gengrid.AbstractGenericGrid) or \
+                (rectilinear and isinstance(grid, cdms2.hgrid.AbstractCurveGrid)):
+            return None
+        width, height = self._context().renWin.GetSize()
+        area = self._template.data
+        xAxis = self._data1.getAxis(-1)
+        yAxis = self._data1.getAxis(-2)
+        worldCoords = vcs.utils.getworldcoordinates(self._gm, xAxis, yAxis)
+        strides = []
+        for axis, wc, size in ((yAxis, worldCoords[2:], abs(area.y2 - area.y1) * height),
+                               (xAxis, worldCoords[:2], abs(area.x2 - area.x1) * width)):
+            count = len(axis)
+            if not isinstance(grid, cdms2.hgrid.AbstractCurveGrid):
+                # only the points in the world coordinates are drawn
+                values = numpy.asarray(axis[:])
+                visible = numpy.count_nonzero((values >= min(wc)) & (values <= max(wc)))
+                if visible > 0:
+                    count = visible
+            maxPoints = max(1, int(size / pixels))
+            strides.append(max(1, -(-count // maxPoints)))
+        if strides == [1, 1]:
+            return None
+        return tuple(strides)
+
     def _updateVTKDataSet(self, plotBasedDualGrid):
         """
         """
@@ -424,6 +554,17 @@ class Pipeline2D(IPipeline2D):
         self._resultDict["vtk_backend_missing_mapper"] = (
             self._maskedDataMapper, color, self._hasCellData)
 
+    def _addItemSource(self, item, source, cellData, color=None):
+        """Records that item draws the polydata produced by source.
+
+        source is a mapper or a polydata algorithm. The item is colored
+        by the mapper lookup table using cell or point scalars (cellData),
+        or with the solid RGBA color if not None.
+        VTKPlots.update_input uses this to refresh the plot in place.
+        """
+        self._resultDict.setdefault("vtk_backend_item_sources", []).append(
+            [item, source, cellData, color])
+
     def getPlottingBounds(self):
         """gm.datawc if it is set or dataset_bounds if there is not geographic projection
            wrapped bounds otherwise
@@ -329,7 +329,7 @@ class StreamlinePipeline(Pipeline2D):
         if ('ratio_autot_viewport' in self._resultDict):
             kwargs["ratio_autot_viewport"] = vp
         self._resultDict.update(self._context().renderTemplate(
-            self._template, self._data1,
+            self._template, self._fullData1,
             self._gm, taxis, zaxis, **kwargs))
         if (self._gm.coloredbyvector):
             self._resultDict.update(
@@ -0,0 +1,133 @@
+import collections
+import vtk
+
+
+class TextCache(object):
+
+    """Least recently used cache of prepared text properties and of measured
+    text extents.
+
+    Text properties are keyed by the values prepared from a texttable and a
+    textorientation (see vcs2vtk.textPropertyValues). Callers must copy the
+    returned property (ShallowCopy) before modifying it.
+    Extents are keyed by (string, property values, dpi, angle).
+
+    Attributes:
+        - maxEntries: Maximum number of properties and of extents kept.
+            Setting it to 0 disables the cache.
+        - hits, misses: Counters of the properties and extents found or
+            computed since the last reset.
+    """
+
+    def __init__(self, maxEntries=4096):
+        self._properties = collections.OrderedDict()
+        self._extents = collections.OrderedDict()
+        self.maxEntries = maxEntries
+        self.hits = {"property": 0, "extent": 0}
+        self.misses = {"property": 0, "extent": 0}
+
+    def _get(self, entries, kind, key):
+        if self.maxEntries <= 0:
+            return None
+        value = entries.get(key)
+        if value is None:
+            self.misses[kind] += 1
+            return None
+        self.hits[kind] += 1
+        entries.move_to_end(key)
+        return value
+
+    def _put(self, entries, key, value):
+        if self.maxEntries <= 0:
+            return
+        entries[key] = value
+        while len(entries) > self.maxEntries:
+            entries.popitem(last=False)
+
+    def textProperty(self, values, prepare):
+        """Return the vtkTextProperty for values, prepare(property, values)
+        is called to set up a new one."""
+        p = self._get(self._properties, "property", values)
+        if p is None:
+            p = vtk.vtkTextProperty()
+            prepare(p, values)
+            self._put(self._properties, values, p)
+        return p
+
+    def extent(self, string, values, dpi, angle, measure):
+        """Return a copy of the bounds of string, measure() computes them
+        when they are not cached."""
+        key = (string, values, dpi, angle)
+        bounds = self._get(self._extents, "extent", key)
+        if bounds is None:
+            bounds = measure()
+            self._put(self._extents, key, list(bounds))
+        return list(bounds)
+
+    def clear(self):
+        """Empty the cache and reset the counters."""
+        self._properties.clear()
+        self._extents.clear()
+        for kind in self.hits:
+            self.hits[kind] = 0
+            self.misses[kind] = 0
+
+    def info(self):
+        """Return the cache counters as a dictionary, layoutsAvoided counts
+        the extents not measured again."""
+        return {"propertyHits": self.hits["property"],
+                "propertyMisses": self.misses["property"],
+                "extentHits": self.hits["extent"],
+                "extentMisses": self.misses["extent"],
+                "layoutsAvoided": self.hits["extent"],
+                "properties": len(self._properties),
+                "extents": len(self._extents),
+                "maxEntries": self.maxEntries}
+
+
+class TextActorPool(object):
+
+    """Text actors and the context items wrapping them, reused from one plot
+    to the next on a render window.
+
+    Actors handed out by acquire are given back all at once by release, when
+    the scene they were added to is cleared.
+
+    Attributes:
+        - created, reused: Counters of the actors created and taken from
+            the pool since the last reset.
+    """
+
+    def __init__(self, wrapper):
+        # wrapper(actor) returns the python object drawing the actor
+        self._wrapper = wrapper
+        self._free = []
+        self._used = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self):
+        """Return a (vtkTextActor, vtkPythonItem) pair."""
+        if self._free:
+            actor, item = self._free.pop()
+            actor.SetVisibility(1)
+            self.reused += 1
+        else:
+            actor = vtk.vtkTextActor()
+            item = vtk.vtkPythonItem()
+            item.SetPythonObject(self._wrapper(actor))
+            self.created += 1
+        self._used.append((actor, item))
+        return actor, item
+
+    def release(self):
+        """Make all the acquired actors available again."""
+        self._free.extend(self._used)
+        self._used = []
+
+    def info(self):
+        """Return the pool counters as a dictionary."""
+        return {"created": self.created,
+                "reused": self.reused,
+                "free": len(self._free),
+                "used": len(self._used)}
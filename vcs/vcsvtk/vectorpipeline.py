@@ -150,24 +150,15 @@ class VectorPipeline(Pipeline2D):
                 scaleFactor /= maxNorm
 
             if self._gm.scaletype == 'linear' or self._gm.scaletype == 'constantNLinear':
-                noOfComponents = vectors.GetNumberOfComponents()
-                scalarArray = vtk.vtkDoubleArray()
-                scalarArray.SetNumberOfComponents(1)
-                scalarArray.SetNumberOfValues(vectors.GetNumberOfTuples())
-
                 oldRange = maxNorm - minNorm
                 oldRange = 1.0 if oldRange == 0.0 else oldRange
 
                 # New range min, max.
                 newRangeValues = self._gm.scalerange
-                newRange = newRangeValues[1] - newRangeValues[0]
-
-                for i in range(0, vectors.GetNumberOfTuples()):
-                    norm = vtk.vtkMath.Norm(vectors.GetTuple(i), noOfComponents)
-                    newValue = (((norm - minNorm) * newRange) / oldRange) + newRangeValues[0]
-                    scalarArray.SetValue(i, newValue)
 
+                scalarArray = vcs2vtk.linearVectorScalars(vectors, minNorm, oldRange, newRangeValues)
                 polydata.GetPointData().SetScalars(scalarArray)
+                self._resultDict["vtk_backend_vector_scaling"] = [minNorm, oldRange, newRangeValues]
                 maxNormInVp = newRangeValues[1] * scaleFactor
                 minNormInVp = newRangeValues[0] * scaleFactor
 
@@ -216,13 +207,10 @@ class VectorPipeline(Pipeline2D):
 
         item.SetScalarMode(vtk.VTK_SCALAR_MODE_USE_CELL_DATA)
 
-        colorArray = vtk.vtkUnsignedCharArray()
-        colorArray.SetNumberOfComponents(4)
-        for i in range(data.GetNumberOfCells()):
-            colorArray.InsertNextTypedTuple(vtk_color)
-
+        colorArray = vcs2vtk.generateSolidColorArray(data.GetNumberOfCells(), vtk_color)
         item.SetMappedColors(colorArray)
         area.GetDrawAreaItem().AddItem(item)
+        self._addItemSource(item, glyphFilter, True, vtk_color)
 
         # assume that self._data1.units has the proper vector units
         unitString = None
@@ -248,7 +236,7 @@ class VectorPipeline(Pipeline2D):
         if ('ratio_autot_viewport' in self._resultDict):
             kwargs["ratio_autot_viewport"] = vp
         self._resultDict.update(self._context().renderTemplate(
-            self._template, self._data1,
+            self._template, self._fullData1,
             self._gm, taxis, zaxis, **kwargs))
 
         kwargs['xaxisconvert'] = self._gm.xaxisconvert
@@ -313,6 +313,13 @@ class Gv(vcs.bestMatch):
                 # for the vector legend arrow.  This may result in a very large
                 # or very small arrow, depending on the value of vc.reference.
                 vc.reference=4
+
+        * Draw at most one arrow every 20 pixels:
+
+            .. code-block:: python
+
+                # None, the default, draws an arrow at each grid point
+                vc.thinning=20
     """
     __slots__ = [
         'g_name',
@@ -345,6 +352,7 @@ class Gv(vcs.bestMatch):
         '_scaleoptions',
         '_scaletype',
         '_scalerange',
+        '_thinning',
     ]
 
     colormap = VCS_validation_functions.colormap
@@ -646,6 +654,21 @@ class Gv(vcs.bestMatch):
         self._scalerange = value
     scalerange = property(_getscalerange, _setscalerange)
 
+    """
+    Screen space thinning of the data: None (default) draws all the grid
+    points, a number N of pixels keeps at most one grid point every N pixels
+    of the plot area in each direction. The strides are computed from the
+    template data area and the canvas size when plotting.
+    """
+    def _getthinning(self):
+        return self._thinning
+
+    def _setthinning(self, value):
+        if value is not None:
+            value = VCS_validation_functions.checkNumber(self, 'thinning', value, minvalue=1)
+        self._thinning = value
+    thinning = property(_getthinning, _setthinning)
+
     def __init__(self, Gv_name, Gv_name_src='default'):
         #                                                         #
         ###########################################################
@@ -688,6 +711,7 @@ class Gv(vcs.bestMatch):
             self._colormap = None
             self._scaletype = self.scaleoptions[4]
             self._scalerange = [0.1, 1.0]
+            self._thinning = None
         else:
             if isinstance(Gv_name_src, Gv):
                 Gv_name_src = Gv_name_src.name
@@ -704,7 +728,7 @@ class Gv(vcs.bestMatch):
                         'linetype', 'linecolor', 'linewidth',
                         'datawc_timeunits', 'datawc_calendar', 'colormap',
                         'scale', 'alignment', 'type', 'reference', 'scaletype',
-                        'scalerange']:
+                        'scalerange', 'thinning']:
 
                 setattr(self, att, getattr(src, att))
         # Ok now we need to stick in the elements
@@ -784,6 +808,7 @@ class Gv(vcs.bestMatch):
         print("reference = ", self.reference)
         print("scaletype = ", self.scaletype)
         print("scalerange = ", self.scalerange)
+        print("thinning = ", self.thinning)
 
     ##########################################################################
     #                                                                           #
@@ -901,6 +926,7 @@ class Gv(vcs.bestMatch):
             fp.write("%s.scale = %s\n" % (unique_name, self.scale))
             fp.write("%s.scaletype = %s\n" % (unique_name, repr(self.scaletype)))
             fp.write("%s.scalerange = %s\n" % (unique_name, self.scalerange))
+            fp.write("%s.thinning = %s\n" % (unique_name, self.thinning))
             fp.write("%s.alignment = '%s'\n" % (unique_name, self.alignment))
             fp.write("%s.type = '%s'\n" % (unique_name, self.type))
             fp.write("%s.reference = %g\n\n" % (unique_name, self.reference))